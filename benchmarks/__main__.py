@@ -0,0 +1,38 @@
+import argparse
+import os
+import sys
+
+from benchmarks.casos import CASOS
+from benchmarks.executor import carregar, comparar, executar_casos, salvar
+
+BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Mede o desempenho do núcleo do poker e dos laços de treinamento e avaliação.')
+    parser.add_argument('casos', nargs='*', help=f'casos a executar (padrão: todos): {", ".join(CASOS)}')
+    parser.add_argument('--saida', default='benchmarks.json', help='arquivo JSON com os resultados')
+    parser.add_argument('--baseline', default=BASELINE, help='resultados anteriores para comparar (padrão: a baseline versionada; "" para não comparar)')
+    parser.add_argument('--limite', type=float, default=0.1, help='queda de ops/s, em fração, considerada regressão')
+    parser.add_argument('--repeticoes', type=int, default=3, help='execuções cronometradas de cada caso; vale a mais rápida')
+    parser.add_argument('--escala', type=float, default=1.0, help='multiplica a quantidade de operações de cada caso')
+    args = parser.parse_args()
+
+    desconhecidos = set(args.casos) - set(CASOS)
+    if desconhecidos:
+        parser.error(f'casos desconhecidos: {", ".join(sorted(desconhecidos))}')
+    casos = {nome: CASOS[nome] for nome in args.casos} if args.casos else CASOS
+    baseline = carregar(args.baseline) if args.baseline else None  # antes de salvar, que pode gravar no mesmo arquivo
+    resultados = executar_casos(casos, args.repeticoes, args.escala)
+    salvar(resultados, args.saida)
+
+    if baseline:
+        regressoes = comparar(resultados, baseline, args.limite)
+        for nome, atual, base in regressoes:
+            print(f'REGRESSÃO {nome}: {atual:,.0f} ops/s contra {base:,.0f} ops/s na baseline ({(atual / base - 1) * 100:.1f}%)')
+        if regressoes:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,168 @@
+import numpy as np
+
+import compara_estrategias_troca
+import treina_estrategia_troca_rl
+from poker.avaliador import Avaliador
+from poker.baralho import Baralho
+from poker.calculadora_equidade import CalculadoraEquidade
+from poker.carta import Carta
+from poker.conjunto_cartas import ConjuntoCartas
+from poker.estrategias_troca.codificadores_estado import CodificadorCategoria
+from poker.estrategias_troca.estrategia_troca_randomica import EstrategiaTrocaRandomica
+from poker.estrategias_troca.estrategia_troca_rl import EstrategiaTrocaRL
+from poker.mao import Mao
+from poker.simulacao_lote import SimulacaoLote
+from poker.torneio import Torneio
+
+MAOS_POR_TIPO = 200
+CASOS = {}  # nome -> (preparar, operacoes)
+
+
+def caso(operacoes):
+    """Registra um benchmark: preparar(operacoes) monta os dados e devolve a função medida, que executa as operações"""
+    def registrar(preparar):
+        CASOS[preparar.__name__] = (preparar, operacoes)
+        return preparar
+    return registrar
+
+
+def maos_por_tipo(quantidade, semente):
+    """Mistura com quantidade mãos de cada um dos Mao.TIPOS, sorteadas entre todas as mãos possíveis"""
+    avaliador = Avaliador.padrao()
+    ranks = np.array(avaliador.ranks)[avaliador.forcas]
+    todas = Avaliador.todas_as_maos()
+    gerador = np.random.default_rng(semente)
+    maos = []
+    for rank in range(len(Mao.TIPOS)):
+        indices = gerador.choice(np.flatnonzero(ranks == rank), size=quantidade)
+        maos.extend(todas[indices].tolist())
+    gerador.shuffle(maos)
+    return [ConjuntoCartas.from_codigos(codigos) for codigos in maos]
+
+
+@caso(50_000)
+def carta_get_cartas(operacoes):
+    textos = treina_estrategia_troca_rl.TIPOS
+
+    def executar():
+        for i in range(operacoes):
+            Carta.get_cartas(textos[i % len(textos)])
+    return executar
+
+
+@caso(20_000)
+def mao_criar(operacoes):
+    conjuntos = maos_por_tipo(MAOS_POR_TIPO, 1)
+
+    def executar():
+        for i in range(operacoes):
+            Mao(conjuntos[i % len(conjuntos)])
+    return executar
+
+
+@caso(200_000)
+def mao_rank(operacoes):
+    maos = [Mao(conjunto) for conjunto in maos_por_tipo(MAOS_POR_TIPO, 2)]
+
+    def executar():
+        for i in range(operacoes):
+            _ = maos[i % len(maos)].rank
+    return executar
+
+
+@caso(200_000)
+def mao_menor_que(operacoes):
+    pares = [(Mao(a), Mao(b)) for a, b in zip(maos_por_tipo(MAOS_POR_TIPO, 3), maos_por_tipo(MAOS_POR_TIPO, 6)) if not a & b]
+
+    def executar():
+        for i in range(operacoes):
+            a, b = pares[i % len(pares)]
+            _ = a < b
+    return executar
+
+
+@caso(50_000)
+def baralho_embaralhar_distribuir(operacoes):
+    baralho = Baralho(aleatorio=6)
+
+    def executar():
+        for _ in range(operacoes):
+            baralho.reset()
+            baralho.embaralhar()
+            baralho.distribuir_conjunto(Mao.TAMANHO)
+            baralho.distribuir_conjunto(Mao.TAMANHO)
+    return executar
+
+
+@caso(50_000)
+def estrategia_rl_decidir_trocas(operacoes):
+    estrategia = EstrategiaTrocaRL('tabela-treinamento-1-279.csv', aleatorio=7)
+    maos = [Mao(conjunto) for conjunto in maos_por_tipo(MAOS_POR_TIPO, 4)]
+
+    def executar():
+        for i in range(operacoes):
+            estrategia.obter_trocas(maos[i % len(maos)])
+    return executar
+
+
+@caso(50_000)
+def estrategia_rl_categoria_decidir_trocas(operacoes):
+    estrategia = EstrategiaTrocaRL(aleatorio=13, codificador=CodificadorCategoria())
+    maos = [Mao(conjunto) for conjunto in maos_por_tipo(MAOS_POR_TIPO, 4)]
+
+    def executar():
+        for i in range(operacoes):
+            estrategia.obter_trocas(maos[i % len(maos)])
+    return executar
+
+
+@caso(20_000)
+def episodio_treinamento(operacoes):
+    estrategia = EstrategiaTrocaRL('tabela-treinamento-1-279.csv', aleatorio=8)
+    baralho = Baralho(aleatorio=9)
+    tipos = treina_estrategia_troca_rl.TIPOS
+
+    def executar():
+        for i in range(operacoes):
+            treina_estrategia_troca_rl.treinamento(estrategia, tipos[i % len(tipos)], baralho)
+    return executar
+
+
+@caso(20_000)
+def episodio_testa_estrategia(operacoes):
+    estrategia = EstrategiaTrocaRL('tabela-treinamento-1-279.csv', aleatorio=10)
+
+    def executar():
+        compara_estrategias_troca.testa_estrategia(operacoes, estrategia, aleatorio=11)
+    return executar
+
+
+@caso(500_000)
+def episodio_lote(operacoes):
+    simulacao = SimulacaoLote(5)
+    estrategia = EstrategiaTrocaRandomica(aleatorio=12)
+
+    def executar():
+        simulacao.contar_resultados(estrategia, operacoes)
+    return executar
+
+
+@caso(1_000_000)
+def equidade_contra_3_oponentes(operacoes):
+    calculadora = CalculadoraEquidade(13)
+    mao = Mao(Carta.get_cartas('9o9e5c4p2e'))
+
+    def executar():
+        calculadora.calcular(mao, 3, amostras=operacoes)
+    return executar
+
+
+@caso(200_000)
+def torneio_4_assentos(operacoes):
+    rl = EstrategiaTrocaRL('tabela-treinamento-1-279.csv', aleatorio=15)
+    aleatoria = EstrategiaTrocaRandomica(aleatorio=16)
+    torneio = Torneio([('rl', rl), ('aleatoria', aleatoria), ('rl', rl), ('aleatoria', aleatoria)], 14)
+
+    def executar():
+        torneio.jogar(operacoes)
+    return executar
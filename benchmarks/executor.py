@@ -0,0 +1,74 @@
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+
+def medir(preparar, operacoes, repeticoes=3):
+    """Mede um caso: a melhor taxa entre as repetições, o pico de memória e os blocos que continuam alocados.
+
+    Cada caso semeia as próprias fontes aleatórias ao ser preparado, então as medições são reproduzíveis de uma
+    execução para outra; as de memória são feitas à parte, pois tracemalloc deixa tudo mais lento.
+    """
+    executar = preparar(operacoes)
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        executar()
+        tempos.append(time.perf_counter() - inicio)
+
+    blocos = sys.getallocatedblocks()
+    executar()
+    blocos = sys.getallocatedblocks() - blocos
+
+    tracemalloc.start()
+    executar()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        'operacoes': operacoes,
+        'ops_por_segundo': operacoes / min(tempos),
+        'pico_bytes': pico,
+        'blocos_retidos_por_op': blocos / operacoes
+    }
+
+
+def executar_casos(casos, repeticoes=3, escala=1.0, saida=print):
+    resultados = {}
+    for nome, (preparar, operacoes) in casos.items():
+        resultados[nome] = medir(preparar, max(1, round(operacoes * escala)), repeticoes)
+        saida(formatar(nome, resultados[nome]))
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'plataforma': platform.platform(),
+        'resultados': resultados
+    }
+
+
+def formatar(nome, resultado):
+    return (f'{nome:32} {resultado["ops_por_segundo"]:>14,.0f} ops/s {resultado["pico_bytes"]:>12,} B de pico '
+            f'{resultado["blocos_retidos_por_op"]:>8.3f} blocos retidos/op')
+
+
+def comparar(atual, baseline, limite):
+    """Casos cuja taxa caiu mais que limite (fração) em relação à baseline: lista de (nome, ops/s atual, ops/s baseline)"""
+    regressoes = []
+    for nome, resultado in atual['resultados'].items():
+        base = baseline['resultados'].get(nome)
+        if base and resultado['ops_por_segundo'] < base['ops_por_segundo'] * (1 - limite):
+            regressoes.append((nome, resultado['ops_por_segundo'], base['ops_por_segundo']))
+    return regressoes
+
+
+def salvar(resultados, caminho):
+    with open(caminho, 'w', encoding='utf-8') as arquivo:
+        json.dump(resultados, arquivo, indent=2)
+
+
+def carregar(caminho):
+    with open(caminho, encoding='utf-8') as arquivo:
+        return json.load(arquivo)
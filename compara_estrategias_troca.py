@@ -1,40 +1,72 @@
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+
+import numpy as np
+
+from poker.avaliacao_sequencial import TIPOS_RESULTADO, EstatisticasPareadas, codificar_resultados, contar_conjuntas, z_sequencial
 from poker.baralho import Baralho
 from poker.estrategias_troca.estrategia_troca_randomica import EstrategiaTrocaRandomica
 from poker.estrategias_troca.estrategia_troca_rl import EstrategiaTrocaRL
+from poker.instrumentacao import INSTRUMENTACAO_NULA
 from poker.jogador import Jogador
 from poker.mao import Mao
+from poker.simulacao_lote import SimulacaoLote
+
+TAMANHO_BLOCO = 1 << 15
+_PROCESSO = {}  # estado de cada processo do pool, como a cópia da estratégia recebida ao iniciar
+
+
+class CriteriosParada(NamedTuple):
+    precisao: float = 0.2  # meia largura máxima dos intervalos, em pontos percentuais
+    confianca: float = 0.95  # confiança do conjunto de intervalos, ao longo de todas as olhadas
+    criterio: str = 'melhorou'  # resultado usado para separar as estratégias
 
 
-def testa_estrategia(quantidade_testes, estrategia):
+class ResultadoAdaptativo(NamedTuple):
+    estatisticas: EstatisticasPareadas
+    z: float  # quantil dos intervalos na última olhada
+    motivo: str  # 'separacao', 'precisao' ou 'limite'
+    parada: CriteriosParada
+
+
+def testa_estrategia(quantidade_testes, estrategia, instrumentacao=INSTRUMENTACAO_NULA, aleatorio=None, registro=None):
     estatisticas = {
         'empate': 0.0,
         'melhorou': 0.0,
         'piorou': 0.0
     }
 
+    baralho = Baralho(aleatorio)
     for _ in range(quantidade_testes):
         # novo jogador
         jogador = Jogador('Teste', estrategia)
 
-        # novo baralho
-        baralho = Baralho()
-        baralho.embaralhar()
+        with instrumentacao.fase('distribuicao'):
+            # o mesmo baralho, completo e embaralhado
+            baralho.reset()
+            baralho.embaralhar()
 
-        # distribuir cartas
-        cartas = baralho.distribuir(Mao.TAMANHO)
-        jogador.receber(cartas)
+            # distribuir cartas
+            cartas = baralho.distribuir_conjunto(Mao.TAMANHO)
+            jogador.receber(cartas)
 
         # nossa mão atual
         mao_anterior = jogador.mao.rank
+        inicial = registro.capturar(jogador.mao) if registro is not None else None
 
         # trocar cartas
-        cartas_descartadas = jogador.decidir_trocas()
+        with instrumentacao.fase('decisao'):
+            cartas_descartadas = jogador.decidir_trocas()
         n = len(cartas_descartadas)
-        novas_cartas = baralho.distribuir(n)
-        jogador.receber(novas_cartas)
+        with instrumentacao.fase('troca'):
+            novas_cartas = baralho.distribuir_conjunto(n)
+            jogador.receber(novas_cartas)
 
         # nossa nova mão após trocas
         mao_posterior = jogador.mao.rank
+        if registro is not None:
+            registro.gravar_troca(inicial, jogador.trocas, jogador.mao)
 
         if mao_posterior > mao_anterior:
             estatisticas['melhorou'] += 1
@@ -42,7 +74,118 @@ def testa_estrategia(quantidade_testes, estrategia):
             estatisticas['piorou'] += 1
         else:
             estatisticas['empate'] += 1
+        instrumentacao.contar('cartas_trocadas', n)
+        instrumentacao.concluir_episodio()
+
+    return calcula_porcentagens(estatisticas, quantidade_testes)
+
+
+def testa_estrategia_lote(quantidade_testes, estrategia, gerador=None, registro=None):
+    """Mesmo experimento de testa_estrategia, mas com todos os episódios simulados em lotes vetorizados"""
+    estatisticas = SimulacaoLote(gerador).contar_resultados(estrategia, quantidade_testes, registro)
+    return calcula_porcentagens(estatisticas, quantidade_testes)
+
+
+def testa_estrategia_paralela(quantidade_testes, estrategia, semente=None, processos=None):
+    """Mesmo experimento de testa_estrategia_lote, com os episódios divididos entre vários processos.
+
+    Os episódios são divididos em blocos de TAMANHO_BLOCO e cada bloco tem sua própria semente, gerada por
+    SeedSequence.spawn a partir de semente. Assim, para uma mesma semente, o resultado é o mesmo com qualquer
+    quantidade de processos.
+    """
+    tamanhos = _tamanhos_blocos(quantidade_testes)
+    sementes = np.random.SeedSequence(semente).spawn(len(tamanhos))
+    if processos == 1:
+        _inicializa_processo(estrategia)
+        parciais = list(map(_testa_bloco, tamanhos, sementes))
+    else:
+        with ProcessPoolExecutor(processos, initializer=_inicializa_processo, initargs=(estrategia,)) as executor:
+            parciais = list(executor.map(_testa_bloco, tamanhos, sementes))
+
+    estatisticas = {'empate': 0, 'melhorou': 0, 'piorou': 0}
+    for parcial in parciais:
+        for tipo, valor in parcial.items():
+            estatisticas[tipo] += valor
+    return calcula_porcentagens(estatisticas, quantidade_testes)
+
+
+def _tamanhos_blocos(quantidade_testes):
+    return [min(TAMANHO_BLOCO, quantidade_testes - inicio) for inicio in range(0, quantidade_testes, TAMANHO_BLOCO)]
+
 
+def _inicializa_processo(estrategia):
+    _PROCESSO['estrategia'] = estrategia
+
+
+def _testa_bloco(quantidade_testes, semente):
+    return SimulacaoLote(semente).contar_resultados(_PROCESSO['estrategia'], quantidade_testes)
+
+
+def testa_estrategias_adaptativo(estrategias, maximo_testes, parada=CriteriosParada(), semente=None, processos=None):
+    """Avalia as estratégias (nome -> estratégia) em rodadas, até que os resultados bastem, em vez de um número fixo de episódios.
+
+    Todas as estratégias jogam os mesmos episódios: cada bloco usa a mesma semente, derivada de semente como em
+    testa_estrategia_paralela, para todas elas. Depois de cada rodada, que dobra a quantidade de blocos da anterior, os
+    intervalos são recalculados e a avaliação para quando as diferenças no resultado parada.criterio separam todos os
+    pares de estratégias, quando a meia largura de todos os intervalos fica abaixo de parada.precisao, ou quando cada
+    estratégia jogou maximo_testes episódios.
+    """
+    if maximo_testes < 1:
+        raise ValueError(f'Quantidade inválida de episódios: {maximo_testes}.')
+    estatisticas = EstatisticasPareadas(estrategias)
+    sequencia = np.random.SeedSequence(semente)
+    blocos = 1  # as rodadas não dependem de processos, e o resultado também não
+    olhada = 0
+    motivo = 'limite'
+    with ProcessPoolExecutor(processos, initializer=_inicializa_processo_pareado, initargs=(list(estrategias.values()),)) as executor:
+        while estatisticas.episodios < maximo_testes:
+            tamanhos = _tamanhos_blocos(min(blocos * TAMANHO_BLOCO, maximo_testes - estatisticas.episodios))
+            for conjuntas, tamanho in zip(executor.map(_testa_bloco_pareado, tamanhos, sequencia.spawn(len(tamanhos))), tamanhos):
+                estatisticas.adicionar(conjuntas, tamanho)
+            olhada += 1
+            blocos *= 2
+            z = z_sequencial(olhada, parada.confianca, max(1, len(estatisticas.pares)))
+            if estatisticas.separadas(parada.criterio, z):
+                motivo = 'separacao'
+                break
+            if estatisticas.meia_largura_maxima(z) * 100.0 <= parada.precisao:
+                motivo = 'precisao'
+                break
+    return ResultadoAdaptativo(estatisticas, z, motivo, parada)
+
+
+def _inicializa_processo_pareado(estrategias):
+    _PROCESSO['estrategias'] = estrategias
+
+
+def _testa_bloco_pareado(quantidade_testes, semente):
+    resultados = []
+    for estrategia in _PROCESSO['estrategias']:
+        episodios = SimulacaoLote(semente).jogar(estrategia, quantidade_testes)  # mesma semente: mesmas mãos e compras
+        resultados.append(codificar_resultados(episodios.ranks_antes, episodios.ranks_depois))
+    return contar_conjuntas(resultados)
+
+
+def imprime_resultado_adaptativo(resultado):
+    estatisticas, z, parada = resultado.estatisticas, resultado.z, resultado.parada
+    motivos = {'separacao': 'estratégias separadas', 'precisao': 'precisão atingida', 'limite': 'limite de episódios'}
+    print(f'== {estatisticas.episodios} episódios por estratégia ({motivos[resultado.motivo]}), intervalos de {parada.confianca:.0%} ==')
+    print()
+    for nome in estatisticas.nomes:
+        print(f'== Resultados para {nome} ==')
+        for tipo in TIPOS_RESULTADO:
+            intervalo = estatisticas.intervalo(nome, tipo, z)
+            print(f'{tipo}: {intervalo.estimativa * 100:.1f}% [{intervalo.inferior * 100:.1f}%, {intervalo.superior * 100:.1f}%]')
+        print()
+    if estatisticas.pares:
+        print(f'== Diferenças em {parada.criterio} ==')
+        for nome_a, nome_b in estatisticas.pares:
+            diferenca = estatisticas.diferenca(nome_a, nome_b, parada.criterio, z)
+            print(f'{nome_a} - {nome_b}: {diferenca.estimativa * 100:+.2f} p.p. [{diferenca.inferior * 100:+.2f}, {diferenca.superior * 100:+.2f}]')
+        print()
+
+
+def calcula_porcentagens(estatisticas, quantidade_testes):
     for tipo, valor in estatisticas.items():
         porcentagem = valor / quantidade_testes * 100.0
         estatisticas[tipo] = porcentagem
@@ -51,7 +194,17 @@ def testa_estrategia(quantidade_testes, estrategia):
 
 
 def main():
-    quantidade_testes = 1_000_000
+    parser = argparse.ArgumentParser(description='Compara as estratégias de troca de cartas.')
+    parser.add_argument('--testes', type=int, default=1_000_000, help='episódios por estratégia')
+    parser.add_argument('--processos', type=int, default=None, help='processos em paralelo (padrão: um por núcleo)')
+    parser.add_argument('--semente', type=int, default=None, help='semente para reproduzir os resultados')
+    parser.add_argument('--adaptativo', action='store_true', help='para assim que os intervalos bastarem; --testes vira o limite')
+    parser.add_argument('--precisao', type=float, default=0.2, help='meia largura máxima dos intervalos, em pontos percentuais')
+    parser.add_argument('--confianca', type=float, default=0.95, help='confiança dos intervalos')
+    parser.add_argument('--criterio', default='melhorou', choices=TIPOS_RESULTADO, help='resultado usado para separar as estratégias')
+    args = parser.parse_args()
+
+    quantidade_testes = args.testes
     configs = [
         {'nome': 'Troca Aleatória', 'estrategia': EstrategiaTrocaRandomica()},
         {'nome': 'RL Init 1 Max 279', 'estrategia': EstrategiaTrocaRL('tabela-treinamento-1-279.csv')},
@@ -59,10 +212,15 @@ def main():
         {'nome': 'RL Init Aleatório Max 279', 'estrategia': EstrategiaTrocaRL('tabela-treinamento-aleatorio-279.csv')},
         {'nome': 'RL Init Aleatório Max 5000', 'estrategia': EstrategiaTrocaRL('tabela-treinamento-aleatorio-5000.csv')},
     ]
+    if args.adaptativo:
+        estrategias = {config['nome']: config['estrategia'] for config in configs}
+        parada = CriteriosParada(args.precisao, args.confianca, args.criterio)
+        imprime_resultado_adaptativo(testa_estrategias_adaptativo(estrategias, quantidade_testes, parada, args.semente, args.processos))
+        return
     for config in configs:
         nome = config['nome']
         estrategia = config['estrategia']
-        estatisticas = testa_estrategia(quantidade_testes, estrategia)
+        estatisticas = testa_estrategia_paralela(quantidade_testes, estrategia, args.semente, args.processos)
         print(f'== Resultados para {nome} ==')
         for tipo, porcentagem in estatisticas.items():
             print(f'{tipo}: {porcentagem:.1f}%')
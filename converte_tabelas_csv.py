@@ -0,0 +1,40 @@
+import argparse
+import glob
+import re
+
+from poker.estrategias_troca.estrategia_troca_rl import EstrategiaTrocaRL
+
+
+def converte_tabela(caminho_csv, caminho_npz=None, maximo=None):
+    """Converte uma tabela CSV de EstrategiaTrocaRL em checkpoint .npz.
+
+    Sem maximo, os limites vêm do sufixo do nome: o máximo do último número, como em tabela-treinamento-aleatorio-279.csv,
+    e o mínimo do penúltimo, se houver, como em tabela-treinamento-1-5000.csv e nas tabelas de varredura_treinamento_rl.
+    Sem sufixo, o máximo é o maior entre EstrategiaTrocaRL.MAX e o maior peso da tabela.
+    """
+    estrategia = EstrategiaTrocaRL(caminho_csv)
+    minimo = EstrategiaTrocaRL.MIN
+    if maximo is None:
+        sufixo = re.search(r'(?:-(\d+))?-(\d+)\.csv$', caminho_csv)
+        maximo = int(sufixo.group(2)) if sufixo else max(EstrategiaTrocaRL.MAX, int(estrategia.tabela.max()))
+        if sufixo and sufixo.group(1) and 0 < int(sufixo.group(1)) < maximo:
+            minimo = int(sufixo.group(1))
+    convertida = EstrategiaTrocaRL(minimo=minimo, maximo=maximo)
+    convertida.tabela[:] = estrategia.tabela
+    caminho_npz = caminho_npz or re.sub(r'\.csv$', '', caminho_csv) + '.npz'
+    convertida.salvar(caminho_npz, origem=caminho_csv)
+    return caminho_npz
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Converte tabelas CSV da estratégia RL em checkpoints .npz.')
+    parser.add_argument('arquivos', nargs='*', default=sorted(glob.glob('tabela-treinamento-*.csv')), help='tabelas CSV a converter')
+    parser.add_argument('--maximo', type=int, default=None, help='peso máximo das tabelas (padrão: sufixo do nome do arquivo)')
+    args = parser.parse_args()
+
+    for caminho_csv in args.arquivos:
+        print(f'{caminho_csv} -> {converte_tabela(caminho_csv, maximo=args.maximo)}')
+
+
+if __name__ == '__main__':
+    main()
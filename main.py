@@ -1,9 +1,10 @@
 from poker.estrategias_troca.estrategia_troca_randomica import EstrategiaTrocaRandomica
+from poker.eventos_jogo import ObservadorConsole
 from poker.jogador import Jogador
 from poker.jogo import Jogo
 
 if __name__ == '__main__':
     jogador1 = Jogador('Alice', EstrategiaTrocaRandomica())
     jogador2 = Jogador('Bob', EstrategiaTrocaRandomica())
-    jogo = Jogo([jogador1, jogador2])
+    jogo = Jogo([jogador1, jogador2], [ObservadorConsole()])
     jogo.jogar()
@@ -0,0 +1,54 @@
+import numpy as np
+
+
+class FonteAleatoria:
+    """Fonte de sorteios de um componente (baralho, estratégia, simulação), derivada de uma np.random.SeedSequence.
+
+    Fontes independentes saem de dividir(), que usa SeedSequence.spawn: a partir de uma única semente raiz, cada
+    processo, bloco ou componente recebe o seu próprio fluxo, e a execução inteira pode ser reproduzida. Os sorteios
+    vetorizados usam o gerador (np.random.Generator); os escalares saem de uniforme(), que tira os números do gerador em
+    blocos, porque cada chamada escalar a ele custa caro.
+    """
+    TAMANHO_RESERVA = 64
+
+    def __init__(self, semente=None):
+        """semente pode ser None (entropia do sistema operacional), um inteiro, uma SeedSequence ou um Generator"""
+        if isinstance(semente, np.random.Generator):
+            self._gerador = semente
+        else:
+            sequencia = semente if isinstance(semente, np.random.SeedSequence) else np.random.SeedSequence(semente)
+            self._gerador = np.random.Generator(np.random.PCG64(sequencia))
+        self._reserva = []
+
+    @staticmethod
+    def criar(origem=None):
+        """A própria origem, se já for uma FonteAleatoria, ou uma nova fonte a partir dela"""
+        return origem if isinstance(origem, FonteAleatoria) else FonteAleatoria(origem)
+
+    @property
+    def gerador(self):
+        return self._gerador
+
+    def dividir(self, n):
+        """n fontes novas, estatisticamente independentes desta e entre si"""
+        return [FonteAleatoria(sequencia) for sequencia in self._gerador.bit_generator.seed_seq.spawn(n)]
+
+    def uniforme(self):
+        """Um float em [0, 1)"""
+        if not self._reserva:
+            self._reserva = self._gerador.random(FonteAleatoria.TAMANHO_RESERVA).tolist()
+        return self._reserva.pop()
+
+    def inteiro(self, n):
+        """Um inteiro em [0, n); o viés de arredondamento é desprezível para os n pequenos usados aqui"""
+        return int(self.uniforme() * n)
+
+    @property
+    def estado(self):
+        """Estado completo da fonte, em um formato que pode ser salvo como JSON"""
+        return {'gerador': self._gerador.bit_generator.state, 'reserva': list(self._reserva)}
+
+    @estado.setter
+    def estado(self, estado):
+        self._gerador.bit_generator.state = estado['gerador']
+        self._reserva = list(estado['reserva'])
@@ -0,0 +1,45 @@
+import contextlib
+import os
+
+import numpy as np
+
+
+def salvar_atomico(caminho, gravar, substituir=True):
+    """Grava com gravar(temporario) um arquivo temporário ao lado de caminho e só então o coloca no lugar, de modo que
+    outros processos nunca enxergam um arquivo pela metade, nem perdem as páginas de um arquivo que estejam mapeando.
+
+    O temporário tem a mesma extensão de caminho, para que np.save e np.savez não acrescentem outra, e é removido se a
+    gravação falhar. Com substituir=False, um arquivo que outro processo já tenha criado em caminho é mantido; retorna
+    se o arquivo gravado ficou em caminho.
+    """
+    raiz, extensao = os.path.splitext(str(caminho))
+    temporario = f'{raiz}.{os.getpid()}.tmp{extensao}'
+    try:
+        gravar(temporario)
+        if substituir:
+            os.replace(temporario, caminho)
+            return True
+        try:
+            os.link(temporario, caminho)
+            return True
+        except FileExistsError:
+            return False
+    finally:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(temporario)
+
+
+def carregar_ou_gerar(caminho, validar, gerar):
+    """Array do .npy em caminho, se validar(array) o aceitar; senão, o array de gerar(), gravado em caminho para as
+    próximas execuções. Se não for possível gravar (em uma instalação só para leitura, por exemplo), o array gerado é
+    usado assim mesmo."""
+    try:
+        array = np.load(caminho)
+        if validar(array):
+            return array
+    except (OSError, ValueError):
+        pass
+    array = gerar()
+    with contextlib.suppress(OSError):
+        salvar_atomico(caminho, lambda temporario: np.save(temporario, array))
+    return array
@@ -0,0 +1,122 @@
+from itertools import combinations
+from statistics import NormalDist
+from typing import NamedTuple
+
+import numpy as np
+
+TIPOS_RESULTADO = ['empate', 'melhorou', 'piorou']  # índice do resultado de cada episódio: sign(depois - antes) % 3
+
+
+class Intervalo(NamedTuple):
+    estimativa: float
+    inferior: float
+    superior: float
+
+    @property
+    def meia_largura(self):
+        return (self.superior - self.inferior) / 2
+
+    def contem(self, valor):
+        return self.inferior <= valor <= self.superior
+
+
+def codificar_resultados(ranks_antes, ranks_depois):
+    """Índice em TIPOS_RESULTADO do resultado de cada episódio"""
+    return np.sign(np.asarray(ranks_depois) - np.asarray(ranks_antes)) % len(TIPOS_RESULTADO)
+
+
+def contar_conjuntas(resultados):
+    """Para resultados (S, N) de S estratégias nos mesmos N episódios, o array (S, S, 3) de contagens conjuntas.
+
+    A posição [a, b, t] conta os episódios em que a e b tiveram, as duas, o resultado t; a diagonal [a, a, t] é a
+    contagem simples de a. É tudo o que os intervalos das proporções e das diferenças pareadas precisam.
+    """
+    resultados = np.asarray(resultados)
+    conjuntas = np.zeros((len(resultados), len(resultados), len(TIPOS_RESULTADO)), dtype=np.int64)
+    for tipo in range(len(TIPOS_RESULTADO)):
+        indicadores = (resultados == tipo).astype(np.int64)
+        conjuntas[:, :, tipo] = indicadores @ indicadores.T
+    return conjuntas
+
+
+def z_sequencial(olhada, confianca=0.95, comparacoes=1):
+    """Quantil normal da olhada número olhada (a partir de 1) de uma avaliação que pode parar a cada olhada.
+
+    O erro 1 - confianca é repartido entre as olhadas, alfa / (k (k + 1)) na k-ésima, que somam alfa, e entre as
+    comparações de cada olhada (Bonferroni). Assim, olhar os intervalos a cada rodada e parar quando convier mantém a
+    confiança do conjunto, ao custo de intervalos um pouco mais largos a cada olhada.
+    """
+    alfa = (1 - confianca) / (olhada * (olhada + 1)) / comparacoes
+    return NormalDist().inv_cdf(1 - alfa / 2)
+
+
+def intervalo_wilson(sucessos, n, z):
+    """Intervalo de Wilson para uma proporção, que continua bom perto de 0 e de 1"""
+    if n == 0:
+        return Intervalo(0.0, 0.0, 1.0)
+    p = sucessos / n
+    denominador = 1 + z * z / n
+    centro = (p + z * z / (2 * n)) / denominador
+    meia_largura = z * np.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denominador
+    return Intervalo(p, max(0.0, centro - meia_largura), min(1.0, centro + meia_largura))
+
+
+class EstatisticasPareadas:
+    """Contagens acumuladas de várias estratégias jogadas nos mesmos episódios (mesmas mãos e mesmas compras).
+
+    Como os episódios são comuns, a diferença entre duas estratégias é estimada pela média das diferenças episódio a
+    episódio, cuja variância desconta o que as duas têm em comum: os intervalos das diferenças ficam bem mais estreitos
+    do que se cada estratégia tivesse seus próprios episódios.
+    """
+
+    def __init__(self, nomes):
+        self._nomes = list(nomes)
+        self._conjuntas = np.zeros((len(self._nomes), len(self._nomes), len(TIPOS_RESULTADO)), dtype=np.int64)
+        self._episodios = 0
+
+    @property
+    def nomes(self):
+        return self._nomes
+
+    @property
+    def episodios(self):
+        """Episódios jogados por cada estratégia"""
+        return self._episodios
+
+    @property
+    def pares(self):
+        return list(combinations(self._nomes, 2))
+
+    def adicionar(self, conjuntas, episodios):
+        self._conjuntas += conjuntas
+        self._episodios += episodios
+
+    def contagens(self, nome):
+        i = self._nomes.index(nome)
+        return {tipo: int(self._conjuntas[i, i, t]) for t, tipo in enumerate(TIPOS_RESULTADO)}
+
+    def intervalo(self, nome, tipo, z):
+        """Intervalo da proporção de episódios de nome com o resultado tipo"""
+        i = self._nomes.index(nome)
+        return intervalo_wilson(int(self._conjuntas[i, i, TIPOS_RESULTADO.index(tipo)]), self._episodios, z)
+
+    def diferenca(self, nome_a, nome_b, tipo, z):
+        """Intervalo da diferença entre as proporções do resultado tipo de nome_a e de nome_b"""
+        a, b, t = self._nomes.index(nome_a), self._nomes.index(nome_b), TIPOS_RESULTADO.index(tipo)
+        n = self._episodios
+        if n == 0:
+            return Intervalo(0.0, -1.0, 1.0)
+        so_a, so_b, juntas = self._conjuntas[a, a, t], self._conjuntas[b, b, t], self._conjuntas[a, b, t]
+        media = (so_a - so_b) / n
+        # cada episódio contribui com d = [a teve tipo] - [b teve tipo], e d² = [a teve tipo] + [b teve tipo] - 2 [as duas]
+        variancia = max((so_a + so_b - 2 * juntas) / n - media * media, 0.0)
+        meia_largura = z * np.sqrt(variancia / n) if n > 1 else 1.0
+        return Intervalo(media, media - meia_largura, media + meia_largura)
+
+    def meia_largura_maxima(self, z):
+        return max(self.intervalo(nome, tipo, z).meia_largura for nome in self._nomes for tipo in TIPOS_RESULTADO)
+
+    def separadas(self, tipo, z):
+        """Se, no resultado tipo, o intervalo da diferença de cada par de estratégias exclui o zero"""
+        pares = self.pares
+        return bool(pares) and all(not self.diferenca(a, b, tipo, z).contem(0.0) for a, b in pares)
@@ -0,0 +1,158 @@
+from array import array
+from collections import Counter
+from itertools import chain, combinations, combinations_with_replacement
+from math import comb
+import os
+
+import numpy as np
+
+from poker.arquivos import carregar_ou_gerar
+from poker.conjunto_cartas import N_CARTAS, N_VALORES
+
+N_CARTAS_MAO = 5
+N_MAOS = comb(N_CARTAS, N_CARTAS_MAO)
+PRIMOS = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41]
+WHEEL = [12, 3, 2, 1, 0]
+REPETICOES = {  # rank (índice em Mao.TIPOS) de cada padrão de repetição de valores
+    (1, 1, 1, 1, 1): 0,
+    (2, 1, 1, 1): 1,
+    (2, 2, 1): 2,
+    (3, 1, 1): 3,
+    (3, 2): 6,
+    (4, 1): 7
+}
+BINOMIAIS = [[comb(n, k) for n in range(N_CARTAS)] for k in range(1, N_CARTAS_MAO + 1)]
+
+
+class Avaliador:
+    """Avalia mãos de 5 cartas consultando uma tabela com todas as 2.598.960 mãos possíveis.
+
+    A posição de cada mão na tabela é dada pelo sistema combinatório (ordem colex) dos códigos das cartas,
+    que funciona como um hash perfeito. Cada posição guarda a força da mão: um ordinal de 0 a 7461, uma para
+    cada classe de equivalência, do 7-5-4-3-2 de naipes variados ao royal flush.
+    """
+    CAMINHO = os.path.join(os.path.dirname(__file__), 'tabela_avaliador.npy')
+    N_CLASSES = 7462
+    _padrao = None
+
+    def __init__(self, caminho=CAMINHO):
+        classes = Avaliador._gerar_classes()
+        self._chaves = [chave for chave, _, _ in classes]
+        self._ranks = [Avaliador.rank_da_chave(chave) for chave in self._chaves]
+        self._forcas = Avaliador._carregar(caminho, classes)
+        self._tabela = array('H', self._forcas.tobytes())
+
+    @staticmethod
+    def padrao():
+        if Avaliador._padrao is None:
+            Avaliador._padrao = Avaliador()
+        return Avaliador._padrao
+
+    @property
+    def forcas(self):
+        """Tabela (np.uint16) com a força de cada uma das mãos, na ordem colex"""
+        return self._forcas
+
+    @property
+    def ranks(self):
+        """Lista com o rank de cada força"""
+        return self._ranks
+
+    @property
+    def chaves(self):
+        """Lista com a chave de desempate de cada força, em ordem crescente"""
+        return self._chaves
+
+    def avaliar(self, codigos):
+        """Retorna o rank e a força de uma mão, a partir dos códigos de suas 5 cartas"""
+        forca = self._tabela[Avaliador.indice(codigos)]
+        return self._ranks[forca], forca
+
+    @staticmethod
+    def indice(codigos):
+        a, b, c, d, e = sorted(codigos)
+        return BINOMIAIS[0][a] + BINOMIAIS[1][b] + BINOMIAIS[2][c] + BINOMIAIS[3][d] + BINOMIAIS[4][e]
+
+    @staticmethod
+    def chave(valores, mesmo_naipe):
+        """Gera a chave de desempate de uma mão a partir dos índices dos valores de suas cartas.
+
+        O rank ocupa os bits mais altos e, abaixo dele, vêm os valores das cartas (4 bits cada) na mesma ordem em que
+        Mao os apresenta: primeiro as repetições maiores e, no wheel, o ás por último.
+        """
+        quantidades = Counter(valores)
+        ordem = sorted(valores, key=lambda v: (quantidades[v], v), reverse=True)
+        if ordem == WHEEL:
+            ordem = ordem[1:] + ordem[:1]
+        rank = REPETICOES[tuple(sorted(quantidades.values(), reverse=True))]
+        sequencia = rank == 0 and (ordem[0] - ordem[-1] == N_CARTAS_MAO - 1 or ordem[-1] == WHEEL[0])
+        if sequencia:
+            rank = 8 if mesmo_naipe else 4
+        elif mesmo_naipe:
+            rank = 5
+        chave = rank
+        for valor in ordem:
+            chave = (chave << 4) | valor
+        return chave
+
+    @staticmethod
+    def rank_da_chave(chave):
+        return chave >> (4 * N_CARTAS_MAO)
+
+    @staticmethod
+    def gerar_chaves():
+        """Chaves de desempate das 7462 classes em ordem crescente: a posição de cada chave é a força da classe"""
+        return [chave for chave, _, _ in Avaliador._gerar_classes()]
+
+    @staticmethod
+    def _gerar_classes():
+        """Lista ordenada de (chave, valores, mesmo_naipe) com um representante de cada classe de equivalência"""
+        classes = []
+        for valores in combinations_with_replacement(range(N_VALORES), N_CARTAS_MAO):
+            if len(set(valores)) == 1:
+                continue
+            classes.append((Avaliador.chave(valores, False), valores, False))
+            if len(set(valores)) == N_CARTAS_MAO:
+                classes.append((Avaliador.chave(valores, True), valores, True))
+        classes.sort()
+        return classes
+
+    @staticmethod
+    def todas_as_maos():
+        """Array (N_MAOS, 5) com os códigos de todas as mãos, em ordem crescente em cada linha e na ordem colex entre as linhas"""
+        decrescentes = combinations(range(N_CARTAS - 1, -1, -1), N_CARTAS_MAO)
+        maos = np.fromiter(chain.from_iterable(decrescentes), dtype=np.int8, count=N_MAOS * N_CARTAS_MAO)
+        return maos.reshape(N_MAOS, N_CARTAS_MAO)[::-1, ::-1]
+
+    @staticmethod
+    def _gerar_tabela(classes):
+        forcas_flush = np.zeros(1 << N_VALORES, dtype=np.uint16)
+        produtos = {}
+        for forca, (_, valores, mesmo_naipe) in enumerate(classes):
+            if mesmo_naipe:
+                forcas_flush[sum(1 << v for v in valores)] = forca
+            else:
+                produtos[int(np.prod([PRIMOS[v] for v in valores]))] = forca
+        chaves_produtos = np.array(sorted(produtos), dtype=np.int64)
+        forcas_produtos = np.array([produtos[p] for p in sorted(produtos)], dtype=np.uint16)
+
+        maos = Avaliador.todas_as_maos()
+        primos = np.array(PRIMOS, dtype=np.int64)
+        produtos_maos = np.ones(N_MAOS, dtype=np.int64)
+        mascaras = np.zeros(N_MAOS, dtype=np.int64)
+        naipe_da_primeira = maos[:, 0] // N_VALORES
+        mesmo_naipe = np.ones(N_MAOS, dtype=bool)
+        for coluna in range(N_CARTAS_MAO):
+            valores = maos[:, coluna] % N_VALORES
+            produtos_maos *= primos[valores]
+            mascaras |= 1 << valores.astype(np.int64)
+            mesmo_naipe &= maos[:, coluna] // N_VALORES == naipe_da_primeira
+        forcas = forcas_produtos[np.searchsorted(chaves_produtos, produtos_maos)]
+        forcas[mesmo_naipe] = forcas_flush[mascaras[mesmo_naipe]]
+        return forcas
+
+    @staticmethod
+    def _carregar(caminho, classes):
+        def valida(forcas):
+            return forcas.shape == (N_MAOS,) and forcas.dtype == np.uint16 and forcas.max() == Avaliador.N_CLASSES - 1
+        return carregar_ou_gerar(caminho, valida, lambda: Avaliador._gerar_tabela(classes))
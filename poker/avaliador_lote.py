@@ -0,0 +1,108 @@
+import numpy as np
+
+from poker.avaliador import Avaliador, BINOMIAIS, N_CARTAS_MAO, WHEEL
+from poker.conjunto_cartas import N_VALORES
+
+
+class AvaliadorLote:
+    """Avalia de uma vez um array (N, 5) de códigos de cartas, usando apenas operações vetorizadas do NumPy.
+
+    Os ranks seguem os índices de Mao.TIPOS e as forças são as mesmas de Avaliador/Mao.forca (0 a 7461).
+    """
+    _padrao = None
+
+    _BINOMIAIS = np.array(BINOMIAIS, dtype=np.int32)
+
+    def __init__(self):
+        self._chaves = np.array(Avaliador.gerar_chaves(), dtype=np.int64)
+        self._forcas = None
+
+    @staticmethod
+    def padrao():
+        if AvaliadorLote._padrao is None:
+            AvaliadorLote._padrao = AvaliadorLote()
+        return AvaliadorLote._padrao
+
+    def avaliar(self, cartas):
+        """Retorna dois arrays (N,): os ranks e as forças das mãos"""
+        cartas = np.asarray(cartas, dtype=np.int16)
+        valores = cartas % N_VALORES
+        naipes = cartas // N_VALORES
+        mesmo_naipe = (naipes == naipes[:, :1]).all(axis=1)
+
+        quantidades = AvaliadorLote._quantidades(valores)
+
+        # cada carta recebe quantidade * 16 + valor; em ordem decrescente, isso dá a mesma ordem de Mao.cartas
+        ordem = np.sort(quantidades * 16 + valores, axis=1)[:, ::-1]
+        quantidades = ordem >> 4
+        valores = ordem & 15
+
+        distintos = quantidades[:, 0] == 1
+        wheel = distintos & (valores == WHEEL).all(axis=1)
+        sequencia = distintos & ((valores[:, 0] - valores[:, -1] == N_CARTAS_MAO - 1) | wheel)
+        valores[wheel] = np.roll(WHEEL, -1)
+        valores = valores.astype(np.int64)
+
+        ranks = np.select(
+            [
+                sequencia & mesmo_naipe,
+                quantidades[:, 0] == 4,
+                (quantidades[:, 0] == 3) & (quantidades[:, 3] == 2),
+                mesmo_naipe,
+                sequencia,
+                quantidades[:, 0] == 3,
+                (quantidades[:, 0] == 2) & (quantidades[:, 2] == 2),
+                quantidades[:, 0] == 2
+            ],
+            [8, 7, 6, 5, 4, 3, 2, 1],
+            default=0
+        )
+
+        chaves = ranks.astype(np.int64)
+        for coluna in range(N_CARTAS_MAO):
+            chaves = (chaves << 4) | valores[:, coluna]
+        forcas = np.searchsorted(self._chaves, chaves)
+        return ranks, forcas
+
+    def forcas(self, cartas):
+        """Só as forças de um array (..., 5), consultando a tabela de Avaliador: bem mais rápido que avaliar"""
+        if self._forcas is None:
+            self._forcas = Avaliador.padrao().forcas
+        return self._forcas[AvaliadorLote.indices(cartas)]
+
+    @staticmethod
+    def indices(cartas):
+        """Posição de cada mão (..., 5), em qualquer ordem das cartas, na ordem colex da tabela de Avaliador"""
+        ordenadas = np.sort(np.asarray(cartas), axis=-1)
+        indices = AvaliadorLote._BINOMIAIS[0][ordenadas[..., 0]]
+        for coluna in range(1, N_CARTAS_MAO):
+            indices += AvaliadorLote._BINOMIAIS[coluna][ordenadas[..., coluna]]
+        return indices
+
+    @staticmethod
+    def mascaras(cartas):
+        """Máscara de 52 bits (np.uint64) das cartas de cada mão (..., k)"""
+        cartas = np.asarray(cartas).astype(np.uint64)
+        mascaras = np.zeros(cartas.shape[:-1], dtype=np.uint64)
+        for coluna in range(cartas.shape[-1]):
+            mascaras |= np.uint64(1) << cartas[..., coluna]
+        return mascaras
+
+    @staticmethod
+    def ordenar(cartas):
+        """Reordena cada linha na mesma ordem de Mao.cartas: repetições maiores, valor e naipe decrescentes, wheel com o ás no fim"""
+        cartas = np.asarray(cartas)
+        valores = cartas % N_VALORES
+        chaves = (AvaliadorLote._quantidades(valores) * 16 + valores) * 4 + cartas // N_VALORES
+        ordenadas = np.take_along_axis(cartas, np.argsort(-chaves, axis=1), axis=1)
+        wheel = (ordenadas % N_VALORES == WHEEL).all(axis=1)
+        ordenadas[wheel] = np.roll(ordenadas[wheel], -1, axis=1)
+        return ordenadas
+
+    @staticmethod
+    def _quantidades(valores):
+        """Quantas vezes o valor de cada carta aparece na sua mão"""
+        quantidades = np.zeros(valores.shape, dtype=np.int16)
+        for coluna in range(N_CARTAS_MAO):
+            quantidades += valores == valores[:, coluna:coluna + 1]
+        return quantidades
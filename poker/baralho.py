@@ -1,34 +1,97 @@
-import random
-
+from poker.aleatorio import FonteAleatoria
 from poker.carta import Carta
+from poker.conjunto_cartas import ConjuntoCartas, N_CARTAS
 
 
 class Baralho:
+    """Baralho guardado em uma lista fixa de códigos, reaproveitada entre partidas com reset().
+
+    As cartas restantes ocupam as primeiras posições da lista e são distribuídas a partir do fim. O embaralhamento é
+    preguiçoso: embaralhar() só marca o baralho, e cada carta distribuída é sorteada entre as restantes (Fisher-Yates
+    parcial), de modo que só as posições efetivamente usadas são embaralhadas. Para retirar cartas específicas, a
+    posição de cada código é mantida em uma segunda lista, e a carta troca de lugar com a última restante, em O(1).
+    """
+
+    def __init__(self, aleatorio=None):
+        """aleatorio é a FonteAleatoria dos embaralhamentos (ou uma semente para criá-la)"""
+        self._aleatorio = FonteAleatoria.criar(aleatorio)
+        self._codigos = list(range(N_CARTAS))
+        self._posicoes = list(range(N_CARTAS))
+        self._n = N_CARTAS
+        self._embaralhamento_pendente = False
 
-    def __init__(self):
-        self._cartas = [Carta(valor, naipe) for naipe in Carta.NAIPES for valor in Carta.VALORES]
+    def reset(self):
+        """Devolve todas as cartas ao baralho, na ordem de um baralho novo, sem alocar novas listas"""
+        self._codigos[:] = range(N_CARTAS)
+        self._posicoes[:] = range(N_CARTAS)
+        self._n = N_CARTAS
+        self._embaralhamento_pendente = False
 
     @property
     def cartas(self):
-        return self._cartas
+        return [Carta.from_codigo(c) for c in self.codigos]
+
+    @property
+    def codigos(self):
+        self._concluir_embaralhamento()
+        return self._codigos[:self._n]
 
     def embaralhar(self):
-        random.shuffle(self._cartas)
+        self._embaralhamento_pendente = True
+
+    def _concluir_embaralhamento(self):
+        """Embaralha de fato as cartas restantes, quando alguém precisa ver a ordem delas"""
+        if self._embaralhamento_pendente:
+            for i in range(self._n - 1, 0, -1):
+                self._trocar_posicoes(i, self._aleatorio.inteiro(i + 1))
+            self._embaralhamento_pendente = False
 
     def distribuir(self, n_cartas, cartas=None):
+        return [Carta.from_codigo(c) for c in self._distribuir_codigos(n_cartas, cartas)]
+
+    def distribuir_conjunto(self, n_cartas, cartas=None):
+        """Igual a distribuir, mas sem criar objetos Carta"""
+        return ConjuntoCartas.from_codigos(self._distribuir_codigos(n_cartas, cartas))
+
+    def _distribuir_codigos(self, n_cartas, cartas):
         if not cartas:
-            cartas = [self._cartas.pop() for _ in range(n_cartas)]
-        else:
+            return [self._distribuir_codigo() for _ in range(n_cartas)]
+        if isinstance(cartas, str):
             cartas = Carta.get_cartas(cartas)
-            for carta in cartas:
-                self._cartas.remove(carta)
-        return cartas
+        codigos = cartas.codigos if isinstance(cartas, ConjuntoCartas) else [c.codigo for c in cartas]
+        for codigo in codigos:
+            self._retirar(codigo)
+        return codigos
+
+    def _distribuir_codigo(self):
+        if self._n == 0:
+            raise ValueError('Baralho vazio.')
+        if self._embaralhamento_pendente:
+            self._trocar_posicoes(self._n - 1, self._aleatorio.inteiro(self._n))
+        self._n -= 1
+        return self._codigos[self._n]
+
+    def _retirar(self, codigo):
+        posicao = self._posicoes[codigo]
+        if posicao >= self._n:
+            raise ValueError(f'Carta fora do baralho: {Carta.from_codigo(codigo)}.')
+        self._n -= 1
+        self._trocar_posicoes(posicao, self._n)
+
+    def _trocar_posicoes(self, i, j):
+        codigos = self._codigos
+        codigos[i], codigos[j] = codigos[j], codigos[i]
+        self._posicoes[codigos[i]] = i
+        self._posicoes[codigos[j]] = j
 
     def __eq__(self, other):
-        return self._cartas == other.cartas
+        return self.codigos == other.codigos
 
     def __len__(self):
-        return len(self._cartas)
+        return self._n
 
     def __iter__(self):
-        return iter(self._cartas)
+        return iter(self.cartas)
+
+    def __contains__(self, carta):
+        return self._posicoes[carta.codigo] < self._n
@@ -0,0 +1,60 @@
+import os
+
+import numpy as np
+
+from poker.arquivos import salvar_atomico
+from poker.canonizador import Canonizador
+
+
+class CacheClasses:
+    """Resultados de uma análise cara, um por classe canônica de mão, guardados em um .npy mapeado em memória.
+
+    Cada registro tem o valor da classe e um indicador de preenchimento. O arquivo é criado vazio (esparso, sem ocupar
+    disco pelas classes não calculadas) e preenchido aos poucos; como é mapeado para leitura e escrita, o que uma
+    execução calcula fica para as próximas, e processos que abrem o mesmo arquivo compartilham os resultados.
+    """
+
+    def __init__(self, caminho, formato=(), dtype=np.float64, quantidade=Canonizador.N_CLASSES):
+        self._caminho = caminho
+        tipo = np.dtype([('preenchida', np.bool_), ('valor', dtype, formato)])
+        if not os.path.exists(caminho):
+            CacheClasses._criar(caminho, tipo, quantidade)
+        self._registros = np.load(caminho, mmap_mode='r+')
+        if self._registros.dtype != tipo or self._registros.shape != (quantidade,):
+            raise ValueError(f'Cache {caminho} com registros {self._registros.dtype} x {self._registros.shape}, e não {tipo} x {(quantidade,)}.')
+
+    @property
+    def caminho(self):
+        return self._caminho
+
+    def preenchidas(self, classes):
+        return self._registros['preenchida'][np.asarray(classes)]
+
+    def obter(self, classes):
+        """Valores das classes; todas devem estar preenchidas"""
+        classes = np.asarray(classes)
+        if not self.preenchidas(classes).all():
+            raise KeyError(f'Classes sem resultado no cache: {np.unique(classes[~self.preenchidas(classes)]).tolist()[:10]}.')
+        return self._registros['valor'][classes]
+
+    def gravar(self, classes, valores):
+        classes = np.asarray(classes)
+        self._registros['valor'][classes] = valores
+        self._registros['preenchida'][classes] = True  # só depois do valor, para que outro processo nunca leia um valor pela metade
+
+    def obter_ou_calcular(self, classes, calcular):
+        """Valores das classes, calculando antes, com calcular(classes) -> valores, só as que ainda faltam no cache"""
+        classes = np.asarray(classes)
+        faltantes = np.unique(classes[~self.preenchidas(classes)])
+        if len(faltantes):
+            self.gravar(faltantes, calcular(faltantes))
+        return self._registros['valor'][classes]
+
+    def sincronizar(self):
+        """Grava no disco o que já foi preenchido"""
+        self._registros.flush()
+
+    @staticmethod
+    def _criar(caminho, tipo, quantidade):
+        # se outro processo criou o cache antes, fica o dele, que talvez já tenha resultados
+        salvar_atomico(caminho, lambda temporario: np.lib.format.open_memmap(temporario, mode='w+', dtype=tipo, shape=(quantidade,)).flush(), substituir=False)
@@ -0,0 +1,123 @@
+from statistics import NormalDist
+from typing import NamedTuple
+
+import numpy as np
+
+from poker import mascaras
+from poker.avaliacao_sequencial import Intervalo, intervalo_wilson
+from poker.avaliador import Avaliador
+from poker.avaliador_lote import AvaliadorLote
+from poker.conjunto_cartas import N_CARTAS
+from poker.mao import Mao
+from poker.simulacao_lote import SimulacaoLote
+
+TIPOS_EQUIDADE = ['vitoria', 'empate', 'derrota']
+
+
+class ResultadoEquidade(NamedTuple):
+    vitorias: int
+    empates: int
+    derrotas: int
+    pote: float  # soma das frações do pote ganhas: 1 na vitória e 1 / (jogadores empatados) no empate
+    exato: bool  # se todas as mãos do oponente foram enumeradas, sem erro de amostragem
+
+    @property
+    def total(self):
+        return self.vitorias + self.empates + self.derrotas
+
+    @property
+    def vitoria(self):
+        return self.vitorias / self.total
+
+    @property
+    def empate(self):
+        return self.empates / self.total
+
+    @property
+    def derrota(self):
+        return self.derrotas / self.total
+
+    @property
+    def equidade(self):
+        """Fração esperada do pote"""
+        return self.pote / self.total
+
+    def intervalo(self, tipo, confianca=0.95):
+        """Intervalo de Wilson da probabilidade de tipo (um de TIPOS_EQUIDADE); sem largura, se o resultado é exato"""
+        contagem = (self.vitorias, self.empates, self.derrotas)[TIPOS_EQUIDADE.index(tipo)]
+        if self.exato:
+            return Intervalo(contagem / self.total, contagem / self.total, contagem / self.total)
+        return intervalo_wilson(contagem, self.total, NormalDist().inv_cdf((1 + confianca) / 2))
+
+
+class CalculadoraEquidade:
+    """Probabilidades de vitória, empate e derrota de uma mão no showdown contra oponentes com mãos aleatórias.
+
+    As mãos dos oponentes saem das cartas que o jogador não tem, em lotes vetorizados, e são comparadas pela força
+    completa (Mao.forca, com os desempates), consultada diretamente na tabela de Avaliador. Com uma troca, as cartas
+    descartadas ficam fora do baralho e as compradas saem dele antes das mãos dos oponentes, que são as mãos finais deles
+    (a troca dos oponentes não é simulada). Contra um único oponente e sem troca, as 1.533.939 mãos possíveis do
+    oponente podem ser enumeradas, e o resultado é exato.
+    """
+    AMOSTRAS = 1_000_000
+    TAMANHO_BLOCO = 1 << 16
+
+    def __init__(self, aleatorio=None):
+        """aleatorio é a FonteAleatoria (ou semente, SeedSequence ou Generator) dos sorteios das mãos"""
+        self._simulacao = SimulacaoLote(aleatorio)
+        self._avaliador = AvaliadorLote.padrao()
+        self._mascaras = None  # das 2.598.960 mãos, só para a enumeração exata
+
+    def calcular(self, mao, oponentes=1, trocas=0, amostras=AMOSTRAS):
+        return self.calcular_codigos([c.codigo for c in mao.cartas], oponentes, trocas, amostras)
+
+    def calcular_codigos(self, codigos, oponentes=1, trocas=0, amostras=AMOSTRAS):
+        """ResultadoEquidade das 5 cartas (na ordem de Mao.cartas) contra oponentes mãos, depois de trocar as cartas da máscara trocas.
+
+        amostras é quantas distribuições das mãos dos oponentes são sorteadas; com None, todas as mãos do oponente são
+        enumeradas, o que só é possível contra 1 oponente e sem troca.
+        """
+        trocas = mascaras.normalizar(trocas)
+        if oponentes < 1 or Mao.TAMANHO + mascaras.contar(trocas) + oponentes * Mao.TAMANHO > N_CARTAS:
+            raise ValueError(f'Quantidade inválida de oponentes: {oponentes}, com {mascaras.contar(trocas)} cartas trocadas.')
+        if amostras is None:
+            if oponentes != 1 or trocas:
+                raise ValueError('A enumeração exata só é possível contra 1 oponente e sem troca.')
+            return self._enumerar(codigos)
+        if amostras < 1:
+            raise ValueError(f'Quantidade inválida de amostras: {amostras}.')
+        return self._amostrar(codigos, oponentes, trocas, amostras)
+
+    def _enumerar(self, codigos):
+        if self._mascaras is None:
+            self._mascaras = AvaliadorLote.mascaras(Avaliador.todas_as_maos())
+        forca = self._avaliador.forcas(codigos)
+        oponentes = Avaliador.padrao().forcas[(self._mascaras & AvaliadorLote.mascaras(codigos)) == 0]
+        vitorias = int(np.count_nonzero(oponentes < forca))
+        empates = int(np.count_nonzero(oponentes == forca))
+        return ResultadoEquidade(vitorias, empates, len(oponentes) - vitorias - empates, vitorias + empates / 2, True)
+
+    def _amostrar(self, codigos, oponentes, trocas, amostras):
+        compradas = mascaras.contar(trocas)
+        mantidas = np.array(mascaras.manter(codigos, trocas), dtype=np.int8)
+        baralho = np.setdiff1d(np.arange(N_CARTAS), codigos)  # as cartas descartadas não voltam para o baralho
+        contagens = np.zeros(3)
+        for inicio in range(0, amostras, CalculadoraEquidade.TAMANHO_BLOCO):
+            n = min(CalculadoraEquidade.TAMANHO_BLOCO, amostras - inicio)
+            distribuidas = self._simulacao.distribuir(n, compradas + oponentes * Mao.TAMANHO, baralho)
+            contagens += CalculadoraEquidade._contar(
+                self._avaliador.forcas(np.concatenate([np.broadcast_to(mantidas, (n, len(mantidas))), distribuidas[:, :compradas]], axis=1)),
+                self._avaliador.forcas(distribuidas[:, compradas:].reshape(n, oponentes, Mao.TAMANHO))
+            )
+        vitorias, empates = int(contagens[0]), int(contagens[1])
+        return ResultadoEquidade(vitorias, empates, amostras - vitorias - empates, float(contagens[2]), False)
+
+    @staticmethod
+    def _contar(forcas, forcas_oponentes):
+        """Vitórias, empates e frações do pote ganhas, para as forças (N,) do jogador e (N, oponentes) dos oponentes"""
+        melhores = forcas_oponentes.max(axis=1)
+        venceu = forcas > melhores
+        empatou = forcas == melhores
+        empatados = np.count_nonzero(forcas_oponentes[empatou] == melhores[empatou, None], axis=1)
+        vitorias = np.count_nonzero(venceu)
+        return vitorias, np.count_nonzero(empatou), vitorias + np.sum(1 / (empatados + 1))
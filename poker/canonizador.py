@@ -0,0 +1,122 @@
+from bisect import bisect_left
+import os
+from typing import NamedTuple
+
+import numpy as np
+
+from poker.arquivos import carregar_ou_gerar
+from poker.avaliador import Avaliador, N_CARTAS_MAO
+from poker.conjunto_cartas import ConjuntoCartas, N_NAIPES, N_VALORES
+from poker.mao import Mao
+from poker import mascaras
+
+IDENTIDADE = tuple(range(N_CARTAS_MAO))
+
+
+class FormaCanonica(NamedTuple):
+    classe: int  # de 0 a Canonizador.N_CLASSES - 1
+    naipes: tuple  # naipe canônico de cada naipe original (índices de Carta.NAIPES)
+    posicoes: tuple  # para cada carta da mão, na ordem de Mao.cartas, sua posição na mão representante da classe
+
+
+class Canonizador:
+    """Reduz as mãos às classes de equivalência por permutação de naipes: 134.459 classes para as 2.598.960 mãos.
+
+    Cada mão é descrita pelas máscaras de 13 bits dos valores de cada naipe. Renomeando os naipes para que as máscaras
+    fiquem em ordem decrescente, mãos que só diferem pelos nomes dos naipes ficam iguais: essa é a mão representante da
+    classe, e a chave com as 4 máscaras ordenadas, em ordem crescente entre as classes, dá o número da classe. Como os
+    naipes renomeados mudam a ordem das cartas de mesmo valor em Mao.cartas, a forma canônica também diz para onde vai
+    cada posição, e assim as máscaras de troca podem ir da mão para a representante e voltar.
+    """
+    CAMINHO = os.path.join(os.path.dirname(__file__), 'tabela_canonica.npy')
+    N_CLASSES = 134_459
+    _padrao = None
+
+    def __init__(self, caminho=CAMINHO):
+        self._chaves = Canonizador._carregar(caminho)
+        self._lista_chaves = self._chaves.tolist()  # para uma mão por vez, bisect na lista custa menos que no array
+
+    @staticmethod
+    def padrao():
+        if Canonizador._padrao is None:
+            Canonizador._padrao = Canonizador()
+        return Canonizador._padrao
+
+    @property
+    def chaves(self):
+        """Array (N_CLASSES,) com as chaves das classes, em ordem crescente: a posição de cada chave é a classe"""
+        return self._chaves
+
+    def canonizar(self, codigos):
+        """FormaCanonica de uma mão, a partir dos códigos de suas 5 cartas na ordem de Mao.cartas"""
+        por_naipe = [0] * N_NAIPES
+        for codigo in codigos:
+            por_naipe[codigo // N_VALORES] |= 1 << (codigo % N_VALORES)
+        ordem = sorted(range(N_NAIPES), key=por_naipe.__getitem__, reverse=True)
+        naipes = [0] * N_NAIPES
+        chave = 0
+        for canonico, naipe in enumerate(ordem):
+            naipes[naipe] = canonico
+            chave = (chave << N_VALORES) | por_naipe[naipe]
+        return FormaCanonica(bisect_left(self._lista_chaves, chave), tuple(naipes), Canonizador._posicoes(codigos, naipes))
+
+    @staticmethod
+    def _posicoes(codigos, naipes):
+        # as cartas de mesmo valor ficam juntas em Mao.cartas; só a ordem entre elas muda, pelo naipe canônico
+        valores = [codigo % N_VALORES for codigo in codigos]
+        if len(set(valores)) == N_CARTAS_MAO:
+            return IDENTIDADE
+        nova_ordem = sorted(range(N_CARTAS_MAO), key=lambda i: (valores.index(valores[i]), -naipes[codigos[i] // N_VALORES]))
+        return mascaras.inverter_posicoes(nova_ordem)
+
+    def canonizar_lote(self, cartas):
+        """Versão vetorizada de canonizar para um array (N, 5): retorna as classes (N,), os naipes (N, 4) e as posições (N, 5)"""
+        cartas = np.asarray(cartas, dtype=np.int64)
+        ordem, chaves = Canonizador._ordenar_naipes(cartas)
+        naipes = np.argsort(ordem, axis=1)
+        valores = cartas % N_VALORES
+        primeiras = np.argmax(valores[:, :, None] == valores[:, None, :], axis=1)  # 1a posição com o mesmo valor
+        nova_ordem = np.argsort(primeiras * N_NAIPES + (N_NAIPES - 1 - np.take_along_axis(naipes, cartas // N_VALORES, axis=1)), axis=1, kind='stable')
+        return np.searchsorted(self._chaves, chaves), naipes, np.argsort(nova_ordem, axis=1)
+
+    @staticmethod
+    def _ordenar_naipes(cartas):
+        """Para cada linha de cartas, os naipes em ordem decrescente de máscara de valores e a chave dessa ordem"""
+        valores = cartas % N_VALORES
+        por_naipe = np.stack([np.bitwise_or.reduce(np.where(cartas // N_VALORES == naipe, 1 << valores, 0), axis=1) for naipe in range(N_NAIPES)], axis=1)
+        ordem = np.argsort(-por_naipe, axis=1, kind='stable')  # estável, como o sorted de canonizar
+        chaves = np.zeros(len(cartas), dtype=np.int64)
+        for mascara in np.take_along_axis(por_naipe, ordem, axis=1).T:
+            chaves = (chaves << N_VALORES) | mascara
+        return ordem, chaves
+
+    def representante(self, classe):
+        """Códigos das cartas da mão representante da classe, na ordem de Mao.cartas"""
+        chave = int(self._chaves[classe])
+        codigos = []
+        for naipe in range(N_NAIPES - 1, -1, -1):
+            por_naipe = chave & ((1 << N_VALORES) - 1)
+            codigos.extend(naipe * N_VALORES + valor for valor in range(N_VALORES) if por_naipe >> valor & 1)
+            chave >>= N_VALORES
+        return [carta.codigo for carta in Mao(ConjuntoCartas.from_codigos(codigos)).cartas]
+
+    @staticmethod
+    def para_canonica(trocas, forma):
+        """Máscara de troca da mão levada para a representante da classe"""
+        return mascaras.permutar(trocas, forma.posicoes)
+
+    @staticmethod
+    def da_canonica(trocas, forma):
+        """Máscara de troca da representante trazida de volta para a mão"""
+        return mascaras.permutar(trocas, mascaras.inverter_posicoes(forma.posicoes))
+
+    @staticmethod
+    def _gerar_chaves():
+        _, chaves = Canonizador._ordenar_naipes(Avaliador.todas_as_maos().astype(np.int64))
+        return np.unique(chaves)
+
+    @staticmethod
+    def _carregar(caminho):
+        def valida(chaves):
+            return chaves.shape == (Canonizador.N_CLASSES,) and chaves.dtype == np.int64
+        return carregar_ou_gerar(caminho, valida, Canonizador._gerar_chaves)
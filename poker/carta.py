@@ -1,12 +1,35 @@
+from functools import lru_cache
+
+
 class Carta:
+    """As 52 cartas são criadas uma única vez: Carta(valor, naipe) devolve sempre a mesma instância, imutável.
+
+    Por isso a igualdade é a própria identidade, e índices, código e hash já vêm calculados.
+    """
     VALORES = [2, 3, 4, 5, 6, 7, 8, 9, 10, 'J', 'Q', 'K', 'A']
     NAIPES = ['ouros', 'espadas', 'copas', 'paus']
+    __slots__ = ('_valor', '_naipe', '_indice_valor', '_indice_naipe', '_codigo')
+    _INSTANCIAS = {}  # (valor, naipe) -> Carta
+
+    def __new__(cls, valor, naipe):
+        try:
+            return Carta._INSTANCIAS[(valor, naipe)]
+        except (KeyError, TypeError):
+            if valor not in Carta.VALORES or naipe not in Carta.NAIPES:
+                raise ValueError(f'Carta({repr(valor)}, {repr(naipe)}) é inválida.') from None
+        # primeira vez que a carta é pedida: só acontece ao carregar o módulo, quando _POR_CODIGO é montado
+        carta = super().__new__(cls)
+        carta._indice_valor = Carta.VALORES.index(valor)
+        carta._indice_naipe = Carta.NAIPES.index(naipe)
+        carta._valor = Carta.VALORES[carta._indice_valor]
+        carta._naipe = naipe
+        carta._codigo = carta._indice_naipe * len(Carta.VALORES) + carta._indice_valor
+        return Carta._INSTANCIAS.setdefault((carta._valor, naipe), carta)
 
-    def __init__(self, valor, naipe):
-        if valor not in Carta.VALORES or naipe not in Carta.NAIPES:
-            raise ValueError(f'Carta({repr(valor)}, {repr(naipe)}) é inválida.')
-        self._valor = valor
-        self._naipe = naipe
+    @staticmethod
+    def of(valor, naipe):
+        """Devolve a instância compartilhada da carta; o mesmo que Carta(valor, naipe)"""
+        return Carta(valor, naipe)
 
     @property
     def valor(self):
@@ -18,15 +41,30 @@ class Carta:
 
     @property
     def indice_valor(self):
-        return Carta.VALORES.index(self._valor)
+        return self._indice_valor
 
     @property
     def indice_naipe(self):
-        return Carta.NAIPES.index(self._naipe)
+        return self._indice_naipe
+
+    @property
+    def codigo(self):
+        """Número de 0 a 51, na mesma ordem em que as cartas aparecem em um baralho novo"""
+        return self._codigo
+
+    @staticmethod
+    def from_codigo(codigo):
+        return _POR_CODIGO[codigo]
 
     @staticmethod
     def get_cartas(texto):
         """Gera uma lista de cartas a partir de um texto do tipo 2o3p10cAe"""
+        return list(Carta._interpretar(texto))
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _interpretar(texto):
+        """Versão memoizada de get_cartas; devolve uma tupla, para que o resultado guardado não possa ser alterado"""
         resultado = []
         valor = ''
         for c in texto:
@@ -38,7 +76,7 @@ class Carta:
                 valor = int(valor) if valor.isdigit() else valor
                 resultado.append(Carta(valor, naipe))
                 valor = ''
-        return resultado
+        return tuple(resultado)
 
     def __repr__(self):
         return f'Carta({repr(self._valor)}, {repr(self._naipe)})'
@@ -46,13 +84,16 @@ class Carta:
     def __str__(self):
         return f'{self._valor}{self._naipe[0]}'
 
-    def __eq__(self, other):
-        return self._valor == other.valor and self._naipe == other.naipe
-
     def __lt__(self, other):
-        v1, n1 = self.indice_valor, self.indice_naipe
+        v1, n1 = self._indice_valor, self._indice_naipe
         v2, n2 = other.indice_valor, other.indice_naipe
         return v1 < v2 if v1 != v2 else n1 < n2
 
     def __hash__(self):
-        return hash((self._valor, self._naipe))
+        return self._codigo
+
+    def __reduce__(self):
+        return Carta, (self._valor, self._naipe)
+
+
+_POR_CODIGO = tuple(Carta(valor, naipe) for naipe in Carta.NAIPES for valor in Carta.VALORES)
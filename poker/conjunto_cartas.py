@@ -0,0 +1,119 @@
+from poker.carta import Carta
+
+N_VALORES = len(Carta.VALORES)
+N_NAIPES = len(Carta.NAIPES)
+N_CARTAS = N_VALORES * N_NAIPES
+
+
+class ConjuntoCartas:
+    """Conjunto de cartas guardado em um inteiro de 52 bits: o bit de número Carta.codigo indica se a carta está presente.
+
+    Como o código é naipe * 13 + valor, cada naipe ocupa 13 bits seguidos, com o 2 no bit mais baixo e o ás no mais alto.
+    """
+    __slots__ = ('_bits',)
+    MASCARA_NAIPE = (1 << N_VALORES) - 1
+    MASCARA_BARALHO = (1 << N_CARTAS) - 1
+    TAMANHO_SEQUENCIA = 5
+
+    def __init__(self, bits=0):
+        self._bits = bits
+
+    @staticmethod
+    def from_codigos(codigos):
+        bits = 0
+        for codigo in codigos:
+            bits |= 1 << codigo
+        return ConjuntoCartas(bits)
+
+    @staticmethod
+    def from_cartas(cartas):
+        return ConjuntoCartas.from_codigos(c.codigo for c in cartas)
+
+    @staticmethod
+    def from_texto(texto):
+        return ConjuntoCartas.from_cartas(Carta.get_cartas(texto))
+
+    @staticmethod
+    def baralho():
+        return ConjuntoCartas(ConjuntoCartas.MASCARA_BARALHO)
+
+    @property
+    def bits(self):
+        return self._bits
+
+    @property
+    def codigos(self):
+        """Lista com os códigos das cartas, em ordem crescente"""
+        codigos = []
+        bits = self._bits
+        while bits:
+            menor = bits & -bits
+            codigos.append(menor.bit_length() - 1)
+            bits ^= menor
+        return codigos
+
+    @property
+    def cartas(self):
+        return [Carta.from_codigo(codigo) for codigo in self.codigos]
+
+    def naipe(self, indice_naipe):
+        """Máscara de 13 bits com os valores presentes em um naipe"""
+        return (self._bits >> (indice_naipe * N_VALORES)) & ConjuntoCartas.MASCARA_NAIPE
+
+    def valores(self):
+        """Máscara de 13 bits com os valores presentes em qualquer naipe"""
+        valores = 0
+        for indice_naipe in range(N_NAIPES):
+            valores |= self.naipe(indice_naipe)
+        return valores
+
+    def tem_flush(self):
+        return any(self.naipe(i).bit_count() >= ConjuntoCartas.TAMANHO_SEQUENCIA for i in range(N_NAIPES))
+
+    def tem_sequencia(self):
+        return ConjuntoCartas.maior_sequencia(self.valores()) is not None
+
+    def tem_straight_flush(self):
+        return any(ConjuntoCartas.maior_sequencia(self.naipe(i)) is not None for i in range(N_NAIPES))
+
+    @staticmethod
+    def maior_sequencia(valores):
+        """Índice do valor mais alto da maior sequência de 5 valores presentes na máscara, ou None se não houver"""
+        # o ás é copiado para uma posição abaixo do 2, para que A-2-3-4-5 (wheel) também forme sequência
+        estendida = (valores << 1) | (valores >> (N_VALORES - 1))
+        inicios = estendida
+        for i in range(1, ConjuntoCartas.TAMANHO_SEQUENCIA):
+            inicios &= estendida >> i
+        if not inicios:
+            return None
+        return inicios.bit_length() - 1 + ConjuntoCartas.TAMANHO_SEQUENCIA - 2
+
+    def __len__(self):
+        return self._bits.bit_count()
+
+    def __iter__(self):
+        return iter(self.codigos)
+
+    def __contains__(self, codigo):
+        return (self._bits >> codigo) & 1 == 1
+
+    def __or__(self, other):
+        return ConjuntoCartas(self._bits | other.bits)
+
+    def __and__(self, other):
+        return ConjuntoCartas(self._bits & other.bits)
+
+    def __sub__(self, other):
+        return ConjuntoCartas(self._bits & ~other.bits)
+
+    def __eq__(self, other):
+        return self._bits == other.bits
+
+    def __hash__(self):
+        return hash(self._bits)
+
+    def __repr__(self):
+        return f'ConjuntoCartas({self._bits:#x})'
+
+    def __str__(self):
+        return ''.join(str(Carta.from_codigo(codigo)) for codigo in reversed(self.codigos))
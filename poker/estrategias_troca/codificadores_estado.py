@@ -0,0 +1,106 @@
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+from poker.avaliador import Avaliador
+from poker.avaliador_lote import AvaliadorLote
+from poker.conjunto_cartas import ConjuntoCartas, N_NAIPES, N_VALORES
+from poker.mao import Mao
+
+
+def _gerar_projetos_sequencia():
+    """Para cada máscara de 13 bits de valores, se há 4 dos 5 valores de alguma sequência (contando o wheel)"""
+    valores = np.arange(1 << N_VALORES)
+    estendida = (valores << 1) | (valores >> (N_VALORES - 1))  # o ás também abaixo do 2, como em maior_sequencia
+    uns = np.array([bin(janela).count('1') for janela in range(1 << ConjuntoCartas.TAMANHO_SEQUENCIA)])
+    projetos = np.zeros(len(valores), dtype=bool)
+    for inicio in range(N_VALORES + 1 - ConjuntoCartas.TAMANHO_SEQUENCIA + 1):
+        projetos |= uns[(estendida >> inicio) & ((1 << ConjuntoCartas.TAMANHO_SEQUENCIA) - 1)] == ConjuntoCartas.TAMANHO_SEQUENCIA - 1
+    return projetos
+
+
+PROJETOS_SEQUENCIA = _gerar_projetos_sequencia()
+_PROJETOS_SEQUENCIA_LISTA = PROJETOS_SEQUENCIA.tolist()  # para uma mão por vez, indexar a lista custa menos que o array
+
+
+class CodificadorEstado(ABC):
+    """Transforma uma mão no estado (índice de linha) da tabela de pesos de EstrategiaTrocaRL.
+
+    Mãos com o mesmo estado compartilham a linha e, portanto, a decisão; as máscaras de troca se referem às posições de
+    Mao.cartas, por isso um estado só deve reunir mãos cujas cartas, nessa ordem, tenham papéis equivalentes.
+    """
+    nome = None
+    quantidade = 0  # quantos estados existem, isto é, quantas linhas a tabela tem
+    rotulos = None  # nomes das linhas, quando há poucas, para os heatmaps
+
+    @abstractmethod
+    def codificar(self, mao):
+        """Estado de uma Mao, de 0 a quantidade - 1"""
+
+    def codificar_lote(self, cartas, ranks):  # pylint: disable=unused-argument
+        """Estados de N mãos: cartas é um array (N, 5) na ordem de Mao.cartas e ranks, um array (N,) com seus ranks"""
+        return np.array([self.codificar(Mao(ConjuntoCartas.from_codigos(codigos))) for codigos in np.asarray(cartas).tolist()], dtype=np.int64)
+
+
+class CodificadorRank(CodificadorEstado):
+    """Um estado por tipo de mão: o espaço de estados original, com 9 linhas"""
+    nome = 'rank'
+    quantidade = len(Mao.TIPOS)
+    rotulos = Mao.TIPOS
+
+    def codificar(self, mao):
+        return mao.rank
+
+    def codificar_lote(self, cartas, ranks):
+        return np.asarray(ranks)
+
+
+class CodificadorCategoria(CodificadorEstado):
+    """Tipo da mão, valor da sua 1a carta (o do par, da trinca ou a mais alta) e potencial de projeto.
+
+    O projeto vale 1 se há 4 cartas do mesmo naipe, 2 se há 4 dos 5 valores de uma sequência e 3 se há os dois. Assim,
+    um par de ases e um par de dois, ou quatro cartas de flush e uma mão sem projeto, deixam de dividir a mesma linha.
+    """
+    nome = 'categoria'
+    N_PROJETOS = 4
+    quantidade = len(Mao.TIPOS) * N_VALORES * N_PROJETOS
+
+    def codificar(self, mao):
+        conjunto = mao.conjunto
+        flush = max(conjunto.naipe(i).bit_count() for i in range(N_NAIPES)) == Mao.TAMANHO - 1
+        projeto = flush + 2 * _PROJETOS_SEQUENCIA_LISTA[conjunto.valores()]
+        # o valor da 1a carta de Mao.cartas é o mais alto da chave de desempate, logo abaixo do rank
+        principal = (Avaliador.padrao().chaves[mao.forca] >> (4 * (Mao.TAMANHO - 1))) & 15
+        return (mao.rank * N_VALORES + principal) * CodificadorCategoria.N_PROJETOS + projeto
+
+    def codificar_lote(self, cartas, ranks):
+        cartas = np.asarray(cartas, dtype=np.int64)
+        valores = cartas % N_VALORES
+        naipes = cartas // N_VALORES
+        flush = np.max([(naipes == naipe).sum(axis=1) for naipe in range(N_NAIPES)], axis=0) == Mao.TAMANHO - 1
+        mascaras_valores = np.bitwise_or.reduce(1 << valores, axis=1)
+        projetos = flush + 2 * PROJETOS_SEQUENCIA[mascaras_valores]
+        return (np.asarray(ranks, dtype=np.int64) * N_VALORES + valores[:, 0]) * CodificadorCategoria.N_PROJETOS + projetos
+
+
+class CodificadorForca(CodificadorEstado):
+    """Um estado por classe de equivalência do avaliador (Mao.forca): 7462 linhas, que só ignoram os naipes fora do flush"""
+    nome = 'forca'
+    quantidade = Avaliador.N_CLASSES
+
+    def codificar(self, mao):
+        return mao.forca
+
+    def codificar_lote(self, cartas, ranks):
+        _, forcas = AvaliadorLote.padrao().avaliar(cartas)
+        return forcas
+
+
+CODIFICADORES = {codificador.nome: codificador for codificador in [CodificadorRank, CodificadorCategoria, CodificadorForca]}
+
+
+def criar_codificador(nome):
+    try:
+        return CODIFICADORES[nome]()
+    except KeyError:
+        raise ValueError(f'Codificador de estado desconhecido: {nome}.') from None
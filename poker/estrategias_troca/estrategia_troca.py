@@ -1,12 +1,44 @@
 from abc import ABC, abstractmethod
 
+import numpy as np
+
+from poker.aleatorio import FonteAleatoria
+from poker.conjunto_cartas import ConjuntoCartas
+from poker.mao import Mao
+
 
 class EstrategiaTroca(ABC):
 
+    def __init__(self, aleatorio=None):
+        """aleatorio é a FonteAleatoria dos sorteios da estratégia (ou uma semente para criá-la)"""
+        self._aleatorio = FonteAleatoria.criar(aleatorio)
+
+    @property
+    def aleatorio(self):
+        return self._aleatorio
+
+    def obter_trocas(self, mao):
+        """Máscara inteira com as cartas a trocar; o bit mais alto é a 1a carta de Mao.cartas"""
+        return self._decidir_trocas(mao)
+
     def obter_indices_de_troca(self, mao):
-        valor = self._decidir_trocas(mao)
-        return bin(valor)[2:].zfill(len(mao.cartas))
+        """Mesma decisão de obter_trocas, no formato antigo de texto ('01011')"""
+        return Mao.trocas_to_indices(self.obter_trocas(mao))
+
+    def obter_trocas_lote(self, cartas, ranks, gerador=None):
+        """Decide as trocas de N mãos de uma vez.
+
+        cartas é um array (N, 5) de códigos na ordem de Mao.cartas e ranks é um array (N,) com os ranks dessas mãos.
+        Os sorteios usam o gerador (np.random.Generator) informado ou, sem ele, o da estratégia. Retorna um array (N,) de inteiros, cujos binários
+        representam as cartas a serem trocadas.
+        """
+        gerador = gerador if gerador is not None else self._aleatorio.gerador
+        return self._decidir_trocas_lote(np.asarray(cartas), np.asarray(ranks), gerador)
 
     @abstractmethod
     def _decidir_trocas(self, mao):
         """ Deve retornar um número inteiro, cujo binário representa as cartas a serem trocadas. """
+
+    def _decidir_trocas_lote(self, cartas, ranks, gerador):  # pylint: disable=unused-argument
+        """ Versão genérica, mão a mão; as subclasses podem sobrescrevê-la com uma versão vetorizada. """
+        return np.array([self._decidir_trocas(Mao(ConjuntoCartas.from_codigos(codigos))) for codigos in cartas.tolist()], dtype=np.int64)
@@ -0,0 +1,39 @@
+import numpy as np
+
+from poker.estrategias_troca.estrategia_troca import EstrategiaTroca
+from poker.solucionador_trocas import SolucionadorTrocas
+
+
+class EstrategiaTrocaOtima(EstrategiaTroca):
+    """Escolhe a troca de maior valor esperado, calculado exatamente pelo SolucionadorTrocas.
+
+    O valor de uma troca é pesos[0] * P(melhorou) + pesos[1] * P(piorou) + pesos[2] * P(empate). Com os pesos padrão, é
+    a troca com o maior saldo entre a chance de melhorar e a de piorar; se houver empate, vence a de menor máscara.
+    """
+    PESOS = (1, -1, 0)
+
+    def __init__(self, pesos=PESOS, solucionador=None, aleatorio=None):
+        super().__init__(aleatorio)
+        self._pesos = pesos
+        self._solucionador = solucionador
+
+    @property
+    def solucionador(self):
+        # obtido só no primeiro uso, para que a estratégia possa ser enviada leve a outros processos
+        if self._solucionador is None:
+            self._solucionador = SolucionadorTrocas.padrao()
+        return self._solucionador
+
+    def _decidir_trocas(self, mao):
+        return self._melhor_troca(self.solucionador.resolver(mao))
+
+    def _decidir_trocas_lote(self, cartas, ranks, gerador):
+        resultados = (self.solucionador.resolver_codigos(codigos, rank) for codigos, rank in zip(cartas.tolist(), ranks.tolist()))
+        return np.array([self._melhor_troca(resultado) for resultado in resultados], dtype=np.int64)
+
+    def valores(self, resultado):
+        melhorou, piorou, empate = self._pesos
+        return melhorou * resultado.melhorou + piorou * resultado.piorou + empate * resultado.empate
+
+    def _melhor_troca(self, resultado):
+        return int(np.argmax(self.valores(resultado)))
@@ -1,8 +1,9 @@
-import random
-
 from poker.estrategias_troca.estrategia_troca import EstrategiaTroca
 
 
 class EstrategiaTrocaRandomica(EstrategiaTroca):
     def _decidir_trocas(self, mao):
-        return random.randrange(2 ** len(mao.cartas))
+        return self._aleatorio.inteiro(2 ** len(mao))
+
+    def _decidir_trocas_lote(self, cartas, ranks, gerador):
+        return gerador.integers(2 ** cartas.shape[1], size=len(cartas))
@@ -1,41 +1,218 @@
+import json
+from bisect import bisect_right
+from itertools import accumulate
+
 import numpy as np
 
+from poker import mascaras
+from poker.arquivos import salvar_atomico
+from poker.estrategias_troca.codificadores_estado import CodificadorRank
 from poker.estrategias_troca.estrategia_troca import EstrategiaTroca
-from poker.mao import Mao
 
 
 class EstrategiaTrocaRL(EstrategiaTroca):
+    """Sorteia a troca com probabilidade proporcional ao peso de cada máscara na linha do estado da mão.
+
+    O estado vem do codificador (por padrão, o rank da mão). A tabela guarda os pesos com o menor tipo sem sinal que
+    comporta maximo e só é preenchida aos poucos: como o peso mínimo é 1, uma linha só de zeros ainda não foi visitada e
+    recebe seus pesos aleatórios na primeira visita, de modo que tabelas com centenas de milhares de estados não ocupam
+    memória (nem consomem sorteios) pelas linhas que o treinamento nunca alcança.
+
+    As somas acumuladas dos pesos das linhas sorteadas uma a uma ficam guardadas e só são refeitas depois que
+    registrar_resultado(s) ou carregar alteram a tabela. Quem alterar a tabela diretamente deve chamar invalidar_cache().
+    """
     MIN = 1
     MAX = 279
+    VERSAO_CHECKPOINT = 2
+    LIMITE_CACHE = 4096  # linhas com somas acumuladas guardadas; passando disso, o cache recomeça
 
-    def __init__(self, caminho=None):
-        super().__init__()
+    def __init__(self, caminho=None, minimo=MIN, maximo=MAX, aleatorio=None, codificador=None):
+        super().__init__(aleatorio)
+        if not 0 < minimo < maximo:
+            raise ValueError(f'Limites de peso inválidos: [{minimo}, {maximo}].')
+        self._minimo = minimo
+        self._maximo = maximo
+        self._codificador = codificador if codificador is not None else CodificadorRank()
+        self._acumulados_linhas = {}  # estado -> somas acumuladas da linha, em lista, para sortear uma mão por vez
+        self._tabela = np.zeros((self._codificador.quantidade, mascaras.N_MASCARAS), dtype=np.min_scalar_type(maximo))
         if caminho:
             self.carregar(caminho)
-        else:
-            # self._tabela = np.ones((len(Mao.TIPOS), 2 ** Mao.TAMANHO))
-            self._tabela = np.random.randint(EstrategiaTrocaRL.MIN, EstrategiaTrocaRL.MAX, size=(len(Mao.TIPOS), 2 ** Mao.TAMANHO))
 
     @property
     def tabela(self):
         return self._tabela
 
+    @property
+    def minimo(self):
+        return self._minimo
+
+    @property
+    def maximo(self):
+        return self._maximo
+
+    @property
+    def codificador(self):
+        return self._codificador
+
+    def invalidar_cache(self, estado=None):
+        """Descarta as somas acumuladas guardadas, de todas as linhas ou só da linha do estado"""
+        if estado is None:
+            self._acumulados_linhas.clear()
+        else:
+            self._acumulados_linhas.pop(estado, None)
+
     def _decidir_trocas(self, mao):
-        pesos_do_rank = self._tabela[mao.rank]
-        probs = pesos_do_rank / pesos_do_rank.sum()
-        return int(np.random.choice(len(pesos_do_rank), p=probs))
+        # amostragem pela inversa da distribuição acumulada da linha
+        estado = self._codificador.codificar(mao)
+        acumulados = self._acumulados_linhas.get(estado)
+        if acumulados is None:
+            if len(self._acumulados_linhas) >= EstrategiaTrocaRL.LIMITE_CACHE:
+                self._acumulados_linhas.clear()
+            acumulados = self._acumulados_linhas[estado] = list(accumulate(self._linhas(np.array([estado]))[0].tolist()))
+        return bisect_right(acumulados, self._aleatorio.uniforme() * acumulados[-1])
+
+    def _decidir_trocas_lote(self, cartas, ranks, gerador):
+        return self.amostrar_lote(self._codificador.codificar_lote(cartas, ranks), gerador)
 
-    def registrar_resultado(self, rank_mao, indices, recompensa):
-        trocas = Mao.indices_to_trocas(indices)
-        peso = self._tabela[rank_mao, trocas]
-        if EstrategiaTrocaRL.MIN <= (peso + recompensa) <= EstrategiaTrocaRL.MAX:
-            self._tabela[rank_mao, trocas] += recompensa
+    def amostrar_lote(self, estados, gerador=None):
+        """Sorteia de uma vez uma troca para cada estado do array estados, pela inversa da distribuição acumulada"""
+        gerador = gerador if gerador is not None else self._aleatorio.gerador
+        acumulados = np.cumsum(self._linhas(np.asarray(estados)), axis=1, dtype=np.int64)
+        sorteios = gerador.random(len(acumulados)) * acumulados[:, -1]
+        return (acumulados <= sorteios[:, None]).sum(axis=1)
 
-    def salvar(self, caminho):
-        np.savetxt(caminho, self._tabela, delimiter=';', fmt='%d')
+    def _linhas(self, estados):
+        """Linhas da tabela dos estados, sorteando os pesos das que ainda não foram visitadas"""
+        linhas = self._tabela[estados]
+        novas = ~linhas.any(axis=1)
+        if novas.any():
+            if self._tabela.flags.writeable:
+                pendentes = np.unique(estados[novas])
+                self._tabela[pendentes] = self._aleatorio.gerador.integers(self._minimo, self._maximo, size=(len(pendentes), mascaras.N_MASCARAS))
+                linhas = self._tabela[estados]
+            else:
+                # tabela só de leitura, como a mapeada de um .npy: a linha não visitada sorteia as trocas uniformemente
+                linhas[novas] = self._minimo
+        return linhas
+
+    def _garantir_gravavel(self):
+        """Uma tabela mapeada só para leitura é copiada para a memória na primeira alteração; o arquivo não muda"""
+        if not self._tabela.flags.writeable:
+            self._tabela = self._ajustar_maximo(np.array(self._tabela))
+
+    def registrar_resultado(self, estado, trocas, recompensa):
+        trocas = mascaras.normalizar(trocas)
+        self._garantir_gravavel()
+        peso = int(self._tabela[estado, trocas])
+        if peso == 0:  # linha ainda não visitada
+            peso = int(self._linhas(np.array([estado]))[0, trocas])
+        self._tabela[estado, trocas] = min(max(peso + recompensa, self._minimo), self._maximo)
+        self.invalidar_cache(estado)
+
+    def registrar_resultados(self, estados, trocas, recompensas):
+        """Aplica de uma vez as recompensas de vários episódios.
+
+        Como em registrar_resultado, o peso resultante é limitado a [minimo, maximo]; mas aqui todas as recompensas que
+        caem na mesma célula são somadas primeiro e só o resultado é limitado, de modo que um lote de um episódio por
+        célula dá a mesma tabela que registrar um a um.
+        """
+        self._garantir_gravavel()
+        estados = np.asarray(estados, dtype=np.int64)
+        self._linhas(np.unique(estados))
+        celulas, posicoes = np.unique(estados * mascaras.N_MASCARAS + np.asarray(trocas), return_inverse=True)
+        deltas = np.zeros(len(celulas), dtype=np.int64)
+        np.add.at(deltas, posicoes, np.asarray(recompensas))
+        celulas = celulas[deltas != 0]
+        linhas, colunas = celulas // mascaras.N_MASCARAS, celulas % mascaras.N_MASCARAS
+        self._tabela[linhas, colunas] = np.clip(self._tabela[linhas, colunas] + deltas[deltas != 0], self._minimo, self._maximo)
+        self.invalidar_cache()
+
+    def salvar(self, caminho, **metadados):
+        """Salva a tabela em CSV, em .npy (para ser mapeada em memória por carregar) ou em um checkpoint .npz.
+
+        No checkpoint, a tabela é gravada comprimida; junto vão a versão do formato, os limites, o codificador de estado
+        e os metadados informados (como o episódio e o estado dos geradores aleatórios). Os formatos binários são
+        gravados em um arquivo temporário que só então substitui o anterior, de modo que uma interrupção no meio da
+        gravação nunca deixa um arquivo corrompido, nem altera uma tabela que algum processo ainda esteja mapeando.
+        """
+        caminho = str(caminho)
+        if not caminho.endswith(('.npz', '.npy')):
+            np.savetxt(caminho, self._tabela, delimiter=';', fmt='%d')
+            return
+        if caminho.endswith('.npy'):
+            salvar_atomico(caminho, lambda temporario: np.save(temporario, self._tabela))
+            return
+        salvar_atomico(caminho, lambda temporario: np.savez_compressed(
+            temporario,
+            versao=np.int64(EstrategiaTrocaRL.VERSAO_CHECKPOINT),
+            tabela=self._tabela,
+            codificador=np.str_(self._codificador.nome),
+            minimo=np.int64(self._minimo),
+            maximo=np.int64(self._maximo),
+            metadados=np.str_(json.dumps(metadados))
+        ))
 
     def carregar(self, caminho):
+        """Carrega a tabela de um CSV, de um .npy ou de um checkpoint .npz, retornando os metadados salvos com ela (ou {}).
+
+        O .npy é mapeado em memória só para leitura: carrega instantaneamente, qualquer que seja o tamanho, e processos
+        que mapeiam o mesmo arquivo compartilham as páginas. A primeira alteração copia a tabela para a memória.
+        """
+        caminho = str(caminho)
         try:
-            self._tabela = np.loadtxt(caminho, delimiter=';')
+            if caminho.endswith('.npz'):
+                return self._carregar_checkpoint(caminho)
+            if caminho.endswith('.npy'):
+                self._definir_tabela(np.load(caminho, mmap_mode='r'))
+            else:
+                self._definir_tabela(np.loadtxt(caminho, delimiter=';', dtype=np.int64, ndmin=2))
         except FileNotFoundError:
             pass
+        return {}
+
+    def _carregar_checkpoint(self, caminho):
+        with np.load(caminho) as dados:
+            versao = int(dados['versao'])
+            if versao > EstrategiaTrocaRL.VERSAO_CHECKPOINT:
+                raise ValueError(f'Versão de checkpoint não suportada: {versao}.')
+            nome = str(dados['codificador']) if 'codificador' in dados else CodificadorRank.nome  # versão 1: só rank
+            if nome != self._codificador.nome:
+                raise ValueError(f'Checkpoint do codificador {nome}, mas a estratégia usa {self._codificador.nome}.')
+            self._minimo = int(dados['minimo'])
+            self._maximo = int(dados['maximo'])
+            self._definir_tabela(dados['tabela'])
+            return json.loads(str(dados['metadados']))
+
+    def _definir_tabela(self, tabela):
+        """Adota uma tabela carregada, conferindo o formato; uma tabela mapeada em memória é usada sem cópia"""
+        formato = (self._codificador.quantidade, mascaras.N_MASCARAS)
+        if tabela.shape != formato:
+            raise ValueError(f'Tabela com formato {tabela.shape}; o codificador {self._codificador.nome} usa {formato}.')
+        if not isinstance(tabela, np.memmap):
+            if tabela.size and tabela.min() < 0:
+                raise ValueError('A tabela tem pesos negativos.')
+            tabela = self._ajustar_maximo(tabela)
+        elif not np.issubdtype(tabela.dtype, np.unsignedinteger):
+            raise ValueError(f'Tabela mapeada com tipo {tabela.dtype}; os pesos devem ser inteiros sem sinal.')
+        self._tabela = tabela
+        self.invalidar_cache()
+
+    def _ajustar_maximo(self, tabela):
+        """Alarga maximo até o maior peso da tabela, para que os pesos carregados não sejam cortados na próxima
+        atualização, e converte a tabela para o menor tipo sem sinal que o comporta. Numa tabela mapeada, só é chamado
+        na primeira alteração, porque exige ler o arquivo inteiro."""
+        self._maximo = max(self._maximo, int(tabela.max()) if tabela.size else 0)
+        return tabela.astype(np.min_scalar_type(self._maximo), copy=False)
+
+    def __getstate__(self):
+        estado = self.__dict__.copy()
+        estado['_acumulados_linhas'] = {}
+        if isinstance(self._tabela, np.memmap) and not self._tabela.flags.writeable:
+            # a tabela mapeada só para leitura é igual ao arquivo: cada processo volta a mapeá-lo, sem copiar os pesos
+            estado['_tabela'] = self._tabela.filename
+        return estado
+
+    def __setstate__(self, estado):
+        if isinstance(estado['_tabela'], str):
+            estado['_tabela'] = np.load(estado['_tabela'], mmap_mode='r')
+        self.__dict__.update(estado)
@@ -0,0 +1,96 @@
+from abc import ABC, abstractmethod
+from typing import NamedTuple
+
+from poker.conjunto_cartas import ConjuntoCartas
+from poker.jogador import Jogador
+from poker.mao import Mao
+
+
+class InicioFase(NamedTuple):
+    fase: str  # uma das Jogo.FASES
+    rodada: int = 0  # só nas rodadas de apostas
+
+
+class CartasDistribuidas(NamedTuple):
+    jogador: Jogador
+    cartas: ConjuntoCartas
+
+
+class Aposta(NamedTuple):
+    jogador: Jogador
+    rodada: int
+
+
+class Troca(NamedTuple):
+    jogador: Jogador
+    descartadas: ConjuntoCartas
+    compradas: ConjuntoCartas
+
+
+class CartasMostradas(NamedTuple):
+    jogador: Jogador
+    mao: Mao
+
+
+class Resultado(NamedTuple):
+    ganhadores: list  # mais de um ganhador é empate
+
+
+class ObservadorJogo(ABC):
+    """Recebe os eventos de um Jogo, na ordem em que acontecem"""
+
+    @abstractmethod
+    def notificar(self, evento):
+        """Chamado com cada evento (InicioFase, CartasDistribuidas, Aposta, Troca, CartasMostradas ou Resultado)"""
+
+
+class ObservadorConsole(ObservadorJogo):
+    """Imprime o andamento do jogo, como main.py sempre mostrou"""
+
+    TITULOS = {
+        'distribuicao': '== Distribuindo cartas ==',
+        'apostas': '== {}a rodada de apostas ==',
+        'troca': '== Troca de cartas ==',
+        'showdown': '== Mostrando as cartas =='
+    }
+
+    def __init__(self):
+        self._formatadores = {
+            InicioFase: self._formatar_inicio_fase,
+            Aposta: self._formatar_aposta,
+            Troca: self._formatar_troca,
+            CartasMostradas: self._formatar_cartas_mostradas,
+            Resultado: self._formatar_resultado
+        }
+
+    def notificar(self, evento):
+        for linha in self.formatar(evento):
+            print(linha)
+
+    def formatar(self, evento):
+        """Linhas de texto do evento; eventos que não aparecem na saída, como a distribuição, não geram linhas"""
+        formatador = self._formatadores.get(type(evento))
+        return formatador(evento) if formatador else []
+
+    @staticmethod
+    def _formatar_inicio_fase(evento):
+        return [ObservadorConsole.TITULOS[evento.fase].format(evento.rodada)]
+
+    @staticmethod
+    def _formatar_aposta(evento):
+        return [f'* {evento.jogador.nome} apostou.']
+
+    @staticmethod
+    def _formatar_troca(evento):
+        return [f'* {evento.jogador.nome} trocou {len(evento.descartadas)} cartas.']
+
+    @staticmethod
+    def _formatar_cartas_mostradas(evento):
+        return [f'* {evento.jogador.nome} tem {evento.mao}.']
+
+    @staticmethod
+    def _formatar_resultado(evento):
+        ganhadores = evento.ganhadores
+        if len(ganhadores) == 1:
+            return ['== Ganhador ==', f'* {ganhadores[0].nome} ganhou com {ganhadores[0].mao.tipo}.']
+        return ['== Empate ==', f'* Houve empate entre {", ".join([ganhador.nome for ganhador in ganhadores])} com {ganhadores[0].mao.tipo}.']
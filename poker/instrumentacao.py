@@ -0,0 +1,139 @@
+import cProfile
+import json
+import time
+import tracemalloc
+from contextlib import nullcontext
+
+
+class _Fase:
+    """Cronômetro reaproveitado de uma fase: o mesmo objeto é usado em todos os with da fase, sem alocações"""
+    __slots__ = ('segundos', 'chamadas', '_relogio', '_inicio')
+
+    def __init__(self, relogio):
+        self.segundos = 0.0
+        self.chamadas = 0
+        self._relogio = relogio
+        self._inicio = 0.0
+
+    def __enter__(self):
+        self._inicio = self._relogio()
+        return self
+
+    def __exit__(self, *_):
+        self.segundos += self._relogio() - self._inicio
+        self.chamadas += 1
+
+
+class Instrumentacao:
+    """Tempo acumulado e quantidade de execuções de cada fase de um episódio, além de contadores livres.
+
+    Opcionalmente, grava a cada intervalo_metricas segundos uma linha JSON em caminho_metricas, com episódios/s e o tempo
+    de cada fase, e pode capturar perfis de cProfile (e tracemalloc) durante uma janela de episódios. Para não medir
+    nada, use INSTRUMENTACAO_NULA, que tem a mesma interface e não faz nada.
+    """
+    ativa = True
+
+    def __init__(self, caminho_metricas=None, intervalo_metricas=10.0, relogio=time.perf_counter):
+        self._relogio = relogio
+        self._fases = {}
+        self._contadores = {}
+        self._episodios = 0
+        self._comeco = relogio()
+        self._metricas = {'caminho': caminho_metricas, 'intervalo': intervalo_metricas, 'ultima': (self._comeco, 0)}
+        self._captura = None
+
+    @property
+    def episodios(self):
+        return self._episodios
+
+    def fase(self, nome):
+        """Para usar com with: soma à fase o tempo gasto dentro do bloco"""
+        fase = self._fases.get(nome)
+        if fase is None:
+            fase = self._fases[nome] = _Fase(self._relogio)
+        return fase
+
+    def contar(self, nome, quantidade=1):
+        self._contadores[nome] = self._contadores.get(nome, 0) + quantidade
+
+    def capturar(self, episodios, prefixo, memoria=False):
+        """Liga o cProfile (e, se memoria, o tracemalloc) pelos próximos episodios; os resultados vão para prefixo.*"""
+        perfil = cProfile.Profile()
+        if memoria:
+            tracemalloc.start()
+        self._captura = {'restantes': episodios, 'prefixo': prefixo, 'perfil': perfil, 'memoria': memoria}
+        perfil.enable()
+
+    def concluir_episodio(self, quantidade=1):
+        self._episodios += quantidade
+        if self._captura is not None:
+            self._captura['restantes'] -= quantidade
+            if self._captura['restantes'] <= 0:
+                self._encerrar_captura()
+        if self._metricas['caminho'] and self._relogio() - self._metricas['ultima'][0] >= self._metricas['intervalo']:
+            self._gravar_metricas()
+
+    def resumo(self):
+        agora = self._relogio()
+        return {
+            'episodios': self._episodios,
+            'segundos': agora - self._comeco,
+            'episodios_por_segundo': self._episodios / (agora - self._comeco) if agora > self._comeco else 0.0,
+            'fases': {nome: {'segundos': fase.segundos, 'chamadas': fase.chamadas} for nome, fase in self._fases.items()},
+            'contadores': dict(self._contadores)
+        }
+
+    def fechar(self):
+        """Encerra uma captura ainda aberta e grava a última linha de métricas"""
+        if self._captura is not None:
+            self._encerrar_captura()
+        if self._metricas['caminho']:
+            self._gravar_metricas()
+
+    def _gravar_metricas(self):
+        agora = self._relogio()
+        inicio, episodios = self._metricas['ultima']
+        linha = self.resumo()
+        linha['episodios_por_segundo_recente'] = (self._episodios - episodios) / (agora - inicio) if agora > inicio else 0.0
+        with open(self._metricas['caminho'], 'a', encoding='utf-8') as arquivo:
+            arquivo.write(json.dumps(linha) + '\n')
+        self._metricas['ultima'] = (agora, self._episodios)
+
+    def _encerrar_captura(self):
+        captura, self._captura = self._captura, None
+        captura['perfil'].disable()
+        captura['perfil'].dump_stats(f'{captura["prefixo"]}.prof')
+        if captura['memoria']:
+            estatisticas = tracemalloc.take_snapshot().statistics('lineno')
+            tracemalloc.stop()
+            with open(f'{captura["prefixo"]}.memoria.txt', 'w', encoding='utf-8') as arquivo:
+                for estatistica in estatisticas[:50]:
+                    arquivo.write(f'{estatistica}\n')
+
+
+class InstrumentacaoNula:  # pylint: disable=unused-argument
+    """Mesma interface de Instrumentacao, sem medir nada"""
+    ativa = False
+    episodios = 0
+    _FASE = nullcontext()
+
+    def fase(self, nome):
+        return InstrumentacaoNula._FASE
+
+    def contar(self, nome, quantidade=1):
+        pass
+
+    def capturar(self, episodios, prefixo, memoria=False):
+        pass
+
+    def concluir_episodio(self, quantidade=1):
+        pass
+
+    def resumo(self):
+        return {}
+
+    def fechar(self):
+        pass
+
+
+INSTRUMENTACAO_NULA = InstrumentacaoNula()
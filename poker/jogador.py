@@ -7,7 +7,7 @@ class Jogador:
         self._nome = nome
         self._estrategia_troca = estrategia_troca
         self._mao = None
-        self._indices = None
+        self._trocas = None
 
     @property
     def nome(self):
@@ -21,20 +21,26 @@ class Jogador:
     def mao(self):
         return self._mao
 
+    @property
+    def trocas(self):
+        """Máscara inteira da última troca decidida"""
+        return self._trocas
+
     @property
     def indices(self):
-        return self._indices
+        """A mesma máscara, no formato antigo de texto"""
+        return None if self._trocas is None else Mao.trocas_to_indices(self._trocas)
 
     def receber(self, cartas):
         if not self._mao:
             self._mao = Mao(cartas)
         else:
-            self._mao.trocar(self._indices, cartas)
+            self._mao.trocar(self._trocas, cartas)
 
     def apostar(self, rodada):
         pass
 
     def decidir_trocas(self):
-        self._indices = self._estrategia_troca.obter_indices_de_troca(self._mao)
-        cartas_descartadas = self._mao.cartas_from_indices(self._indices)
+        self._trocas = self._estrategia_troca.obter_trocas(self._mao)
+        cartas_descartadas = self._mao.conjunto_from_indices(self._trocas)
         return cartas_descartadas
@@ -1,62 +1,89 @@
 from poker.baralho import Baralho
+from poker.eventos_jogo import Aposta, CartasDistribuidas, CartasMostradas, InicioFase, Resultado, Troca
+from poker.instrumentacao import INSTRUMENTACAO_NULA
 from poker.mao import Mao
 
 
 class Jogo:
+    """Conduz uma partida e avisa os observadores a cada passo; sem observadores, nenhum evento é sequer criado"""
 
-    def __init__(self, jogadores):
+    FASES = ['distribuicao', 'apostas', 'troca', 'showdown']
+
+    def __init__(self, jogadores, observadores=None, instrumentacao=INSTRUMENTACAO_NULA, aleatorio=None):
         self._jogadores = jogadores
-        self._baralho = Baralho()
+        self._observadores = list(observadores) if observadores else []
+        self._instrumentacao = instrumentacao
+        self._baralho = Baralho(aleatorio)
         self._baralho.embaralhar()
 
     @property
     def jogadores(self):
         return self._jogadores
 
+    def adicionar_observador(self, observador):
+        self._observadores.append(observador)
+
+    def _notificar(self, evento):
+        for observador in self._observadores:
+            observador.notificar(evento)
+
     def jogar(self):
-        self._distribuir_cartas()
-        self._rodada_de_apostas(1)
-        self._trocar_cartas()
-        self._rodada_de_apostas(2)
-        self._mostrar_cartas()
-        self._mostrar_ganhadores()
+        instrumentacao = self._instrumentacao
+        with instrumentacao.fase('distribuicao'):
+            self._distribuir_cartas()
+        with instrumentacao.fase('apostas'):
+            self._rodada_de_apostas(1)
+        with instrumentacao.fase('troca'):
+            self._trocar_cartas()
+        with instrumentacao.fase('apostas'):
+            self._rodada_de_apostas(2)
+        with instrumentacao.fase('showdown'):
+            self._mostrar_cartas()
+            ganhadores = self._mostrar_ganhadores()
+        instrumentacao.concluir_episodio()
+        return ganhadores
 
     def _distribuir_cartas(self):
-        print('== Distribuindo cartas ==')
+        if self._observadores:
+            self._notificar(InicioFase('distribuicao'))
         for jogador in self.jogadores:
-            cartas = self._baralho.distribuir(Mao.TAMANHO)
+            cartas = self._baralho.distribuir_conjunto(Mao.TAMANHO)
             jogador.receber(cartas)
+            if self._observadores:
+                self._notificar(CartasDistribuidas(jogador, cartas))
 
     def _rodada_de_apostas(self, rodada):
-        print(f'== {rodada}a rodada de apostas ==')
+        if self._observadores:
+            self._notificar(InicioFase('apostas', rodada))
         for jogador in self.jogadores:
             jogador.apostar(rodada)
-            print(f'* {jogador.nome} apostou.')
+            if self._observadores:
+                self._notificar(Aposta(jogador, rodada))
 
     def _trocar_cartas(self):
-        print('== Troca de cartas ==')
+        if self._observadores:
+            self._notificar(InicioFase('troca'))
         for jogador in self.jogadores:
             cartas_descartadas = jogador.decidir_trocas()
             n = len(cartas_descartadas)
-            novas_cartas = self._baralho.distribuir(n)
+            novas_cartas = self._baralho.distribuir_conjunto(n)
             jogador.receber(novas_cartas)
-            print(f'* {jogador.nome} trocou {n} cartas.')
+            if self._observadores:
+                self._notificar(Troca(jogador, cartas_descartadas, novas_cartas))
 
     def _mostrar_cartas(self):
-        print('== Mostrando as cartas ==')
-        for jogador in self.jogadores:
-            print(f'* {jogador.nome} tem {jogador.cartas}.')
+        if self._observadores:
+            self._notificar(InicioFase('showdown'))
+            for jogador in self.jogadores:
+                self._notificar(CartasMostradas(jogador, jogador.mao))
 
     def _mostrar_ganhadores(self):
         ganhadores = self._determinar_ganhadores()
-        if len(ganhadores) == 1:
-            print('== Ganhador ==')
-            print(f'* {ganhadores[0].nome} ganhou com {ganhadores[0].mao.tipo}.')
-        else:
-            print('== Empate ==')
-            print(f'* Houve empate entre {", ".join([ganhador.nome for ganhador in ganhadores])} com {ganhadores[0].mao.tipo}.')
+        if self._observadores:
+            self._notificar(Resultado(ganhadores))
+        return ganhadores
 
     def _determinar_ganhadores(self):
-        melhor_mao = max(jogador.mao.rank for jogador in self._jogadores)
-        ganhadores = [jogador for jogador in self._jogadores if jogador.mao.rank == melhor_mao]
+        melhor_mao = max(jogador.mao.forca for jogador in self._jogadores)  # com os desempates, não só o tipo
+        ganhadores = [jogador for jogador in self._jogadores if jogador.mao.forca == melhor_mao]
         return ganhadores
@@ -1,6 +1,9 @@
 from collections import Counter
 
+from poker.avaliador import Avaliador, WHEEL
 from poker.carta import Carta
+from poker import mascaras
+from poker.conjunto_cartas import ConjuntoCartas, N_VALORES
 
 
 class Mao:
@@ -8,82 +11,59 @@ class Mao:
     TIPOS = ['maior carta', 'um par', 'dois pares', 'trinca', 'straight', 'flush', 'full house', 'quadra', 'straight flush']
 
     def __init__(self, cartas):
-        n = len(set(cartas))
+        """Recebe uma lista de Carta ou um ConjuntoCartas; internamente a mão só guarda os códigos das cartas"""
+        if not isinstance(cartas, ConjuntoCartas):
+            cartas = ConjuntoCartas.from_cartas(cartas)
+        n = len(cartas)
         if n != Mao.TAMANHO:
             raise ValueError(f'Quantidade inválida de cartas: {n}.')
-        self._cartas = cartas
-        self._ordena_cartas()
-
-    def _ordena_cartas(self):
-        self._cartas = sorted(self._cartas, reverse=True)
-        valores = [c.valor for c in self._cartas]
-        is_wheel = valores == ['A', 5, 4, 3, 2]
+        self._codigos = cartas.codigos
+        self._avaliar()
+
+    def _avaliar(self):
+        """Calcula rank, força e ordem das cartas uma única vez, ao criar a mão ou após uma troca"""
+        self._rank, self._forca = Avaliador.padrao().avaliar(self._codigos)
+        self._conjunto = ConjuntoCartas.from_codigos(self._codigos)
+        self._ordena_codigos()
+
+    def _ordena_codigos(self):
+        # repetições maiores primeiro; dentro delas, do maior para o menor valor (e naipe)
+        quantidades = Counter(c % N_VALORES for c in self._codigos)
+        self._codigos = sorted(self._codigos, key=lambda c: (quantidades[c % N_VALORES], c % N_VALORES, c // N_VALORES), reverse=True)
+        valores = [c % N_VALORES for c in self._codigos]
+        is_wheel = valores == WHEEL
         if is_wheel:
             self._ajusta_ordem_wheel()
-        elif self.is_um_par():
-            self._ajusta_ordem_um_par(valores)
-        elif self.is_dois_pares():
-            self._ajusta_ordem_dois_pares(valores)
-        elif self.is_trinca():
-            self._ajusta_ordem_trinca(valores)
-        elif self.is_full_house():
-            self._ajusta_ordem_full_house(valores)
-        elif self.is_quadra():
-            self._ajusta_ordem_quadra(valores)
 
     def _ajusta_ordem_wheel(self):
-        self._cartas = self._cartas[1:] + [self._cartas[0]]
-
-    def _ajusta_ordem_um_par(self, valores):
-        if valores[1] == valores[2]:  # 3PP21
-            self._cartas = self._cartas[1:3] + [self._cartas[0]] + self._cartas[3:5]
-        elif valores[2] == valores[3]:  # 32PP1
-            self._cartas = self._cartas[2:4] + self._cartas[0:2] + [self._cartas[4]]
-        elif valores[3] == valores[4]:  # 321PP
-            self._cartas = self._cartas[3:5] + self._cartas[0:3]
-
-    def _ajusta_ordem_dois_pares(self, valores):
-        if valores[0] == valores[1] and valores[3] == valores[4]:  # PPxQQ
-            self._cartas = self._cartas[0:2] + self._cartas[3:5] + [self._cartas[2]]
-        elif valores[1] == valores[2] and valores[3] == valores[4]:  # xPPQQ
-            self._cartas = self._cartas[1:5] + [self._cartas[0]]
-
-    def _ajusta_ordem_trinca(self, valores):
-        if valores[1] == valores[2] and valores[2] == valores[3]:  # 2TTT1
-            self._cartas = self._cartas[1:4] + [self._cartas[0]] + [self._cartas[4]]
-        elif valores[2] == valores[3] and valores[3] == valores[4]:  # 21TTT
-            self._cartas = self._cartas[2:5] + self._cartas[0:2]
-
-    def _ajusta_ordem_full_house(self, valores):
-        if valores[2] == valores[3] and valores[3] == valores[4]:  # PPTTT
-            self._cartas = self._cartas[2:5] + self._cartas[0:2]
-
-    def _ajusta_ordem_quadra(self, valores):
-        if valores[1] == valores[2] and valores[2] == valores[3] and valores[3] == valores[4]:  # xQQQQ
-            self._cartas = self._cartas[1:5] + [self._cartas[0]]
+        self._codigos = self._codigos[1:] + [self._codigos[0]]
 
     @property
     def cartas(self):
-        return self._cartas
+        return [Carta.from_codigo(c) for c in self._codigos]
+
+    @property
+    def conjunto(self):
+        return self._conjunto
 
     @property
     def tipo(self):
-        for tipo in reversed(Mao.TIPOS):
-            if getattr(self, 'is_' + tipo.replace(' ', '_'))():
-                return tipo
-        return None  # https://pylint.readthedocs.io/en/latest/user_guide/messages/refactor/inconsistent-return-statements.html
+        return Mao.TIPOS[self.rank]
 
     @property
     def rank(self):
-        return Mao.TIPOS.index(self.tipo)
+        return self._rank
+
+    @property
+    def forca(self):
+        """Ordinal de 0 a 7461 que ordena as mãos considerando o tipo e as cartas de desempate"""
+        return self._forca
 
     def _is_sequencia(self):
-        ranks = [c.indice_valor for c in self._cartas]
-        straight = [(self._cartas[0].indice_valor - i) % len(Carta.VALORES) for i in range(len(self._cartas))]
-        return ranks == straight
+        return self._conjunto.tem_sequencia()
 
     def _is_mesmo_naipe(self):
-        return len(set(c.naipe for c in self._cartas)) == 1
+        return self._conjunto.tem_flush()
 
     def is_straight(self):
         return self._is_sequencia() and not self._is_mesmo_naipe()
@@ -95,7 +75,7 @@ class Mao:
         return self._is_sequencia() and self._is_mesmo_naipe()
 
     def _get_repeticoes(self):
-        valores = [c.valor for c in self._cartas]
+        valores = [c % N_VALORES for c in self._codigos]
         quantidades = Counter(valores)
         repetidas = Counter(quantidades.values())
         return tuple(repetidas[n] for n in range(1, Mao.TAMANHO))
@@ -127,49 +107,48 @@ class Mao:
             self.is_straight_flush()
         ])
 
-    def trocar(self, indices, novas_cartas):
-        if len(indices) != Mao.TAMANHO:
-            raise ValueError(f'Quantidade inválida de quais cartas a trocar: {len(indices)}.')
-        if len(novas_cartas) != Mao.quantos_uns(indices):
+    def trocar(self, trocas, novas_cartas):
+        """Troca as cartas marcadas na máscara trocas (um inteiro ou, por compatibilidade, um texto como '01011')"""
+        trocas = mascaras.normalizar(trocas)
+        if len(novas_cartas) != mascaras.contar(trocas):
             raise ValueError(f'Quantidade inválida de novas cartas: {len(novas_cartas)}.')
-        self._cartas = self._cartas_from_indices(indices, '0')
-        self._cartas += novas_cartas
-        self._ordena_cartas()
+        if not isinstance(novas_cartas, ConjuntoCartas):
+            novas_cartas = ConjuntoCartas.from_cartas(novas_cartas)
+        self._codigos = mascaras.manter(self._codigos, trocas) + novas_cartas.codigos
+        self._avaliar()
 
-    def cartas_from_indices(self, indices):
-        return self._cartas_from_indices(indices, '1')
+    def cartas_from_indices(self, trocas):
+        return [Carta.from_codigo(c) for c in mascaras.selecionar(self._codigos, mascaras.normalizar(trocas))]
 
-    def _cartas_from_indices(self, indices, flag):
-        return [carta for carta, troca in zip(self._cartas, indices) if troca == flag]
+    def conjunto_from_indices(self, trocas):
+        return ConjuntoCartas.from_codigos(mascaras.selecionar(self._codigos, mascaras.normalizar(trocas)))
 
     @staticmethod
     def quantos_uns(quais):
-        return sum(int(b) for b in quais)
+        return quais.count('1') if isinstance(quais, str) else mascaras.contar(quais)
 
     @staticmethod
     def trocas_to_indices(trocas):
-        return bin(trocas)[2:].zfill(Mao.TAMANHO)
+        return mascaras.para_texto(trocas)
 
     @staticmethod
     def indices_to_trocas(indices):
-        return int(indices, 2)
+        return mascaras.de_texto(indices)
 
     def __str__(self):
-        return ''.join([str(c) for c in self._cartas])
+        return ''.join([str(c) for c in self.cartas])
+
+    def __len__(self):
+        return len(self._codigos)
 
     def __eq__(self, other):
         self._checa_sanidade_eq(other)
-        return self.rank == other.rank
+        return self._rank == other.rank
 
     def _checa_sanidade_eq(self, other):
-        if len(set(self.cartas + other.cartas)) != Mao.TAMANHO * 2:
+        if self._conjunto & other.conjunto:
             raise ValueError('Mãos com cartas repetidas.')
 
     def __lt__(self, other):
-        return self.rank < other.rank if self != other else self._compara_maior_carta(other)
-
-    def _compara_maior_carta(self, other):
-        for i in range(len(self._cartas)):
-            if self.cartas[i].indice_valor != other.cartas[i].indice_valor:
-                return self.cartas[i].indice_valor < other.cartas[i].indice_valor
-        return False
+        self._checa_sanidade_eq(other)
+        return self._forca < other.forca
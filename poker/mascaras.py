@@ -0,0 +1,58 @@
+from poker.avaliador import N_CARTAS_MAO
+
+# Uma máscara de troca é um inteiro de N_CARTAS_MAO bits em que o bit mais alto corresponde à 1a carta da mão, na ordem
+# de Mao.cartas: 0b10000 troca só a 1a carta. A forma antiga, em texto ('10000'), só é aceita por compatibilidade.
+N_MASCARAS = 1 << N_CARTAS_MAO
+POSICOES_TROCADAS = tuple(tuple(i for i in range(N_CARTAS_MAO) if mascara >> (N_CARTAS_MAO - 1 - i) & 1) for mascara in range(N_MASCARAS))
+POSICOES_MANTIDAS = tuple(tuple(i for i in range(N_CARTAS_MAO) if not mascara >> (N_CARTAS_MAO - 1 - i) & 1) for mascara in range(N_MASCARAS))
+
+
+def normalizar(mascara):
+    """Máscara inteira a partir de um inteiro (inclusive numpy) ou do texto antigo, validando o tamanho"""
+    if isinstance(mascara, str):
+        return de_texto(mascara)
+    mascara = int(mascara)
+    if not 0 <= mascara < N_MASCARAS:
+        raise ValueError(f'Máscara de troca inválida: {mascara}.')
+    return mascara
+
+
+def contar(mascara):
+    """Quantas cartas a máscara troca"""
+    return int(mascara).bit_count()
+
+
+def selecionar(sequencia, mascara):
+    """Elementos da sequência (de N_CARTAS_MAO itens) nas posições trocadas pela máscara"""
+    return [sequencia[i] for i in POSICOES_TROCADAS[mascara]]
+
+
+def manter(sequencia, mascara):
+    """Elementos da sequência nas posições que a máscara não troca"""
+    return [sequencia[i] for i in POSICOES_MANTIDAS[mascara]]
+
+
+def permutar(mascara, posicoes):
+    """Máscara com o bit de cada posição i movido para posicoes[i]"""
+    resultado = 0
+    for origem, destino in enumerate(posicoes):
+        resultado |= (mascara >> (N_CARTAS_MAO - 1 - origem) & 1) << (N_CARTAS_MAO - 1 - destino)
+    return resultado
+
+
+def inverter_posicoes(posicoes):
+    """Posições que desfazem permutar(mascara, posicoes)"""
+    inversas = [0] * len(posicoes)
+    for origem, destino in enumerate(posicoes):
+        inversas[destino] = origem
+    return tuple(inversas)
+
+
+def de_texto(texto):
+    if len(texto) != N_CARTAS_MAO:
+        raise ValueError(f'Quantidade inválida de quais cartas a trocar: {len(texto)}.')
+    return int(texto, 2)
+
+
+def para_texto(mascara):
+    return format(mascara, f'0{N_CARTAS_MAO}b')
@@ -0,0 +1,187 @@
+import json
+import os
+
+import numpy as np
+
+from poker import mascaras
+from poker.avaliador import Avaliador
+from poker.avaliador_lote import AvaliadorLote
+from poker.estrategias_troca.codificadores_estado import CodificadorRank
+from poker.mao import Mao
+
+VERSAO_REGISTRO = 1
+REGISTRO = np.dtype([
+    ('cartas', np.uint8, (Mao.TAMANHO,)),  # mão inicial, na ordem de Mao.cartas
+    ('estado', np.uint32),  # linha da tabela de pesos, pelo codificador do arquivo
+    ('trocas', np.uint8),  # máscara de troca
+    ('cartas_finais', np.uint8, (Mao.TAMANHO,)),
+    ('rank_antes', np.uint8),
+    ('rank_depois', np.uint8),
+    ('forca_antes', np.uint16),
+    ('forca_depois', np.uint16),
+])  # 21 bytes por episódio, sem alinhamento
+
+
+class RegistroEpisodios:
+    """Grava episódios de troca em um arquivo binário só de acréscimos, com registros de tamanho fixo (REGISTRO).
+
+    O arquivo começa com um cabeçalho de TAMANHO_CABECALHO bytes (versão, formato dos registros e codificador do estado)
+    e segue com os registros, sem separadores, de modo que ler_episodios o mapeia em memória como um array. Os registros
+    ficam em um buffer e vão para o disco em blocos de TAMANHO_BUFFER; um arquivo existente recebe os novos registros
+    no fim, e um registro pela metade, de uma gravação interrompida, é descartado ao reabri-lo.
+    """
+    MAGICO = b'EPISODIOS-POKER\n'
+    TAMANHO_CABECALHO = 512
+    TAMANHO_BUFFER = 1 << 16
+
+    def __init__(self, caminho, codificador=None, quantidade=None):
+        """Com quantidade, um arquivo existente é cortado nesse número de episódios, como ao retomar de um checkpoint"""
+        self._codificador = codificador if codificador is not None else CodificadorRank()
+        self._buffer = np.zeros(RegistroEpisodios.TAMANHO_BUFFER, dtype=REGISTRO)
+        self._pendentes = 0
+        self._ranks = Avaliador.padrao().ranks
+        if os.path.exists(caminho) and os.path.getsize(caminho):
+            metadados = _ler_cabecalho(caminho)
+            if metadados['codificador'] != self._codificador.nome:
+                raise ValueError(f'Registro {caminho} do codificador {metadados["codificador"]}, e não {self._codificador.nome}.')
+            gravados = (os.path.getsize(caminho) - RegistroEpisodios.TAMANHO_CABECALHO) // REGISTRO.itemsize
+            if quantidade is not None:
+                gravados = min(gravados, quantidade)
+            os.truncate(caminho, RegistroEpisodios.TAMANHO_CABECALHO + gravados * REGISTRO.itemsize)
+            self._gravados = gravados
+            self._arquivo = open(caminho, 'ab')  # pylint: disable=consider-using-with
+        else:
+            self._gravados = 0
+            self._arquivo = open(caminho, 'wb')  # pylint: disable=consider-using-with
+            self._arquivo.write(_cabecalho(self._codificador.nome))
+
+    @property
+    def codificador(self):
+        return self._codificador
+
+    @property
+    def quantidade(self):
+        """Episódios no arquivo, contando os que ainda estão no buffer"""
+        return self._gravados + self._pendentes
+
+    def capturar(self, mao, estado=None):
+        """Cartas, força e estado (se não informado, pelo codificador do registro) da Mao antes da troca, para gravar_troca"""
+        return [c.codigo for c in mao.cartas], mao.forca, self._codificador.codificar(mao) if estado is None else estado
+
+    def gravar_troca(self, inicial, trocas, mao):
+        """O episódio da mão capturada em inicial, que trocou as cartas da máscara trocas e terminou como a Mao mao"""
+        cartas, forca, estado = inicial
+        self._buffer[self._pendentes] = (cartas, estado, trocas, [c.codigo for c in mao.cartas], self._ranks[forca], self._ranks[mao.forca], forca, mao.forca)
+        self._pendentes += 1
+        if self._pendentes == len(self._buffer):
+            self.descarregar()
+
+    def gravar_lote(self, episodios, estados=None):
+        """Os episódios de um EpisodiosLote; sem estados, eles são calculados pelo codificador do registro"""
+        if estados is None:
+            estados = self._codificador.codificar_lote(episodios.cartas, episodios.ranks_antes)
+        avaliador = AvaliadorLote.padrao()
+        registros = np.empty(len(episodios.cartas), dtype=REGISTRO)
+        registros['cartas'] = episodios.cartas
+        registros['estado'] = estados
+        registros['trocas'] = episodios.trocas
+        registros['cartas_finais'] = episodios.cartas_finais
+        registros['rank_antes'] = episodios.ranks_antes
+        registros['rank_depois'] = episodios.ranks_depois
+        registros['forca_antes'] = avaliador.forcas(episodios.cartas)
+        registros['forca_depois'] = avaliador.forcas(episodios.cartas_finais)
+        if self._pendentes + len(registros) > len(self._buffer):
+            self.descarregar()
+        if len(registros) >= len(self._buffer):
+            self._arquivo.write(registros.tobytes())
+            self._gravados += len(registros)
+        else:
+            self._buffer[self._pendentes:self._pendentes + len(registros)] = registros
+            self._pendentes += len(registros)
+
+    def descarregar(self):
+        """Grava no arquivo os registros que estão no buffer"""
+        if self._pendentes:
+            self._arquivo.write(self._buffer[:self._pendentes].tobytes())
+            self._gravados += self._pendentes
+            self._pendentes = 0
+        self._arquivo.flush()
+
+    def fechar(self):
+        self.descarregar()
+        self._arquivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.fechar()
+
+
+def _cabecalho(codificador):
+    metadados = json.dumps({'versao': VERSAO_REGISTRO, 'registro': str(REGISTRO.descr), 'codificador': codificador}).encode()
+    espaco = RegistroEpisodios.TAMANHO_CABECALHO - len(RegistroEpisodios.MAGICO) - 1
+    return RegistroEpisodios.MAGICO + metadados.ljust(espaco) + b'\n'
+
+
+def _ler_cabecalho(caminho):
+    with open(caminho, 'rb') as arquivo:
+        cabecalho = arquivo.read(RegistroEpisodios.TAMANHO_CABECALHO)
+    if len(cabecalho) < RegistroEpisodios.TAMANHO_CABECALHO or not cabecalho.startswith(RegistroEpisodios.MAGICO):
+        raise ValueError(f'{caminho} não é um registro de episódios.')
+    metadados = json.loads(cabecalho[len(RegistroEpisodios.MAGICO):])
+    if metadados['versao'] > VERSAO_REGISTRO or metadados['registro'] != str(REGISTRO.descr):
+        raise ValueError(f'Registro de episódios em formato não suportado: versão {metadados["versao"]}.')
+    return metadados
+
+
+def ler_episodios(caminho):
+    """Mapeia em memória, só para leitura, os registros de um arquivo de RegistroEpisodios; retorna (registros, metadados)"""
+    metadados = _ler_cabecalho(caminho)
+    quantidade = (os.path.getsize(caminho) - RegistroEpisodios.TAMANHO_CABECALHO) // REGISTRO.itemsize
+    if quantidade == 0:
+        return np.zeros(0, dtype=REGISTRO), metadados
+    return np.memmap(caminho, dtype=REGISTRO, mode='r', offset=RegistroEpisodios.TAMANHO_CABECALHO, shape=(quantidade,)), metadados
+
+
+def recompensas_por_rank(melhorou, piorou, empate):
+    """Função de recompensa que só olha se o rank subiu, caiu ou ficou igual, como a do treinamento"""
+    def recompensas(registros):
+        antes, depois = registros['rank_antes'], registros['rank_depois']
+        return np.select([depois > antes, depois < antes], [melhorou, piorou], default=empate)
+    return recompensas
+
+
+def reproduzir(caminho, estrategia, recompensas, lote=None, tamanho_bloco=1 << 22):
+    """Aplica à tabela de uma EstrategiaTrocaRL os episódios do arquivo, com a função recompensas(registros) -> (N,).
+
+    O treinamento limita os pesos aos valores mínimo e máximo a cada atualização. Com lote, os registros são aplicados
+    em atualizações de lote registros, como no treinamento, e a reprodução com as mesmas recompensas e limites refaz a
+    tabela treinada. Sem lote, é uma única atualização, bem mais rápida: as recompensas de cada célula são somadas (em
+    blocos, para não carregar o arquivo inteiro na memória) e só o total é limitado, o que só dá a mesma tabela enquanto
+    nenhum peso encosta nos limites. Os estados gravados só são usados se vierem do mesmo codificador da estratégia;
+    senão, são recalculados a partir das cartas. Retorna quantos episódios foram aplicados.
+    """
+    registros, metadados = ler_episodios(caminho)
+    codificador = estrategia.codificador
+    if lote is not None:
+        if lote < 1:
+            raise ValueError(f'Lote inválido: {lote}.')
+        for inicio in range(0, len(registros), lote):
+            bloco = np.asarray(registros[inicio:inicio + lote])
+            estrategia.registrar_resultados(_estados(bloco, metadados, codificador), bloco['trocas'], recompensas(bloco))
+        return len(registros)
+    deltas = np.zeros(codificador.quantidade * mascaras.N_MASCARAS)
+    for inicio in range(0, len(registros), tamanho_bloco):
+        bloco = np.asarray(registros[inicio:inicio + tamanho_bloco])
+        celulas = _estados(bloco, metadados, codificador) * mascaras.N_MASCARAS + bloco['trocas']
+        deltas += np.bincount(celulas, weights=recompensas(bloco), minlength=len(deltas))
+    celulas = np.flatnonzero(deltas)
+    estrategia.registrar_resultados(celulas // mascaras.N_MASCARAS, celulas % mascaras.N_MASCARAS, deltas[celulas].astype(np.int64))
+    return len(registros)
+
+
+def _estados(bloco, metadados, codificador):
+    if metadados['codificador'] == codificador.nome:
+        return bloco['estado'].astype(np.int64)
+    return np.asarray(codificador.codificar_lote(bloco['cartas'], bloco['rank_antes']), dtype=np.int64)
@@ -0,0 +1,103 @@
+from typing import NamedTuple
+
+import numpy as np
+
+from poker.aleatorio import FonteAleatoria
+from poker.avaliador_lote import AvaliadorLote
+from poker.conjunto_cartas import N_CARTAS
+from poker.mao import Mao
+
+
+class EpisodiosLote(NamedTuple):
+    cartas: np.ndarray  # (N, 5) mãos iniciais, na ordem de Mao.cartas
+    ranks_antes: np.ndarray
+    trocas: np.ndarray
+    cartas_finais: np.ndarray  # (N, 5) mãos após a troca
+    ranks_depois: np.ndarray
+
+
+class SimulacaoLote:
+    """Simula, em lotes vetorizados, episódios de distribuição, troca e compra de cartas.
+
+    Cada episódio usa um baralho próprio, embaralhado apenas nas posições que serão usadas: as 5 cartas da mão e as até
+    5 cartas compradas na troca.
+    """
+    CARTAS_POR_EPISODIO = 2 * Mao.TAMANHO
+    TAMANHO_BLOCO = 1 << 16
+
+    def __init__(self, gerador=None):
+        """gerador é um np.random.Generator, ou uma semente, SeedSequence ou FonteAleatoria de onde tirá-lo"""
+        self._gerador = FonteAleatoria.criar(gerador).gerador
+        self._avaliador = AvaliadorLote.padrao()
+
+    @property
+    def gerador(self):
+        return self._gerador
+
+    def distribuir(self, n, n_cartas=CARTAS_POR_EPISODIO, baralho=None):
+        """Retorna um array (n, n_cartas) com as primeiras cartas de n baralhos embaralhados.
+
+        baralho são os códigos das cartas de cada baralho: por padrão, todas as 52.
+        """
+        baralho = np.arange(N_CARTAS) if baralho is None else baralho
+        return self._embaralhar(np.tile(np.asarray(baralho, dtype=np.int8), (n, 1)), n_cartas)
+
+    def distribuir_restantes(self, cartas, n_cartas=Mao.TAMANHO):
+        """Para cada linha de cartas (N, k), retorna n_cartas sorteadas entre as que sobraram no baralho"""
+        n = len(cartas)
+        restantes = np.ones((n, N_CARTAS), dtype=bool)
+        restantes[np.arange(n)[:, None], cartas] = False
+        baralhos = np.nonzero(restantes)[1].astype(np.int8).reshape(n, N_CARTAS - cartas.shape[1])
+        return self._embaralhar(baralhos, n_cartas)
+
+    def _embaralhar(self, baralhos, n_cartas):
+        n, tamanho = baralhos.shape
+        linhas = np.arange(n)
+        for i in range(n_cartas):  # Fisher-Yates parcial: só as posições usadas são sorteadas
+            j = i + self._gerador.integers(0, tamanho - i, size=n)
+            baralhos[linhas, i], baralhos[linhas, j] = baralhos[linhas, j], baralhos[linhas, i]
+        return baralhos[:, :n_cartas]
+
+    @staticmethod
+    def trocar(cartas, trocas, compras):
+        """Troca as cartas marcadas em cada máscara (o bit mais alto é a 1a carta), repondo-as na ordem das compras"""
+        descartes = (trocas[:, None] >> np.arange(Mao.TAMANHO - 1, -1, -1)) & 1 == 1
+        posicoes = np.maximum(np.cumsum(descartes, axis=1) - 1, 0)
+        return np.where(descartes, np.take_along_axis(compras, posicoes, axis=1), cartas)
+
+    def jogar(self, estrategia, n):
+        return self.jogar_distribuidas(estrategia, self.distribuir(n))
+
+    def jogar_distribuidas(self, estrategia, distribuidas):
+        """Igual a jogar, com as cartas já distribuídas (N, 10): a mão e as compras de cada episódio, como as de distribuir"""
+        distribuidas = np.asarray(distribuidas, dtype=np.int8)
+        return self._jogar(estrategia, distribuidas[:, :Mao.TAMANHO], distribuidas[:, Mao.TAMANHO:])
+
+    def jogar_maos(self, estrategia, cartas):
+        """Igual a jogar, mas partindo das mãos (N, 5) informadas; as compras saem do restante de cada baralho"""
+        cartas = np.asarray(cartas, dtype=np.int8)
+        return self._jogar(estrategia, cartas, self.distribuir_restantes(cartas))
+
+    def _jogar(self, estrategia, cartas, compras):
+        cartas = AvaliadorLote.ordenar(cartas)
+        ranks_antes, _ = self._avaliador.avaliar(cartas)
+        trocas = estrategia.obter_trocas_lote(cartas, ranks_antes, self._gerador)
+        cartas_finais = SimulacaoLote.trocar(cartas, trocas, compras)
+        ranks_depois, _ = self._avaliador.avaliar(cartas_finais)
+        return EpisodiosLote(cartas, ranks_antes, trocas, cartas_finais, ranks_depois)
+
+    def contar_resultados(self, estrategia, n, registro=None):
+        """Quantos dos n episódios terminaram em empate, melhora ou piora do rank, como em compara_estrategias_troca.
+
+        Com um RegistroEpisodios, os episódios também são gravados nele.
+        """
+        contagens = {'empate': 0, 'melhorou': 0, 'piorou': 0}
+        for inicio in range(0, n, SimulacaoLote.TAMANHO_BLOCO):
+            episodios = self.jogar(estrategia, min(SimulacaoLote.TAMANHO_BLOCO, n - inicio))
+            if registro is not None:
+                registro.gravar_lote(episodios)
+            diferencas = np.sign(episodios.ranks_depois - episodios.ranks_antes)
+            contagens['empate'] += int(np.count_nonzero(diferencas == 0))
+            contagens['melhorou'] += int(np.count_nonzero(diferencas > 0))
+            contagens['piorou'] += int(np.count_nonzero(diferencas < 0))
+        return contagens
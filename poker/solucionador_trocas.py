@@ -0,0 +1,98 @@
+from functools import lru_cache
+from math import comb
+from typing import NamedTuple
+
+import numpy as np
+
+from poker import mascaras
+from poker.avaliador import Avaliador, N_MAOS
+from poker.avaliador_lote import AvaliadorLote
+from poker.cache_classes import CacheClasses
+from poker.canonizador import Canonizador, IDENTIDADE
+from poker.conjunto_cartas import N_CARTAS
+from poker.mao import Mao
+
+
+class ResultadoTrocas(NamedTuple):
+    distribuicoes: np.ndarray  # (32, 9): probabilidade de cada tipo de mão após a troca, para cada máscara
+    melhorou: np.ndarray  # (32,)
+    piorou: np.ndarray
+    empate: np.ndarray
+
+
+class SolucionadorTrocas:
+    """Calcula exatamente, para cada uma das 32 máscaras de troca de uma mão, a distribuição dos tipos após a compra.
+
+    Cada mão final possível corresponde a exatamente uma máscara: as cartas mantidas são as que ela tem em comum com a
+    mão inicial e as compradas são as demais. Por isso, uma única passada pelas 2.598.960 mãos, classificando cada uma
+    pela máscara e pelo rank, dá as distribuições das 32 máscaras de uma vez (são C(47, k) compras para k descartes).
+
+    Mãos que só diferem pelos nomes dos naipes têm as mesmas distribuições, a menos da ordem das máscaras: a passada é
+    feita uma vez por classe do Canonizador, para a mão representante, e as máscaras são levadas de volta para a mão.
+    Com um CacheClasses, as contagens de cada classe ficam em disco para as próximas execuções e outros processos.
+    """
+    N_TROCAS = 2 ** Mao.TAMANHO
+    _padrao = None
+
+    def __init__(self, tamanho_cache=100_000, cache=None):
+        avaliador = Avaliador.padrao()
+        self._mascaras = AvaliadorLote.mascaras(Avaliador.todas_as_maos())
+        self._ranks = np.array(avaliador.ranks, dtype=np.int32)[avaliador.forcas]
+        restantes = N_CARTAS - Mao.TAMANHO
+        self._compras = np.array([comb(restantes, trocas.bit_count()) for trocas in range(SolucionadorTrocas.N_TROCAS)])
+        self._canonizador = Canonizador.padrao()
+        self._cache = cache
+        self._distribuicoes = lru_cache(maxsize=tamanho_cache)(self._calcular_distribuicoes)
+
+    @staticmethod
+    def padrao():
+        if SolucionadorTrocas._padrao is None:
+            SolucionadorTrocas._padrao = SolucionadorTrocas()
+        return SolucionadorTrocas._padrao
+
+    @staticmethod
+    def criar_cache(caminho):
+        """CacheClasses com as contagens (32 máscaras x 9 tipos) de cada classe, para usar no construtor"""
+        return CacheClasses(caminho, (SolucionadorTrocas.N_TROCAS, len(Mao.TIPOS)), np.uint32)
+
+    def resolver(self, mao):
+        codigos = [c.codigo for c in mao.cartas]
+        return self.resolver_codigos(codigos, mao.rank)
+
+    def resolver_codigos(self, codigos, rank):
+        """codigos são as 5 cartas na ordem de Mao.cartas (a 1a carta corresponde ao bit mais alto da máscara)"""
+        forma = self._canonizador.canonizar(codigos)
+        distribuicoes = self._distribuicoes(forma.classe)
+        if forma.posicoes != IDENTIDADE:
+            distribuicoes = distribuicoes[SolucionadorTrocas._trocas_na_representante(forma.posicoes)]
+        return ResultadoTrocas(
+            distribuicoes,
+            distribuicoes[:, rank + 1:].sum(axis=1),
+            distribuicoes[:, :rank].sum(axis=1),
+            distribuicoes[:, rank]
+        )
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _trocas_na_representante(posicoes):
+        """Para cada máscara da mão, a máscara equivalente na representante da classe"""
+        return np.array([mascaras.permutar(trocas, posicoes) for trocas in range(SolucionadorTrocas.N_TROCAS)])
+
+    def _calcular_distribuicoes(self, classe):
+        if self._cache is None:
+            contagens = self._contar(self._canonizador.representante(classe))
+        else:
+            contagens = self._cache.obter_ou_calcular([classe], lambda classes: [self._contar(self._canonizador.representante(c)) for c in classes])[0]
+        distribuicoes = contagens / self._compras[:, None]
+        distribuicoes.flags.writeable = False  # o mesmo array é devolvido a todos que consultam o cache
+        return distribuicoes
+
+    def _contar(self, codigos):
+        """Contagens (32, 9) das mãos finais de cada máscara, por tipo, para as cartas na ordem de Mao.cartas"""
+        trocas = np.zeros(N_MAOS, dtype=np.int32)
+        for posicao, codigo in enumerate(codigos):
+            descartada = (self._mascaras >> np.uint64(codigo)) & np.uint64(1) == 0
+            trocas |= descartada.astype(np.int32) << (Mao.TAMANHO - 1 - posicao)
+        n_tipos = len(Mao.TIPOS)
+        contagens = np.bincount(trocas * n_tipos + self._ranks, minlength=SolucionadorTrocas.N_TROCAS * n_tipos)
+        return contagens.reshape(SolucionadorTrocas.N_TROCAS, n_tipos)
@@ -0,0 +1,159 @@
+from typing import NamedTuple
+
+import numpy as np
+
+from poker import mascaras
+from poker.avaliador import Avaliador
+from poker.avaliador_lote import AvaliadorLote
+from poker.conjunto_cartas import N_CARTAS
+from poker.mao import Mao
+from poker.simulacao_lote import SimulacaoLote
+
+
+def _gerar_limites():
+    """LIMITES[m, c]: a máscara m com só as suas c trocas mais à direita (as últimas cartas de Mao.cartas)"""
+    limites = np.zeros((mascaras.N_MASCARAS, Mao.TAMANHO + 1), dtype=np.int64)
+    for mascara in range(mascaras.N_MASCARAS):
+        for concedidas in range(Mao.TAMANHO + 1):
+            limitada, restantes = 0, concedidas
+            for bit in range(Mao.TAMANHO):
+                if restantes and mascara >> bit & 1:
+                    limitada |= 1 << bit
+                    restantes -= 1
+            limites[mascara, concedidas] = limitada
+    return limites
+
+
+LIMITES = _gerar_limites()
+QUANTIDADES = np.array([mascaras.contar(mascara) for mascara in range(mascaras.N_MASCARAS)], dtype=np.int64)
+
+
+class JogosLote(NamedTuple):
+    cartas: np.ndarray  # (N, S, 5) mãos recebidas por cada assento, na ordem de Mao.cartas
+    pedidas: np.ndarray  # (N, S) máscaras de troca decididas pelas estratégias
+    trocas: np.ndarray  # (N, S) máscaras de fato trocadas, depois do limite do baralho
+    cartas_finais: np.ndarray  # (N, S, 5) mãos depois da troca
+    forcas: np.ndarray  # (N, S) forças das mãos finais (Mao.forca)
+
+
+class DesempenhoEstrategia(NamedTuple):
+    participacoes: int  # jogos x assentos ocupados pela estratégia
+    vitorias: int  # jogos vencidos sozinho
+    empates: int  # jogos em que dividiu a melhor mão
+    potes: float  # soma das frações do pote ganhas
+    tipos_finais: np.ndarray  # (9,) quantas mãos finais de cada um dos Mao.TIPOS
+
+    @property
+    def taxa_vitoria(self):
+        return self.vitorias / self.participacoes
+
+    @property
+    def taxa_empate(self):
+        return self.empates / self.participacoes
+
+    @property
+    def fracao_pote(self):
+        """Fração média do pote por jogo; 1 / assentos é o esperado de uma estratégia igual às demais"""
+        return self.potes / self.participacoes
+
+    @property
+    def distribuicao_tipos(self):
+        return self.tipos_finais / self.participacoes
+
+
+class ResultadoTorneio(NamedTuple):
+    jogos: int
+    desempenhos: dict  # nome -> DesempenhoEstrategia, somando os assentos de mesmo nome
+    trocas_cortadas: int  # cartas que as estratégias quiseram trocar, mas não havia mais no baralho
+
+
+class Torneio:
+    """Joga partidas completas de draw poker entre estratégias de troca, em lotes vetorizados, sem Jogo nem eventos.
+
+    Cada assento recebe 5 cartas do mesmo baralho e troca as que sua estratégia decidir; as compras saem do que sobrou
+    do baralho, na ordem dos assentos a partir de um que muda a cada jogo, para que nenhum assento seja sempre o último.
+    Se o baralho acaba (com 6 ou mais assentos), as trocas que faltam são cortadas, mantendo as primeiras cartas de
+    Mao.cartas. No showdown as mãos são comparadas pela força completa, com os desempates; quem empata divide o pote.
+    """
+    MINIMO_ASSENTOS = 2
+    MAXIMO_ASSENTOS = N_CARTAS // Mao.TAMANHO
+    TAMANHO_BLOCO = 1 << 14
+
+    def __init__(self, assentos, aleatorio=None):
+        """assentos é uma lista de pares (nome, estratégia); a mesma estratégia pode ocupar vários assentos"""
+        if not Torneio.MINIMO_ASSENTOS <= len(assentos) <= Torneio.MAXIMO_ASSENTOS:
+            raise ValueError(f'Quantidade inválida de assentos: {len(assentos)}; são de {Torneio.MINIMO_ASSENTOS} a {Torneio.MAXIMO_ASSENTOS}.')
+        self._nomes = [nome for nome, _ in assentos]
+        self._grupos = {}  # estratégia -> assentos, para decidir as trocas de todos eles em uma só chamada
+        for assento, (_, estrategia) in enumerate(assentos):
+            self._grupos.setdefault(id(estrategia), (estrategia, []))[1].append(assento)
+        self._simulacao = SimulacaoLote(aleatorio)
+        self._avaliador = AvaliadorLote.padrao()
+        self._ranks = np.array(Avaliador.padrao().ranks, dtype=np.int64)
+        self._jogados = 0
+
+    @property
+    def nomes(self):
+        return self._nomes
+
+    def jogar(self, jogos):
+        s = len(self._nomes)
+        # por assento: vitórias, empates, frações do pote, tipos das mãos finais (9 colunas) e cartas cortadas
+        totais = np.zeros((s, 3 + len(Mao.TIPOS) + 1))
+        for inicio in range(0, jogos, Torneio.TAMANHO_BLOCO):
+            totais += self._apurar(self.jogar_lote(min(Torneio.TAMANHO_BLOCO, jogos - inicio)))
+        desempenhos = {}
+        for nome in dict.fromkeys(self._nomes):
+            vitorias, empates, potes, *tipos_finais, _ = totais[[assento for assento, outro in enumerate(self._nomes) if outro == nome]].sum(axis=0)
+            participacoes = jogos * self._nomes.count(nome)
+            desempenhos[nome] = DesempenhoEstrategia(participacoes, int(vitorias), int(empates), float(potes), np.array(tipos_finais, dtype=np.int64))
+        return ResultadoTorneio(jogos, desempenhos, int(totais[:, -1].sum()))
+
+    def _apurar(self, lote):
+        """Totais de cada assento em um lote, nas colunas de jogar"""
+        melhores = lote.forcas.max(axis=1, keepdims=True)
+        vencedores = lote.forcas == melhores
+        divididos = np.count_nonzero(vencedores, axis=1)[:, None]
+        s = lote.forcas.shape[1]
+        tipos = np.arange(s) * len(Mao.TIPOS) + self._ranks[lote.forcas]
+        return np.column_stack([
+            np.count_nonzero(vencedores & (divididos == 1), axis=0),
+            np.count_nonzero(vencedores & (divididos > 1), axis=0),
+            (vencedores / divididos).sum(axis=0),
+            np.bincount(tipos.ravel(), minlength=s * len(Mao.TIPOS)).reshape(s, len(Mao.TIPOS)),
+            (QUANTIDADES[lote.pedidas] - QUANTIDADES[lote.trocas]).sum(axis=0),
+        ])
+
+    def jogar_lote(self, n):
+        """Joga n partidas e devolve as cartas, as trocas e as forças finais de cada assento"""
+        s = len(self._nomes)
+        distribuidas = self._simulacao.distribuir(n, min(N_CARTAS, 2 * Mao.TAMANHO * s))
+        cartas = AvaliadorLote.ordenar(distribuidas[:, :s * Mao.TAMANHO].reshape(n * s, Mao.TAMANHO)).reshape(n, s, Mao.TAMANHO)
+        pedidas = self._decidir_trocas(cartas)
+        trocas, inicios = self._limitar_trocas(pedidas, distribuidas.shape[1] - s * Mao.TAMANHO)
+        posicoes = np.minimum(inicios[:, :, None] + np.arange(Mao.TAMANHO), distribuidas.shape[1] - s * Mao.TAMANHO - 1)
+        compras = np.take_along_axis(distribuidas, (s * Mao.TAMANHO + posicoes).reshape(n, -1), axis=1)
+        cartas_finais = SimulacaoLote.trocar(cartas.reshape(-1, Mao.TAMANHO), trocas.ravel(), compras.reshape(-1, Mao.TAMANHO)).reshape(cartas.shape)
+        self._jogados += n
+        return JogosLote(cartas, pedidas, trocas, cartas_finais, self._avaliador.forcas(cartas_finais).astype(np.int64))
+
+    def _decidir_trocas(self, cartas):
+        n = len(cartas)
+        ranks = self._ranks[self._avaliador.forcas(cartas)]
+        pedidas = np.zeros(ranks.shape, dtype=np.int64)
+        for estrategia, assentos in self._grupos.values():
+            decididas = estrategia.obter_trocas_lote(cartas[:, assentos].reshape(-1, Mao.TAMANHO), ranks[:, assentos].ravel(), self._simulacao.gerador)
+            pedidas[:, assentos] = np.asarray(decididas).reshape(n, len(assentos))
+        return pedidas
+
+    def _limitar_trocas(self, pedidas, monte):
+        """Trocas cortadas pelas monte cartas que sobram no baralho e a posição no monte da 1a compra de cada assento"""
+        n, s = pedidas.shape
+        ordem = (self._jogados + np.arange(n)[:, None] + np.arange(s)) % s  # assento que compra em cada vez
+        quantidades = np.take_along_axis(QUANTIDADES[pedidas], ordem, axis=1)
+        inicios = np.cumsum(quantidades, axis=1) - quantidades
+        concedidas = np.clip(monte - inicios, 0, quantidades)
+        por_assento = np.argsort(ordem, axis=1)  # vez de cada assento
+        inicios = np.take_along_axis(inicios, por_assento, axis=1)
+        concedidas = np.take_along_axis(concedidas, por_assento, axis=1)
+        return LIMITES[pedidas, concedidas], inicios
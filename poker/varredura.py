@@ -0,0 +1,201 @@
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from statistics import NormalDist
+from typing import NamedTuple
+
+import numpy as np
+
+from poker.aleatorio import FonteAleatoria
+from poker.arquivos import salvar_atomico
+from poker.avaliacao_sequencial import TIPOS_RESULTADO, intervalo_wilson
+from poker.estrategias_troca.estrategia_troca_rl import EstrategiaTrocaRL
+from poker.simulacao_lote import SimulacaoLote
+
+INICIALIZACOES = ['aleatorio', 'minimo']  # pesos sorteados na 1a visita de cada linha, ou todos iguais ao mínimo ("Init 1")
+_PROCESSO = {}  # estado de cada processo do pool: as distribuições mapeadas e os parâmetros da varredura
+
+
+class Recompensas(NamedTuple):
+    melhorou: int = 2
+    piorou: int = -1
+    empate: int = 1
+
+    def calcular(self, ranks_antes, ranks_depois):
+        return np.select([ranks_depois > ranks_antes, ranks_depois < ranks_antes], [self.melhorou, self.piorou], default=self.empate)
+
+
+class ConfiguracaoTreino(NamedTuple):
+    inicializacao: str
+    minimo: int
+    maximo: int
+    recompensas: Recompensas
+    episodios: int
+
+    @property
+    def nome(self):
+        """Identifica a execução nos arquivos, como tabela-treinamento-1-279.csv, mas com todos os parâmetros; os limites
+        ficam no fim, onde converte_tabelas_csv os procura"""
+        return f'{self.inicializacao}-{"_".join(map(str, self.recompensas))}-{self.episodios}-{self.minimo}-{self.maximo}'
+
+
+class ParametrosVarredura(NamedTuple):
+    lote: int = 100  # episódios jogados com a tabela congelada antes de cada atualização
+    intervalo_checkpoint: int = 10_000  # episódios entre dois checkpoints de cada execução
+    distribuicoes: int = 1 << 16  # episódios distintos no conjunto comum de distribuições, reaproveitados em ciclo
+    testes: int = 1_000_000  # episódios da avaliação de cada tabela treinada
+
+
+class ResultadoTreino(NamedTuple):
+    configuracao: ConfiguracaoTreino
+    contagens: dict  # 'empate', 'melhorou' e 'piorou' na avaliação, como em compara_estrategias_troca
+    testes: int
+
+    def porcentagem(self, tipo):
+        return self.contagens[tipo] / self.testes * 100.0
+
+    def intervalo(self, tipo, confianca=0.95):
+        """Intervalo de Wilson da proporção do resultado tipo na avaliação"""
+        return intervalo_wilson(self.contagens[tipo], self.testes, NormalDist().inv_cdf(1 - (1 - confianca) / 2))
+
+
+def grade(inicializacoes, limites, recompensas, episodios):
+    """Todas as combinações dos valores informados; limites são pares (mínimo, máximo) e recompensas, ternas Recompensas"""
+    for inicializacao in inicializacoes:
+        if inicializacao not in INICIALIZACOES:
+            raise ValueError(f'Inicialização inválida: {inicializacao}; são {", ".join(INICIALIZACOES)}.')
+    return [ConfiguracaoTreino(inicializacao, minimo, maximo, Recompensas(*recompensa), quantidade)
+            for inicializacao, (minimo, maximo), recompensa, quantidade in product(inicializacoes, limites, recompensas, episodios)]
+
+
+def classificar(resultados):
+    """Resultados do melhor para o pior: mais melhoras na avaliação e, no empate, menos pioras"""
+    return sorted(resultados, key=lambda resultado: (-resultado.contagens['melhorou'], resultado.contagens['piorou']))
+
+
+class Varredura:
+    """Treina a estratégia RL com cada configuração de uma grade, em paralelo, e classifica as tabelas resultantes.
+
+    Todas as execuções treinam com as mesmas distribuições: um conjunto de episódios (as mãos de treinamento e as
+    compras de cada uma), sorteado uma vez e gravado em distribuicoes.npy no diretório, que cada processo mapeia em
+    memória e percorre em ciclo. Assim as diferenças entre as tabelas vêm das configurações, e não das cartas. Cada
+    execução grava seu próprio checkpoint (com o estado aleatório) a cada intervalo_checkpoint episódios; rodar a
+    varredura de novo no mesmo diretório continua as execuções interrompidas e só reavalia as concluídas. No fim, todas
+    as tabelas são avaliadas nos mesmos episódios, e o resumo classificado vai para resumo.csv.
+    """
+    ARQUIVO_DISTRIBUICOES = 'distribuicoes.npy'
+    ARQUIVO_RESUMO = 'resumo.csv'
+
+    def __init__(self, diretorio, maos, parametros=ParametrosVarredura(), semente=None):
+        """maos são os códigos (M, 5) das mãos de treinamento; cada episódio joga todas elas, como em treina_estrategia_troca_rl"""
+        self._diretorio = diretorio
+        self._parametros = parametros
+        self._sequencia = np.random.SeedSequence(semente)
+        semente_distribuicoes, self._semente_avaliacao = self._sequencia.spawn(2)
+        os.makedirs(diretorio, exist_ok=True)
+        self._distribuicoes = gerar_distribuicoes(os.path.join(diretorio, Varredura.ARQUIVO_DISTRIBUICOES), maos, parametros.distribuicoes, semente_distribuicoes)
+
+    @property
+    def diretorio(self):
+        return self._diretorio
+
+    def executar(self, configuracoes, processos=None):
+        """Treina e avalia cada configuração, com processos em paralelo (1: no próprio processo); retorna os resultados classificados"""
+        sementes = self._sequencia.spawn(len(configuracoes))
+        argumentos = (self._distribuicoes, self._diretorio, self._parametros, self._semente_avaliacao)
+        if processos == 1:
+            _inicializa_processo(*argumentos)
+            resultados = list(map(_treinar_e_avaliar, configuracoes, sementes))
+        else:
+            with ProcessPoolExecutor(processos, initializer=_inicializa_processo, initargs=argumentos) as executor:
+                resultados = list(executor.map(_treinar_e_avaliar, configuracoes, sementes))
+        resultados = classificar(resultados)
+        salvar_resumo(os.path.join(self._diretorio, Varredura.ARQUIVO_RESUMO), resultados)
+        return resultados
+
+
+def gerar_distribuicoes(caminho, maos, quantidade, semente=None):
+    """Grava em caminho, se ainda não existir, um array (quantidade, M, 10) com as maos e as compras de cada episódio"""
+    maos = np.asarray(maos, dtype=np.int8)
+    formato = (quantidade, len(maos), SimulacaoLote.CARTAS_POR_EPISODIO)
+    if os.path.exists(caminho):
+        existentes = np.load(caminho, mmap_mode='r')
+        if existentes.shape != formato or not (existentes[0, :, :maos.shape[1]] == maos).all():
+            raise ValueError(f'Distribuições {caminho} com formato {existentes.shape} ou mãos diferentes das pedidas {formato}.')
+        return caminho
+    todas = np.tile(maos, (quantidade, 1))
+    compras = SimulacaoLote(semente).distribuir_restantes(todas)
+    salvar_atomico(caminho, lambda temporario: np.save(temporario, np.hstack([todas, compras]).reshape(formato)))
+    return caminho
+
+
+def caminho_tabela(diretorio, configuracao, extensao='.npz'):
+    """Checkpoint (.npz) ou tabela final (.csv) da execução da configuração"""
+    return os.path.join(diretorio, f'tabela-treinamento-{configuracao.nome}{extensao}')
+
+
+def salvar_resumo(caminho, resultados, confianca=0.95):
+    with open(caminho, 'w', newline='', encoding='utf-8') as arquivo:
+        escritor = csv.writer(arquivo, delimiter=';')
+        escritor.writerow(['posicao', 'nome', *ConfiguracaoTreino._fields[:3], *(f'recompensa_{campo}' for campo in Recompensas._fields),
+                           'episodios', *TIPOS_RESULTADO, 'meia_largura_melhorou', 'testes'])
+        for posicao, resultado in enumerate(resultados, 1):
+            configuracao = resultado.configuracao
+            escritor.writerow([posicao, configuracao.nome, configuracao.inicializacao, configuracao.minimo, configuracao.maximo, *configuracao.recompensas,
+                               configuracao.episodios, *(f'{resultado.porcentagem(tipo):.3f}' for tipo in TIPOS_RESULTADO),
+                               f'{resultado.intervalo("melhorou", confianca).meia_largura * 100:.3f}', resultado.testes])
+
+
+def _inicializa_processo(distribuicoes, diretorio, parametros, semente_avaliacao):
+    _PROCESSO['distribuicoes'] = np.load(distribuicoes, mmap_mode='r')  # as páginas do arquivo são compartilhadas entre os processos
+    _PROCESSO['diretorio'] = diretorio
+    _PROCESSO['parametros'] = parametros
+    _PROCESSO['semente_avaliacao'] = semente_avaliacao
+
+
+def _treinar_e_avaliar(configuracao, semente):
+    estrategia = treinar(configuracao, _PROCESSO['distribuicoes'], _PROCESSO['diretorio'], _PROCESSO['parametros'], semente)
+    testes = _PROCESSO['parametros'].testes
+    # mesma semente para todas as execuções: as tabelas são avaliadas nos mesmos episódios
+    contagens = SimulacaoLote(_PROCESSO['semente_avaliacao']).contar_resultados(estrategia, testes)
+    return ResultadoTreino(configuracao, contagens, testes)
+
+
+def treinar(configuracao, distribuicoes, diretorio, parametros=ParametrosVarredura(), semente=None):
+    """Treina uma tabela com as distribuições comuns, continuando do checkpoint da configuração, se houver"""
+    checkpoint = caminho_tabela(diretorio, configuracao)
+    fontes = FonteAleatoria(semente).dividir(2)
+    estrategia = EstrategiaTrocaRL(minimo=configuracao.minimo, maximo=configuracao.maximo, aleatorio=fontes[0])
+    inicio = _retomar(estrategia, checkpoint, configuracao, fontes)
+    simulacao = SimulacaoLote(fontes[1])
+    for episodio in range(inicio, configuracao.episodios, parametros.lote):
+        n = min(parametros.lote, configuracao.episodios - episodio)
+        distribuidas = distribuicoes[np.arange(episodio, episodio + n) % len(distribuicoes)]
+        episodios = simulacao.jogar_distribuidas(estrategia, distribuidas.reshape(-1, SimulacaoLote.CARTAS_POR_EPISODIO))
+        estados = estrategia.codificador.codificar_lote(episodios.cartas, episodios.ranks_antes)
+        estrategia.registrar_resultados(estados, episodios.trocas, configuracao.recompensas.calcular(episodios.ranks_antes, episodios.ranks_depois))
+        if (episodio + n) // parametros.intervalo_checkpoint > episodio // parametros.intervalo_checkpoint:
+            estrategia.salvar(checkpoint, **_metadados(configuracao, episodio + n, fontes))
+    if inicio < configuracao.episodios:
+        estrategia.salvar(checkpoint, **_metadados(configuracao, configuracao.episodios, fontes))
+        estrategia.salvar(caminho_tabela(diretorio, configuracao, '.csv'))
+    return estrategia
+
+
+def _retomar(estrategia, checkpoint, configuracao, fontes):
+    """Carrega o checkpoint da configuração, com o estado das fontes, e devolve o episódio de onde continuar"""
+    if not os.path.exists(checkpoint):
+        if configuracao.inicializacao == 'minimo':
+            estrategia.tabela[:] = configuracao.minimo
+        return 0
+    metadados = estrategia.carregar(checkpoint)
+    if metadados.get('configuracao') != configuracao.nome:
+        raise ValueError(f'Checkpoint {checkpoint} da configuração {metadados.get("configuracao")}, e não {configuracao.nome}.')
+    for fonte, estado in zip(fontes, metadados['estado_aleatorio']):
+        fonte.estado = estado
+    return metadados['episodio']
+
+
+def _metadados(configuracao, episodio, fontes):
+    return {'configuracao': configuracao.nome, 'episodio': episodio, 'estado_aleatorio': [fonte.estado for fonte in fontes]}
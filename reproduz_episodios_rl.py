@@ -0,0 +1,38 @@
+import argparse
+
+from poker.estrategias_troca.codificadores_estado import CODIFICADORES, criar_codificador
+from poker.estrategias_troca.estrategia_troca_rl import EstrategiaTrocaRL
+from poker.registro_episodios import ler_episodios, recompensas_por_rank, reproduzir
+from treina_estrategia_troca_rl import TIPOS
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Refaz a tabela da estratégia RL a partir de episódios registrados, com outras recompensas ou limites.')
+    parser.add_argument('registro', help='arquivo gravado por treina_estrategia_troca_rl.py --registro')
+    parser.add_argument('--saida', default='tabela-reproduzida.npz', help='tabela gerada (CSV, .npy ou checkpoint .npz)')
+    parser.add_argument('--melhorou', type=int, default=2, help='recompensa quando o rank sobe')
+    parser.add_argument('--piorou', type=int, default=-1, help='recompensa quando o rank cai')
+    parser.add_argument('--empate', type=int, default=1, help='recompensa quando o rank fica igual')
+    parser.add_argument('--minimo', type=int, default=EstrategiaTrocaRL.MIN, help='peso mínimo')
+    parser.add_argument('--maximo', type=int, default=EstrategiaTrocaRL.MAX, help='peso máximo')
+    parser.add_argument('--peso-inicial', type=int, default=None, help='peso inicial de todas as células (padrão: aleatório)')
+    parser.add_argument('--codificador', default=None, choices=sorted(CODIFICADORES), help='estado da mão (padrão: o do registro)')
+    parser.add_argument('--lote', type=int, default=None, help='o --lote do treinamento, para refazer a tabela treinada mesmo com pesos nos limites (padrão: uma só atualização, que soma as recompensas de cada célula antes de limitar)')
+    parser.add_argument('--semente', type=int, default=None, help='semente dos pesos iniciais aleatórios')
+    args = parser.parse_args()
+    if args.lote is not None and args.lote < 1:
+        parser.error(f'--lote deve ser ao menos 1, e não {args.lote}')
+
+    _, metadados = ler_episodios(args.registro)
+    estrategia = EstrategiaTrocaRL(minimo=args.minimo, maximo=args.maximo, aleatorio=args.semente, codificador=criar_codificador(args.codificador or metadados['codificador']))
+    if args.peso_inicial is not None:
+        estrategia.tabela[:] = args.peso_inicial
+    # com --lote 1, o treinamento atualiza a tabela a cada mão; com mais, a cada lote de episódios, um por tipo de mão
+    registros_por_lote = None if args.lote is None else 1 if args.lote == 1 else args.lote * len(TIPOS)
+    episodios = reproduzir(args.registro, estrategia, recompensas_por_rank(args.melhorou, args.piorou, args.empate), registros_por_lote)
+    estrategia.salvar(args.saida, episodios_reproduzidos=episodios, registro=args.registro)
+    print(f'{episodios} episódios reproduzidos em {args.saida}.')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+import unittest
+
+import numpy as np
+
+from poker.aleatorio import FonteAleatoria
+from poker.baralho import Baralho
+from poker.estrategias_troca.estrategia_troca_randomica import EstrategiaTrocaRandomica
+from poker.jogador import Jogador
+from poker.jogo import Jogo
+
+
+class FonteAleatoriaTest(unittest.TestCase):
+
+    @staticmethod
+    def sorteios(fonte, n=200):
+        return [fonte.uniforme() for _ in range(n)] + fonte.gerador.random(3).tolist()
+
+    def test_quero_os_mesmos_sorteios_para_a_mesma_semente(self):
+        esperado = FonteAleatoriaTest.sorteios(FonteAleatoria(7))
+        for nome, semente in [('inteiro', 7), ('seed_sequence', np.random.SeedSequence(7))]:
+            with self.subTest(f'test_semente_{nome}'):
+                self.assertEqual(esperado, FonteAleatoriaTest.sorteios(FonteAleatoria(semente)))
+        self.assertNotEqual(esperado, FonteAleatoriaTest.sorteios(FonteAleatoria(8)))
+
+    def test_quero_dividir_em_fontes_independentes_e_reproduziveis(self):
+        filhas = [FonteAleatoriaTest.sorteios(fonte) for fonte in FonteAleatoria(3).dividir(3)]
+        self.assertEqual(filhas, [FonteAleatoriaTest.sorteios(fonte) for fonte in FonteAleatoria(3).dividir(3)])
+        self.assertEqual(3, len({tuple(sorteios) for sorteios in filhas}))
+        self.assertNotIn(FonteAleatoriaTest.sorteios(FonteAleatoria(3)), filhas)
+
+    def test_quero_restaurar_o_estado_inclusive_a_reserva(self):
+        fonte = FonteAleatoria(11)
+        fonte.uniforme()
+        estado = fonte.estado
+        esperado = FonteAleatoriaTest.sorteios(fonte)
+        fonte.estado = estado
+        self.assertEqual(esperado, FonteAleatoriaTest.sorteios(fonte))
+
+    def test_quero_inteiros_no_intervalo(self):
+        fonte = FonteAleatoria(5)
+        inteiros = [fonte.inteiro(6) for _ in range(1000)]
+        self.assertEqual(set(range(6)), set(inteiros))
+
+    def test_criar_deve_reaproveitar_a_fonte(self):
+        fonte = FonteAleatoria(1)
+        self.assertIs(fonte, FonteAleatoria.criar(fonte))
+        gerador = np.random.default_rng(1)
+        self.assertIs(gerador, FonteAleatoria.criar(gerador).gerador)
+
+    def test_baralho_deve_ser_reproduzivel_pela_semente(self):
+        distribuicoes = []
+        for _ in range(2):
+            baralho = Baralho(aleatorio=4)
+            baralho.embaralhar()
+            distribuicoes.append([baralho.distribuir_conjunto(5) for _ in range(10)])
+        self.assertEqual(distribuicoes[0], distribuicoes[1])
+
+    def test_jogo_deve_ser_reproduzivel_pela_semente(self):
+        resultados = []
+        for _ in range(2):
+            fonte_alice, fonte_bob, fonte_jogo = FonteAleatoria(9).dividir(3)
+            jogadores = [Jogador('Alice', EstrategiaTrocaRandomica(aleatorio=fonte_alice)),
+                         Jogador('Bob', EstrategiaTrocaRandomica(aleatorio=fonte_bob))]
+            Jogo(jogadores, aleatorio=fonte_jogo).jogar()
+            resultados.append([(jogador.trocas, str(jogador.cartas)) for jogador in jogadores])
+        self.assertEqual(resultados[0], resultados[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from poker.arquivos import carregar_ou_gerar, salvar_atomico
+
+
+class ArquivosTest(unittest.TestCase):
+
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.caminho = os.path.join(self.diretorio.name, 'tabela.npy')
+
+    def tearDown(self):
+        self.diretorio.cleanup()
+
+    def test_gravacao_que_falha_nao_deve_deixar_temporario_nem_alterar_o_arquivo(self):
+        np.save(self.caminho, np.arange(3))
+
+        def falhar(temporario):
+            np.save(temporario, np.arange(5))
+            raise OSError('disco cheio')
+
+        with self.assertRaises(OSError):
+            salvar_atomico(self.caminho, falhar)
+        self.assertEqual(['tabela.npy'], os.listdir(self.diretorio.name))
+        self.assertEqual([0, 1, 2], np.load(self.caminho).tolist())
+
+    def test_sem_substituir_deve_manter_o_arquivo_existente(self):
+        self.assertTrue(salvar_atomico(self.caminho, lambda temporario: np.save(temporario, np.arange(3)), substituir=False))
+        self.assertFalse(salvar_atomico(self.caminho, lambda temporario: np.save(temporario, np.arange(5)), substituir=False))
+        self.assertTrue(salvar_atomico(self.caminho, lambda temporario: np.save(temporario, np.arange(4))))
+        self.assertEqual(['tabela.npy'], os.listdir(self.diretorio.name))
+        self.assertEqual([0, 1, 2, 3], np.load(self.caminho).tolist())
+
+    def test_carregar_ou_gerar_deve_gerar_so_se_o_arquivo_faltar_ou_for_invalido(self):
+        geracoes = []
+
+        def gerar():
+            geracoes.append(1)
+            return np.arange(4)
+
+        for conteudo in [None, np.arange(3), None]:
+            with self.subTest(f'test_conteudo_{conteudo}'):
+                if conteudo is not None:
+                    np.save(self.caminho, conteudo)
+                self.assertEqual([0, 1, 2, 3], carregar_ou_gerar(self.caminho, lambda array: len(array) == 4, gerar).tolist())
+        self.assertEqual(2, len(geracoes))  # a terceira chamada lê o arquivo gravado pela segunda
+        self.assertEqual(['tabela.npy'], os.listdir(self.diretorio.name))
+
+    def test_carregar_ou_gerar_deve_usar_o_gerado_se_nao_puder_gravar(self):
+        caminho = os.path.join(self.diretorio.name, 'inexistente', 'tabela.npy')
+        self.assertEqual([0, 1], carregar_ou_gerar(caminho, lambda array: True, lambda: np.arange(2)).tolist())
+        self.assertEqual([], os.listdir(self.diretorio.name))
+
+
+if __name__ == '__main__':
+    unittest.main()
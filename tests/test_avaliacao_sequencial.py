@@ -0,0 +1,56 @@
+import unittest
+
+import numpy as np
+
+from poker.avaliacao_sequencial import (TIPOS_RESULTADO, EstatisticasPareadas, codificar_resultados, contar_conjuntas,
+                                        intervalo_wilson, z_sequencial)
+
+
+class AvaliacaoSequencialTest(unittest.TestCase):
+
+    def test_codificar_resultados(self):
+        codigos = codificar_resultados([3, 3, 3], [3, 5, 1])
+        self.assertEqual(['empate', 'melhorou', 'piorou'], [TIPOS_RESULTADO[c] for c in codigos])
+
+    def test_intervalo_wilson_deve_conter_a_proporcao_e_ficar_entre_0_e_1(self):
+        for sucessos, n in [(0, 10), (10, 10), (3, 10), (5000, 10_000)]:
+            with self.subTest(f'test_wilson_{sucessos}_{n}'):
+                intervalo = intervalo_wilson(sucessos, n, 1.96)
+                self.assertTrue(0.0 <= intervalo.inferior <= intervalo.estimativa <= intervalo.superior <= 1.0)
+        self.assertAlmostEqual(1.96 * 0.005, intervalo_wilson(5000, 10_000, 1.96).meia_largura, delta=1e-5)
+
+    def test_z_deve_crescer_com_as_olhadas_e_as_comparacoes(self):
+        self.assertGreater(z_sequencial(1), 1.96)
+        self.assertLess(z_sequencial(1), z_sequencial(2))
+        self.assertLess(z_sequencial(2), z_sequencial(2, comparacoes=3))
+        self.assertLess(z_sequencial(2, confianca=0.9), z_sequencial(2, confianca=0.99))
+
+    def test_contagens_conjuntas_e_diferenca_pareada(self):
+        gerador = np.random.default_rng(1)
+        a = gerador.integers(0, 3, 5000)
+        b = np.where(gerador.random(5000) < 0.8, a, gerador.integers(0, 3, 5000))
+        conjuntas = contar_conjuntas([a, b])
+        self.assertEqual((2, 2, 3), conjuntas.shape)
+        self.assertEqual(np.count_nonzero((a == 1) & (b == 1)), conjuntas[0, 1, 1])
+        self.assertEqual(np.count_nonzero(a == 2), conjuntas[0, 0, 2])
+
+        estatisticas = EstatisticasPareadas(['a', 'b'])
+        for inicio in range(0, 5000, 1000):  # acumular em partes é o mesmo que contar tudo de uma vez
+            estatisticas.adicionar(contar_conjuntas([a[inicio:inicio + 1000], b[inicio:inicio + 1000]]), 1000)
+        self.assertEqual(5000, estatisticas.episodios)
+        self.assertEqual(np.count_nonzero(a == 0), estatisticas.contagens('a')['empate'])
+        diferencas = (a == 1).astype(float) - (b == 1)
+        diferenca = estatisticas.diferenca('a', 'b', 'melhorou', 2.0)
+        self.assertAlmostEqual(diferencas.mean(), diferenca.estimativa)
+        self.assertAlmostEqual(2.0 * diferencas.std() / np.sqrt(5000), diferenca.meia_largura)
+        # episódios comuns: o intervalo pareado é mais estreito que o de duas amostras independentes
+        independentes = 2.0 * np.sqrt(((a == 1).var() + (b == 1).var()) / 5000)
+        self.assertLess(diferenca.meia_largura, independentes)
+
+    def test_estrategias_iguais_nao_devem_ser_separadas(self):
+        resultados = np.random.default_rng(2).integers(0, 3, 1000)
+        estatisticas = EstatisticasPareadas(['a', 'b'])
+        estatisticas.adicionar(contar_conjuntas([resultados, resultados]), 1000)
+        self.assertFalse(estatisticas.separadas('melhorou', 2.0))
+        self.assertEqual(0.0, estatisticas.diferenca('a', 'b', 'melhorou', 2.0).meia_largura)
+        self.assertFalse(EstatisticasPareadas(['a']).separadas('melhorou', 2.0))
@@ -0,0 +1,75 @@
+import unittest
+
+import numpy as np
+
+from poker.avaliador import Avaliador, N_VALORES
+from poker.baralho import Baralho
+from poker.carta import Carta
+from poker.mao import Mao
+
+
+class AvaliadorTest(unittest.TestCase):
+
+    def test_quero_saber_quantas_maos_existem_de_cada_tipo(self):
+        avaliador = Avaliador.padrao()
+        ranks = np.array(avaliador.ranks)[avaliador.forcas]
+        quantidades = [1302540, 1098240, 123552, 54912, 10200, 5108, 3744, 624, 40]
+        self.assertEqual(quantidades, np.bincount(ranks).tolist())
+
+    def test_quero_saber_quantas_classes_de_equivalencia_existem_de_cada_tipo(self):
+        avaliador = Avaliador.padrao()
+        quantidades = [1277, 2860, 858, 858, 10, 1277, 156, 156, 10]
+        self.assertEqual(Avaliador.N_CLASSES, len(avaliador.chaves))
+        self.assertEqual(quantidades, np.bincount(avaliador.ranks).tolist())
+
+    def test_indice_deve_seguir_a_ordem_das_maos_na_tabela(self):
+        maos = Avaliador.todas_as_maos()
+        for i in [0, 1, 2, 1000, 123456, len(maos) - 1]:
+            with self.subTest(f'test_indice_da_mao_{i}'):
+                codigos = maos[i].tolist()
+                self.assertEqual(i, Avaliador.indice(codigos))
+                self.assertEqual(i, Avaliador.indice(reversed(codigos)))
+
+    def test_tabela_deve_conferir_com_a_logica_is_de_mao_em_todas_as_maos(self):
+        # os métodos is_* de Mao só dependem dos valores das cartas e de serem todas do mesmo naipe;
+        # basta então conferir que a tabela é constante em cada grupo e testar um representante de cada grupo
+        avaliador = Avaliador.padrao()
+        maos = Avaliador.todas_as_maos()
+        naipes = maos // N_VALORES
+        valores = np.sort(maos % N_VALORES, axis=1).astype(np.int64)
+        grupos = (valores * N_VALORES ** np.arange(Mao.TAMANHO)).sum(axis=1)
+        grupos += (naipes == naipes[:, :1]).all(axis=1) * N_VALORES ** Mao.TAMANHO
+        _, representantes, grupo_de_cada_mao = np.unique(grupos, return_index=True, return_inverse=True)
+        self.assertEqual(Avaliador.N_CLASSES, len(representantes))
+        self.assertTrue(np.array_equal(avaliador.forcas, avaliador.forcas[representantes][grupo_de_cada_mao]))
+
+        cartas = Baralho().cartas
+        for i in representantes:
+            mao = Mao([cartas[c] for c in maos[i]])
+            tipo = Mao.TIPOS[avaliador.avaliar(maos[i].tolist())[0]]
+            with self.subTest(f'test_{mao}_is_{tipo.replace(" ", "_")}'):
+                self.assertTrue(getattr(mao, 'is_' + tipo.replace(' ', '_'))())
+
+    def test_forca_deve_desempatar_maos_do_mesmo_tipo(self):
+        testes = [
+            ['5o6e10eJcAe', '5e6c10cJpAc', True],
+            ['4o6e10eJcAe', '5e6c10cJpAc', False],
+            ['3o5e7c8o8e', '3e5c7p9c9p', False],
+            ['3o7e7c9o9e', '4e7o7p9c9p', False],
+            ['Ae2o3p4c5e', '2e3c4p5o6c', False],
+            ['5o6o10oJoAo', '5c6c10cJcAc', True],
+            ['AoAe8c8o8e', '7e7o9o9c9p', False],
+            ['Ao8p8c8o8e', '7e9e9o9c9p', False],
+            ['9p8p7p6p5p', '10eJeQeKeAe', False]
+        ]
+        avaliador = Avaliador.padrao()
+        for texto1, texto2, empate in testes:
+            with self.subTest(f'test_{texto1}_{"empata_com" if empate else "eh_menor_que"}_{texto2}'):
+                _, forca1 = avaliador.avaliar([c.codigo for c in Carta.get_cartas(texto1)])
+                _, forca2 = avaliador.avaliar([c.codigo for c in Carta.get_cartas(texto2)])
+                self.assertEqual(empate, forca1 == forca2)
+                self.assertEqual(not empate, forca1 < forca2)
+
+
+if __name__ == '__main__':
+    unittest.main()
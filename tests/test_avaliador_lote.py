@@ -0,0 +1,54 @@
+import random
+import unittest
+
+import numpy as np
+
+from poker.avaliador import Avaliador
+from poker.avaliador_lote import AvaliadorLote
+from poker.carta import Carta
+from poker.conjunto_cartas import ConjuntoCartas
+from poker.mao import Mao
+
+
+class AvaliadorLoteTest(unittest.TestCase):
+
+    def test_quero_avaliar_varias_maos_de_uma_vez(self):
+        textos = ['5o6e10eJcAe', '5p6p7p8p8c', '7o7e8c8o9e', '7o7e7c8o9e', '10eJeQeKeAc', '5p6p7p8p10p', '7o7e7c8o8e', '5o5e5c5p9o', '5p6p7p8p9p', 'Ae2o3p4c5e', 'Ae2e3e4e5e']
+        cartas = np.array([[c.codigo for c in Carta.get_cartas(texto)] for texto in textos])
+        ranks, forcas = AvaliadorLote.padrao().avaliar(cartas)
+        for i, texto in enumerate(textos):
+            with self.subTest(f'test_lote_{texto}'):
+                mao = Mao(Carta.get_cartas(texto))
+                self.assertEqual(mao.rank, ranks[i])
+                self.assertEqual(mao.forca, forcas[i])
+
+    def test_deve_concordar_com_a_tabela_do_avaliador_em_todas_as_maos(self):
+        avaliador = Avaliador.padrao()
+        ranks, forcas = AvaliadorLote.padrao().avaliar(Avaliador.todas_as_maos())
+        self.assertTrue(np.array_equal(avaliador.forcas, forcas))
+        self.assertTrue(np.array_equal(np.array(avaliador.ranks)[avaliador.forcas], ranks))
+
+    def test_forcas_pela_tabela_devem_concordar_com_avaliar_em_qualquer_ordem(self):
+        cartas = np.random.default_rng(3).permuted(Avaliador.todas_as_maos()[::97], axis=1)
+        _, forcas = AvaliadorLote.padrao().avaliar(cartas)
+        self.assertTrue(np.array_equal(forcas, AvaliadorLote.padrao().forcas(cartas)))
+        self.assertEqual(forcas[:8].tolist(), AvaliadorLote.padrao().forcas(cartas[:8].reshape(2, 4, Mao.TAMANHO)).ravel().tolist())
+        self.assertEqual(sum(1 << int(c) for c in cartas[5]), int(AvaliadorLote.mascaras(cartas)[5]))
+
+    def test_deve_concordar_com_rank_e_comparacao_de_mao(self):
+        gerador = random.Random(42)
+        pares = [gerador.sample(range(52), 2 * Mao.TAMANHO) for _ in range(2000)]
+        cartas = np.array([codigos[:Mao.TAMANHO] for codigos in pares] + [codigos[Mao.TAMANHO:] for codigos in pares])
+        ranks, forcas = AvaliadorLote.padrao().avaliar(cartas)
+        for i, codigos in enumerate(pares):
+            m1 = Mao(ConjuntoCartas.from_codigos(codigos[:Mao.TAMANHO]))
+            m2 = Mao(ConjuntoCartas.from_codigos(codigos[Mao.TAMANHO:]))
+            j = i + len(pares)
+            self.assertEqual(m1.rank, ranks[i])
+            self.assertEqual(m2.rank, ranks[j])
+            self.assertEqual(m1 < m2, forcas[i] < forcas[j])
+            self.assertEqual(m2 < m1, forcas[j] < forcas[i])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -58,6 +58,35 @@ class BaralhoTest(unittest.TestCase):
         cartas_iniciais_de_um_baralho_novo = baralho_novo.distribuir(5)
         self.assertNotEqual(cartas_iniciais_de_um_baralho_novo, cartas)
 
+    def test_quero_poder_reutilizar_o_baralho_com_reset(self):
+        baralho = Baralho()
+        baralho.embaralhar()
+        baralho.distribuir(3, '9c9e9o')
+        baralho.distribuir(5)
+        baralho.reset()
+        self.assertEqual(52, len(baralho))
+        self.assertTrue(baralho == Baralho())
+        self.assertEqual(Carta.get_cartas('ApKpQpJp10p'), baralho.distribuir(5))
+
+    def test_cartas_distribuidas_nao_devem_se_repetir(self):
+        baralho = Baralho()
+        for _ in range(100):
+            baralho.reset()
+            baralho.embaralhar()
+            retiradas = baralho.distribuir(2, 'AcKc')
+            distribuidas = retiradas + baralho.distribuir(50)
+            self.assertEqual(52, len(set(c.codigo for c in distribuidas)))
+            self.assertEqual(0, len(baralho))
+        with self.assertRaises(ValueError):
+            baralho.distribuir(1)
+
+    def test_nao_devo_poder_distribuir_uma_carta_fora_do_baralho(self):
+        baralho = Baralho()
+        baralho.distribuir(1, 'Ac')
+        with self.assertRaises(ValueError):
+            baralho.distribuir(1, 'Ac')
+        self.assertEqual(51, len(baralho))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,46 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+from benchmarks.__main__ import BASELINE, main
+from benchmarks.casos import CASOS
+from benchmarks.executor import carregar, comparar, medir
+
+
+class BenchmarksTest(unittest.TestCase):
+
+    def test_todos_os_casos_devem_executar(self):
+        for nome, (preparar, _) in CASOS.items():
+            with self.subTest(f'test_caso_{nome}'):
+                resultado = medir(preparar, 20, repeticoes=1)
+                self.assertEqual(20, resultado['operacoes'])
+                self.assertGreater(resultado['ops_por_segundo'], 0)
+                self.assertGreater(resultado['pico_bytes'], 0)
+
+    def test_deve_apontar_apenas_quedas_acima_do_limite(self):
+        baseline = {'resultados': {'a': {'ops_por_segundo': 100.0}, 'b': {'ops_por_segundo': 100.0}, 'c': {'ops_por_segundo': 100.0}}}
+        atual = {'resultados': {'a': {'ops_por_segundo': 95.0}, 'b': {'ops_por_segundo': 80.0}, 'c': {'ops_por_segundo': 150.0}, 'novo': {'ops_por_segundo': 1.0}}}
+        self.assertEqual([('b', 80.0, 100.0)], comparar(atual, baseline, 0.1))
+
+    def test_baseline_versionada_deve_ter_todos_os_casos(self):
+        self.assertEqual(set(CASOS), set(carregar(BASELINE)['resultados']))
+
+    def test_baseline_deve_ser_lida_antes_de_salvar_no_mesmo_arquivo(self):
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = os.path.join(diretorio, 'resultados.json')
+            with open(caminho, 'w', encoding='utf-8') as arquivo:
+                json.dump({'resultados': {'mao_rank': {'ops_por_segundo': 1e15}}}, arquivo)
+            argumentos = ['benchmarks', 'mao_rank', '--saida', caminho, '--baseline', caminho, '--repeticoes', '1', '--escala', '0.001']
+            with mock.patch('sys.argv', argumentos), redirect_stdout(io.StringIO()) as saida, self.assertRaises(SystemExit) as erro:
+                main()
+            self.assertEqual(1, erro.exception.code)
+            self.assertIn('REGRESSÃO mao_rank', saida.getvalue())
+            self.assertLess(carregar(caminho)['resultados']['mao_rank']['ops_por_segundo'], 1e15)
+
+
+if __name__ == '__main__':
+    unittest.main()
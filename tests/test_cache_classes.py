@@ -0,0 +1,41 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from poker.cache_classes import CacheClasses
+
+
+class CacheClassesTest(unittest.TestCase):
+
+    def test_quero_calcular_so_as_classes_que_faltam(self):
+        calculadas = []
+
+        def calcular(classes):
+            calculadas.append(classes.tolist())
+            return np.stack([classes * 2, classes * 3], axis=1)
+
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = os.path.join(diretorio, 'cache.npy')
+            cache = CacheClasses(caminho, (2,), np.int64, quantidade=100)
+            self.assertTrue(np.array_equal([[10, 15], [4, 6], [10, 15]], cache.obter_ou_calcular([5, 2, 5], calcular)))
+            self.assertTrue(np.array_equal([[4, 6], [14, 21]], cache.obter_ou_calcular([2, 7], calcular)))
+            self.assertEqual([[2, 5], [7]], calculadas)
+            cache.sincronizar()
+
+            outro = CacheClasses(caminho, (2,), np.int64, quantidade=100)  # outra execução ou processo
+            self.assertEqual([False, True, True, True], outro.preenchidas([0, 2, 5, 7]).tolist())
+            self.assertTrue(np.array_equal([[14, 21]], outro.obter([7])))
+            outro.gravar([0], [[1, 1]])
+            self.assertTrue(np.array_equal([[1, 1]], cache.obter([0])))  # o mesmo arquivo, mapeado pelos dois
+            with self.assertRaises(KeyError):
+                cache.obter([1])
+            with self.assertRaises(ValueError):
+                CacheClasses(caminho, (3,), np.int64, quantidade=100)
+            self.assertEqual(['cache.npy'], os.listdir(diretorio))
+            del cache, outro
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+from math import comb
+
+from poker.calculadora_equidade import TIPOS_EQUIDADE, CalculadoraEquidade
+from poker.carta import Carta
+from poker.mao import Mao
+
+
+class CalculadoraEquidadeTest(unittest.TestCase):
+
+    def setUp(self):
+        self.calculadora = CalculadoraEquidade(1)
+
+    def test_enumeracao_exata_deve_considerar_os_desempates(self):
+        # as 3^5 = 243 mãos 7-5-4-3-2 com os naipes que sobram empatam (nenhuma delas é flush); as demais ganham
+        pior = self.calculadora.calcular(Mao(Carta.get_cartas('7o5e4c3p2e')), amostras=None)
+        self.assertEqual((0, 243, comb(47, 5) - 243), (pior.vitorias, pior.empates, pior.derrotas))
+        self.assertAlmostEqual(243 / 2, pior.pote)
+        # só os outros 3 royal flushes empatam
+        royal = self.calculadora.calcular(Mao(Carta.get_cartas('AeKeQeJe10e')), amostras=None)
+        self.assertEqual((comb(47, 5) - 3, 3, 0), (royal.vitorias, royal.empates, royal.derrotas))
+        # mesmo par de ases, com desempates diferentes
+        alto = self.calculadora.calcular(Mao(Carta.get_cartas('AeAoKcQp9e')), amostras=None)
+        baixo = self.calculadora.calcular(Mao(Carta.get_cartas('AeAo4c3p2e')), amostras=None)
+        self.assertGreater(alto.vitoria, baixo.vitoria)
+        self.assertTrue(royal.exato)
+        self.assertEqual(0.0, royal.intervalo('empate').meia_largura)
+
+    def test_amostragem_deve_concordar_com_a_enumeracao(self):
+        for texto in ['AeAoKcKp2e', '9o9e5c4p2e', 'AeKoQcJp9e']:
+            with self.subTest(f'test_amostragem_{texto}'):
+                mao = Mao(Carta.get_cartas(texto))
+                exato = self.calculadora.calcular(mao, amostras=None)
+                amostrado = self.calculadora.calcular(mao, amostras=200_000)
+                self.assertEqual(200_000, amostrado.total)
+                self.assertFalse(amostrado.exato)
+                for tipo in TIPOS_EQUIDADE:
+                    intervalo = amostrado.intervalo(tipo, confianca=0.9999)
+                    self.assertTrue(intervalo.contem(exato.intervalo(tipo).estimativa), f'{tipo}: {intervalo}')
+
+    def test_mesma_semente_deve_dar_o_mesmo_resultado(self):
+        mao = Mao(Carta.get_cartas('AeAoKcKp2e'))
+        self.assertEqual(CalculadoraEquidade(2).calcular(mao, 3, amostras=10_000), CalculadoraEquidade(2).calcular(mao, 3, amostras=10_000))
+
+    def test_equidade_deve_cair_com_mais_oponentes(self):
+        mao = Mao(Carta.get_cartas('9o9e5c4p2e'))
+        equidades = []
+        for oponentes in [1, 3, 9]:
+            resultado = self.calculadora.calcular(mao, oponentes, amostras=50_000)
+            self.assertAlmostEqual(1.0, resultado.vitoria + resultado.empate + resultado.derrota)
+            self.assertLessEqual(resultado.vitoria, resultado.equidade)
+            self.assertLessEqual(resultado.equidade, resultado.vitoria + resultado.empate)
+            equidades.append(resultado.equidade)
+        self.assertEqual(sorted(equidades, reverse=True), equidades)
+
+    def test_equidade_depois_da_troca(self):
+        mao = Mao(Carta.get_cartas('AeKeQeJe2o'))
+        parada = self.calculadora.calcular(mao, amostras=50_000)
+        projeto = self.calculadora.calcular(mao, trocas=0b00001, amostras=50_000)  # descarta o 2o, a última carta
+        self.assertGreater(projeto.equidade, parada.equidade + 0.1)
+
+    def test_quantidades_invalidas(self):
+        mao = Mao(Carta.get_cartas('AeAoKcKp2e'))
+        self.calculadora.calcular(mao, 9, 0b00011, amostras=100)  # 47 cartas: 2 compradas e 45 dos oponentes
+        for oponentes, trocas, amostras in [(0, 0, 100), (10, 0, 100), (9, 0b00111, 100), (2, 0, None), (1, 1, None), (1, 0, 0), (1, 0, -5)]:
+            with self.subTest(f'test_invalido_{oponentes}_{trocas}_{amostras}'):
+                with self.assertRaises(ValueError):
+                    self.calculadora.calcular(mao, oponentes, trocas, amostras)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+from itertools import permutations
+import unittest
+
+import numpy as np
+
+from poker import mascaras
+from poker.avaliador_lote import AvaliadorLote
+from poker.canonizador import Canonizador
+from poker.carta import Carta
+from poker.conjunto_cartas import ConjuntoCartas, N_NAIPES, N_VALORES
+from poker.mao import Mao
+from poker.simulacao_lote import SimulacaoLote
+
+
+class CanonizadorTest(unittest.TestCase):
+
+    @staticmethod
+    def maos_aleatorias(n, semente):
+        return AvaliadorLote.ordenar(SimulacaoLote(semente).distribuir(n, Mao.TAMANHO)).astype(np.int64)
+
+    @staticmethod
+    def renomear(codigos, naipes):
+        return [naipes[codigo // N_VALORES] * N_VALORES + codigo % N_VALORES for codigo in codigos]
+
+    def test_quero_134459_classes_em_ordem(self):
+        chaves = Canonizador.padrao().chaves
+        self.assertEqual(Canonizador.N_CLASSES, len(chaves))
+        self.assertTrue((np.diff(chaves) > 0).all())
+
+    def test_maos_com_naipes_permutados_devem_ter_a_mesma_classe(self):
+        canonizador = Canonizador.padrao()
+        for texto in ['AcAo9e8p7o', 'KoJo9o7o2o', '9e9oAe8e7e', '6c5e4c3p2o', 'AeJc10e6e5o']:
+            with self.subTest(f'test_permutacoes_de_{texto}'):
+                codigos = [c.codigo for c in Mao(Carta.get_cartas(texto)).cartas]
+                classes = set()
+                for naipes in permutations(range(N_NAIPES)):
+                    renomeada = Mao(ConjuntoCartas.from_codigos(CanonizadorTest.renomear(codigos, naipes)))
+                    classes.add(canonizador.canonizar([c.codigo for c in renomeada.cartas]).classe)
+                self.assertEqual(1, len(classes))
+
+    def test_representante_deve_ser_a_mao_com_os_naipes_canonicos(self):
+        canonizador = Canonizador.padrao()
+        for codigos in CanonizadorTest.maos_aleatorias(2000, 1).tolist():
+            forma = canonizador.canonizar(codigos)
+            representante = canonizador.representante(forma.classe)
+            self.assertEqual(forma.classe, canonizador.canonizar(representante).classe)
+            renomeados = CanonizadorTest.renomear(codigos, forma.naipes)
+            self.assertEqual(renomeados, [representante[posicao] for posicao in forma.posicoes])
+            for trocas in range(mascaras.N_MASCARAS):
+                canonica = Canonizador.para_canonica(trocas, forma)
+                self.assertEqual(trocas, Canonizador.da_canonica(canonica, forma))
+                self.assertEqual(sorted(mascaras.selecionar(renomeados, trocas)), sorted(mascaras.selecionar(representante, canonica)))
+
+    def test_canonizacao_em_lote_deve_ser_igual_a_de_cada_mao(self):
+        canonizador = Canonizador.padrao()
+        cartas = CanonizadorTest.maos_aleatorias(5000, 2)
+        classes, naipes, posicoes = canonizador.canonizar_lote(cartas)
+        for i, codigos in enumerate(cartas.tolist()):
+            self.assertEqual(canonizador.canonizar(codigos), (classes[i], tuple(naipes[i].tolist()), tuple(posicoes[i].tolist())))
+
+
+if __name__ == '__main__':
+    unittest.main()
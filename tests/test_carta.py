@@ -1,3 +1,5 @@
+import copy
+import pickle
 import unittest
 
 from poker.carta import Carta
@@ -148,6 +150,24 @@ class CartaTest(unittest.TestCase):
         self.assertEqual(3, Carta('K', 'paus').indice_naipe)
         self.assertEqual(0, Carta('A', 'ouros').indice_naipe)
 
+    def test_cada_carta_deve_ser_uma_unica_instancia(self):
+        for codigo in range(52):
+            carta = Carta.from_codigo(codigo)
+            with self.subTest(f'test_{carta}_deve_ser_compartilhada'):
+                self.assertIs(carta, Carta(carta.valor, carta.naipe))
+                self.assertIs(carta, Carta.of(carta.valor, carta.naipe))
+                self.assertIs(carta, copy.deepcopy(carta))
+                self.assertIs(carta, pickle.loads(pickle.dumps(carta)))
+                self.assertEqual(codigo, carta.codigo)
+        with self.assertRaises(AttributeError):
+            setattr(Carta(2, 'ouros'), 'cor', 'vermelha')
+
+    def test_lista_de_cartas_a_partir_de_texto_nao_deve_alterar_o_cache(self):
+        cartas = Carta.get_cartas('AcAo9e8p7o')
+        cartas.append(Carta(2, 'ouros'))
+        self.assertEqual(5, len(Carta.get_cartas('AcAo9e8p7o')))
+        self.assertIs(Carta.get_cartas('AcAo9e8p7o')[0], Carta('A', 'copas'))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+
+import numpy as np
+
+from poker.avaliador_lote import AvaliadorLote
+from poker.carta import Carta
+from poker.conjunto_cartas import ConjuntoCartas
+from poker.estrategias_troca.codificadores_estado import CODIFICADORES, CodificadorCategoria, criar_codificador
+from poker.mao import Mao
+from poker.simulacao_lote import SimulacaoLote
+
+
+class CodificadoresEstadoTest(unittest.TestCase):
+
+    def test_codificacao_em_lote_deve_ser_igual_a_de_cada_mao(self):
+        cartas = AvaliadorLote.ordenar(SimulacaoLote(1).distribuir(3000, Mao.TAMANHO))
+        ranks, _ = AvaliadorLote.padrao().avaliar(cartas)
+        for nome in CODIFICADORES:
+            with self.subTest(f'test_codificador_{nome}'):
+                codificador = criar_codificador(nome)
+                lote = codificador.codificar_lote(cartas, ranks)
+                um_a_um = [codificador.codificar(Mao(ConjuntoCartas.from_codigos(codigos))) for codigos in cartas.tolist()]
+                self.assertEqual(um_a_um, lote.tolist())
+                self.assertTrue(((lote >= 0) & (lote < codificador.quantidade)).all())
+
+    def test_categoria_deve_separar_maos_do_mesmo_rank(self):
+        codificador = CodificadorCategoria()
+        estados = {texto: codificador.codificar(Mao(Carta.get_cartas(texto))) for texto in [
+            'AcAo9e8p7o',  # par de ases
+            '2c2o9e8p7o',  # par de dois
+            'KoJo9o7o2e',  # quatro cartas de ouros
+            'KoJe9o7c2p',  # sem projeto
+            '9e8p7o6cKo',  # 4 valores de uma sequência
+            '9o8o7o6oKe',  # projetos de sequência e de flush ao mesmo tempo
+        ]}
+        self.assertEqual(len(estados), len(set(estados.values())))
+        projetos = {texto: estado % CodificadorCategoria.N_PROJETOS for texto, estado in estados.items()}
+        self.assertEqual({'AcAo9e8p7o': 0, '2c2o9e8p7o': 0, 'KoJo9o7o2e': 1, 'KoJe9o7c2p': 0, '9e8p7o6cKo': 2, '9o8o7o6oKe': 3}, projetos)
+        # 4 valores do wheel também são projeto de sequência: o mesmo estado de K-9-8-7-6
+        self.assertEqual(estados['9e8p7o6cKo'], codificador.codificar(Mao(Carta.get_cartas('5e4p3o2cKo'))))
+
+    def test_codificador_desconhecido(self):
+        with self.assertRaises(ValueError):
+            criar_codificador('naipes')
+
+    def test_rank_deve_manter_o_espaco_de_estados_original(self):
+        codificador = criar_codificador('rank')
+        self.assertEqual(len(Mao.TIPOS), codificador.quantidade)
+        ranks = np.arange(len(Mao.TIPOS))
+        self.assertTrue(np.array_equal(ranks, codificador.codificar_lote(np.zeros((len(ranks), Mao.TAMANHO)), ranks)))
+
+
+if __name__ == '__main__':
+    unittest.main()
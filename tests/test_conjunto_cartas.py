@@ -0,0 +1,83 @@
+import unittest
+
+from poker.carta import Carta
+from poker.conjunto_cartas import ConjuntoCartas
+
+
+class ConjuntoCartasTest(unittest.TestCase):
+
+    def test_quero_poder_converter_de_e_para_cartas(self):
+        cartas = Carta.get_cartas('AeJc10e6e5o')
+        conjunto = ConjuntoCartas.from_cartas(cartas)
+        self.assertEqual(5, len(conjunto))
+        self.assertEqual(sorted(c.codigo for c in cartas), conjunto.codigos)
+        self.assertEqual(sorted(cartas, key=lambda c: c.codigo), conjunto.cartas)
+        self.assertEqual(conjunto, ConjuntoCartas.from_texto('5o6eJc10eAe'))
+
+    def test_codigo_de_cada_carta_deve_seguir_a_ordem_do_baralho_novo(self):
+        codigo = 0
+        for naipe in Carta.NAIPES:
+            for valor in Carta.VALORES:
+                with self.subTest(f'test_codigo_{valor}_de_{naipe}_deve_ser_{codigo}'):
+                    carta = Carta(valor, naipe)
+                    self.assertEqual(codigo, carta.codigo)
+                    self.assertEqual(carta, Carta.from_codigo(codigo))
+                codigo += 1
+
+    def test_baralho_deve_ter_52_cartas(self):
+        baralho = ConjuntoCartas.baralho()
+        self.assertEqual(52, len(baralho))
+        self.assertEqual(list(range(52)), baralho.codigos)
+
+    def test_quero_poder_descartar_e_comprar_cartas(self):
+        mao = ConjuntoCartas.from_texto('6o5o4o3o2o')
+        descarte = ConjuntoCartas.from_texto('6o2o')
+        compra = ConjuntoCartas.from_texto('KpQp')
+        nova_mao = (mao - descarte) | compra
+        self.assertEqual(ConjuntoCartas.from_texto('KpQp5o4o3o'), nova_mao)
+        self.assertEqual(3, len(mao & nova_mao))
+        self.assertIn(Carta('K', 'paus').codigo, nova_mao)
+        self.assertNotIn(Carta(6, 'ouros').codigo, nova_mao)
+
+    def test_quero_saber_os_valores_de_cada_naipe(self):
+        conjunto = ConjuntoCartas.from_texto('2o3oAoKp')
+        self.assertEqual(0b1000000000011, conjunto.naipe(Carta.NAIPES.index('ouros')))
+        self.assertEqual(0b0100000000000, conjunto.naipe(Carta.NAIPES.index('paus')))
+        self.assertEqual(0, conjunto.naipe(Carta.NAIPES.index('copas')))
+        self.assertEqual(0b1100000000011, conjunto.valores())
+
+    def test_quero_saber_se_tem_flush_ou_sequencia(self):
+        testes = [
+            ['10eJeQeKeAe', True, True, True],
+            ['Ae2e3e4e5e', True, True, True],
+            ['2o7o9oJoKo', True, False, False],
+            ['Ae2o3p4c5e', False, True, False],
+            ['10eJeQeKeAc', False, True, False],
+            ['QoKoAo2o3o', True, False, False],
+            ['5o6e10eJcAe', False, False, False],
+            ['2o3o4o5o6o7p8p', True, True, True],
+            ['2o3o4o5o7o6p', True, True, False]
+        ]
+        for texto, flush, sequencia, straight_flush in testes:
+            with self.subTest(f'test_{texto}_flush_{flush}_sequencia_{sequencia}'):
+                conjunto = ConjuntoCartas.from_texto(texto)
+                self.assertEqual(flush, conjunto.tem_flush())
+                self.assertEqual(sequencia, conjunto.tem_sequencia())
+                self.assertEqual(straight_flush, conjunto.tem_straight_flush())
+
+    def test_quero_saber_a_maior_carta_da_maior_sequencia(self):
+        testes = [
+            ['Ae2o3p4c5e', 3],
+            ['2o3p4c5e6c', 4],
+            ['10eJeQeKeAc', 12],
+            ['Ae2o3p4c5e6c7o', 5],
+            ['QoKoAo2o3o', None]
+        ]
+        for texto, maior in testes:
+            with self.subTest(f'test_maior_sequencia_de_{texto}_deve_ser_{maior}'):
+                conjunto = ConjuntoCartas.from_texto(texto)
+                self.assertEqual(maior, ConjuntoCartas.maior_sequencia(conjunto.valores()))
+
+
+if __name__ == '__main__':
+    unittest.main()
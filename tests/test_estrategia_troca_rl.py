@@ -0,0 +1,202 @@
+import json
+import os
+import pickle
+import tempfile
+import unittest
+
+import numpy as np
+
+import treina_estrategia_troca_rl
+from poker.aleatorio import FonteAleatoria
+from poker.avaliador import Avaliador
+from poker.avaliador_lote import AvaliadorLote
+from poker.baralho import Baralho
+from poker.carta import Carta
+from poker.estrategias_troca.codificadores_estado import CodificadorCategoria, CodificadorForca
+from poker.estrategias_troca.estrategia_troca_rl import EstrategiaTrocaRL
+from poker.mao import Mao
+from poker.simulacao_lote import SimulacaoLote
+
+
+class EstrategiaTrocaRLTest(unittest.TestCase):
+
+    def test_registrar_resultados_em_lote_deve_ser_igual_a_registrar_um_a_um_dentro_dos_limites(self):
+        um_a_um = EstrategiaTrocaRL()
+        um_a_um.tabela[:] = 100
+        lote = EstrategiaTrocaRL()
+        lote.tabela[:] = 100
+        gerador = np.random.default_rng(1)
+        ranks = gerador.integers(len(Mao.TIPOS), size=500)
+        trocas = gerador.integers(2 ** Mao.TAMANHO, size=500)
+        recompensas = gerador.choice([2, -1, 1], size=500)
+        for rank, troca, recompensa in zip(ranks, trocas, recompensas):
+            um_a_um.registrar_resultado(rank, Mao.trocas_to_indices(int(troca)), recompensa)
+        lote.registrar_resultados(ranks, trocas, recompensas)
+        self.assertTrue(np.array_equal(um_a_um.tabela, lote.tabela))
+
+    def test_registrar_resultados_deve_somar_a_mesma_celula_antes_de_limitar(self):
+        estrategia = EstrategiaTrocaRL()
+        estrategia.tabela[:] = EstrategiaTrocaRL.MAX - 1
+        estrategia.tabela[0, 1] = EstrategiaTrocaRL.MIN + 1
+        estrategia.registrar_resultados([0, 0, 0, 0, 0, 0], [0, 0, 0, 1, 1, 1], [2, 2, -1, -1, -1, 2])
+        self.assertEqual(EstrategiaTrocaRL.MAX, estrategia.tabela[0, 0])  # MAX - 1 + 3, limitado a MAX
+        self.assertEqual(EstrategiaTrocaRL.MIN + 1, estrategia.tabela[0, 1])  # as recompensas se anulam
+        self.assertEqual(EstrategiaTrocaRL.MAX - 1, estrategia.tabela[0, 2])  # célula sem recompensas
+
+        estrategia.registrar_resultados([0], [1], [-5])
+        self.assertEqual(EstrategiaTrocaRL.MIN, estrategia.tabela[0, 1])
+
+    def test_sorteios_devem_seguir_os_pesos_da_linha(self):
+        estrategia = EstrategiaTrocaRL('tabela-treinamento-1-279.csv', aleatorio=8)
+        mao = Mao(Carta.get_cartas('AcAo9e8p7o'))
+        probabilidades = estrategia.tabela[mao.rank] / estrategia.tabela[mao.rank].sum()
+        n = 100_000
+        um_a_um = np.bincount([int(estrategia.obter_indices_de_troca(mao), 2) for _ in range(n)], minlength=32) / n
+        lote = np.bincount(estrategia.amostrar_lote(np.full(n, mao.rank)), minlength=32) / n
+        for nome, frequencias in [('um_a_um', um_a_um), ('lote', lote)]:
+            with self.subTest(f'test_frequencias_{nome}'):
+                # 5 desvios-padrão de uma binomial com n sorteios
+                self.assertTrue(np.all(np.abs(frequencias - probabilidades) <= 5 * np.sqrt(probabilidades * (1 - probabilidades) / n)))
+
+    def test_sorteios_devem_acompanhar_as_alteracoes_da_tabela(self):
+        estrategia = EstrategiaTrocaRL(aleatorio=9)
+        estrategia.tabela[:] = EstrategiaTrocaRL.MIN
+        estrategia.invalidar_cache()
+        mao = Mao(Carta.get_cartas('AcAo9e8p7o'))
+        estrategia.obter_indices_de_troca(mao)  # preenche o cache das duas formas de sorteio
+        estrategia.amostrar_lote([mao.rank])
+        estrategia.registrar_resultados([mao.rank], [5], [10_000])  # peso limitado a MAX: 279 / 310 de probabilidade
+        self.assertGreater(np.mean(estrategia.amostrar_lote(np.full(1000, mao.rank)) == 5), 0.85)
+        self.assertGreater(np.mean([estrategia.obter_indices_de_troca(mao) == '00101' for _ in range(1000)]), 0.85)
+
+        for _ in range(10):
+            estrategia.registrar_resultado(mao.rank, '00110', 1)
+        self.assertEqual(EstrategiaTrocaRL.MIN + 10, estrategia.tabela[mao.rank, 6])
+        # 11 / 320 com o cache refeito; 1 / 310 se o cache antigo continuasse em uso
+        self.assertGreater(np.mean([estrategia.obter_indices_de_troca(mao) == '00110' for _ in range(5000)]), 0.02)
+
+    def test_checkpoint_deve_guardar_tabela_limites_e_metadados(self):
+        estrategia = EstrategiaTrocaRL(minimo=1, maximo=5000)
+        estrategia.tabela[0, 0] = 5000
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = os.path.join(diretorio, 'tabela.npz')
+            estrategia.salvar(caminho, episodio=1234)
+            self.assertEqual(['tabela.npz'], os.listdir(diretorio))
+            carregada = EstrategiaTrocaRL()
+            metadados = carregada.carregar(caminho)
+        self.assertEqual({'episodio': 1234}, metadados)
+        self.assertEqual(estrategia.tabela.dtype, carregada.tabela.dtype)
+        self.assertTrue(np.array_equal(estrategia.tabela, carregada.tabela))
+        self.assertEqual((1, 5000), (carregada.minimo, carregada.maximo))
+
+    def test_tabela_csv_deve_ser_carregada_como_inteiros(self):
+        estrategia = EstrategiaTrocaRL('tabela-treinamento-1-279.csv')
+        self.assertTrue(np.issubdtype(estrategia.tabela.dtype, np.integer))
+        self.assertEqual((len(Mao.TIPOS), 2 ** Mao.TAMANHO), estrategia.tabela.shape)
+
+    def test_tabela_acima_do_maximo_deve_alargar_o_maximo_nas_duas_formas_de_registro(self):
+        with tempfile.TemporaryDirectory() as diretorio:
+            mapeada = os.path.join(diretorio, 'tabela.npy')
+            EstrategiaTrocaRL('tabela-treinamento-1-5000.csv').salvar(mapeada)
+            for caminho in ['tabela-treinamento-1-5000.csv', mapeada]:
+                for registro in ['registrar_resultado', 'registrar_resultados']:
+                    with self.subTest(f'test_{os.path.basename(caminho)}_{registro}'):
+                        estrategia = EstrategiaTrocaRL(caminho)
+                        self.assertEqual(5000, estrategia.tabela[0, 0])
+                        if registro == 'registrar_resultado':
+                            estrategia.registrar_resultado(0, '00000', -1)
+                            estrategia.registrar_resultado(0, '00001', 1)
+                        else:
+                            estrategia.registrar_resultados([0, 0], [0, 1], [-1, 1])
+                        self.assertEqual(5000, estrategia.maximo)
+                        self.assertEqual([4999, 5000], estrategia.tabela[0, :2].tolist())  # nem cortados em 279, nem acima do máximo
+
+    def test_nao_deve_carregar_checkpoint_de_versao_futura(self):
+        estrategia = EstrategiaTrocaRL()
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = os.path.join(diretorio, 'tabela.npz')
+            estrategia.salvar(caminho)
+            with np.load(caminho) as dados:
+                conteudo = dict(dados)
+            conteudo['versao'] = np.int64(EstrategiaTrocaRL.VERSAO_CHECKPOINT + 1)
+            np.savez(caminho, **conteudo)
+            with self.assertRaises(ValueError):
+                estrategia.carregar(caminho)
+
+    def test_estado_aleatorio_salvo_deve_reproduzir_os_sorteios(self):
+        simulacao, estrategia = FonteAleatoria(7).dividir(2)
+        estrategia.uniforme()  # deixa parte da reserva de sorteios escalares por usar
+        estado = json.loads(json.dumps(treina_estrategia_troca_rl.estado_aleatorio(simulacao, estrategia)))
+        esperado = (simulacao.gerador.random(3).tolist(), [estrategia.uniforme() for _ in range(100)])
+        simulacao.gerador.random(10)
+        estrategia.uniforme()
+        treina_estrategia_troca_rl.restaura_estado_aleatorio(estado, simulacao, estrategia)
+        self.assertEqual(esperado, (simulacao.gerador.random(3).tolist(), [estrategia.uniforme() for _ in range(100)]))
+
+    def test_tabela_deve_usar_o_menor_tipo_sem_sinal_e_so_sortear_linhas_visitadas(self):
+        for maximo, dtype in [(200, np.uint8), (EstrategiaTrocaRL.MAX, np.uint16), (100_000, np.uint32)]:
+            with self.subTest(f'test_maximo_{maximo}'):
+                self.assertEqual(dtype, EstrategiaTrocaRL(maximo=maximo).tabela.dtype)
+        estrategia = EstrategiaTrocaRL(aleatorio=3, codificador=CodificadorForca())
+        self.assertEqual((Avaliador.N_CLASSES, 2 ** Mao.TAMANHO), estrategia.tabela.shape)
+        self.assertFalse(estrategia.tabela.any())
+        mao = Mao(Carta.get_cartas('AcAo9e8p7o'))
+        estrategia.obter_trocas(mao)
+        estrategia.amostrar_lote([0, 0, 1])
+        visitadas = estrategia.tabela.any(axis=1)
+        self.assertEqual([0, 1, mao.forca], np.flatnonzero(visitadas).tolist())
+        self.assertTrue(((estrategia.tabela[visitadas] >= EstrategiaTrocaRL.MIN) & (estrategia.tabela[visitadas] < EstrategiaTrocaRL.MAX)).all())
+
+    def test_limites_invalidos(self):
+        for minimo, maximo in [(0, 279), (10, 10), (-1, 5)]:
+            with self.subTest(f'test_limites_{minimo}_{maximo}'):
+                with self.assertRaises(ValueError):
+                    EstrategiaTrocaRL(minimo=minimo, maximo=maximo)
+
+    def test_tabela_npy_deve_ser_mapeada_sem_copia_e_compartilhada_pelo_arquivo(self):
+        estrategia = EstrategiaTrocaRL(aleatorio=4, codificador=CodificadorCategoria())
+        estrategia.amostrar_lote(np.arange(0, CodificadorCategoria.quantidade, 7))
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = os.path.join(diretorio, 'tabela.npy')
+            estrategia.salvar(caminho)
+            mapeada = EstrategiaTrocaRL(caminho, codificador=CodificadorCategoria(), aleatorio=5)
+            self.assertIsInstance(mapeada.tabela, np.memmap)
+            self.assertTrue(np.array_equal(estrategia.tabela, mapeada.tabela))
+
+            serializada = pickle.dumps(mapeada)
+            self.assertLess(len(serializada), estrategia.tabela.nbytes)  # só o caminho do arquivo vai junto
+            copia = pickle.loads(serializada)
+            self.assertTrue(np.array_equal(estrategia.tabela, copia.tabela))
+
+            # linhas não visitadas sorteiam sem gravar; a primeira alteração copia a tabela e não toca o arquivo
+            mapeada.amostrar_lote(np.arange(CodificadorCategoria.quantidade))
+            mapeada.registrar_resultado(0, 3, 1)
+            self.assertNotIsInstance(mapeada.tabela, np.memmap)
+            self.assertEqual(estrategia.tabela[0, 3] + 1, mapeada.tabela[0, 3])
+            self.assertTrue(np.array_equal(estrategia.tabela, np.load(caminho)))
+            del mapeada, copia
+
+    def test_checkpoint_de_outro_codificador_ou_formato_deve_ser_recusado(self):
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = os.path.join(diretorio, 'tabela.npz')
+            EstrategiaTrocaRL(codificador=CodificadorCategoria()).salvar(caminho)
+            with self.assertRaises(ValueError):
+                EstrategiaTrocaRL().carregar(caminho)
+            with self.assertRaises(ValueError):
+                EstrategiaTrocaRL('tabela-treinamento-1-279.csv', codificador=CodificadorCategoria())
+
+    def test_treinamento_deve_registrar_no_estado_da_mao(self):
+        estrategia = EstrategiaTrocaRL(aleatorio=6, codificador=CodificadorCategoria())
+        treina_estrategia_troca_rl.treinamento(estrategia, 'AcAo9e8p7o', Baralho(aleatorio=7))
+        estado = CodificadorCategoria().codificar(Mao(Carta.get_cartas('AcAo9e8p7o')))
+        self.assertEqual([estado], np.flatnonzero(estrategia.tabela.any(axis=1)).tolist())
+
+        simulacao = SimulacaoLote(8)
+        maos = np.array([[c.codigo for c in Carta.get_cartas(cartas)] for cartas in treina_estrategia_troca_rl.TIPOS])
+        treina_estrategia_troca_rl.treinamento_lote(estrategia, maos, simulacao)
+        estados = CodificadorCategoria().codificar_lote(AvaliadorLote.ordenar(maos), AvaliadorLote.padrao().avaliar(maos)[0])
+        self.assertEqual(sorted(set(estados.tolist()) | {estado}), np.flatnonzero(estrategia.tabela.any(axis=1)).tolist())
+
+
+if __name__ == '__main__':
+    unittest.main()
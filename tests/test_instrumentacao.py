@@ -0,0 +1,94 @@
+import inspect
+import json
+import os
+import tempfile
+import unittest
+
+import treina_estrategia_troca_rl
+from poker.baralho import Baralho
+from poker.estrategias_troca.estrategia_troca_randomica import EstrategiaTrocaRandomica
+from poker.estrategias_troca.estrategia_troca_rl import EstrategiaTrocaRL
+from poker.instrumentacao import INSTRUMENTACAO_NULA, Instrumentacao, InstrumentacaoNula
+from poker.jogador import Jogador
+from poker.jogo import Jogo
+
+
+class RelogioFalso:
+
+    def __init__(self):
+        self.agora = 0.0
+
+    def __call__(self):
+        return self.agora
+
+
+class InstrumentacaoTest(unittest.TestCase):
+
+    def test_fases_devem_acumular_tempo_e_chamadas(self):
+        relogio = RelogioFalso()
+        instrumentacao = Instrumentacao(relogio=relogio)
+        for duracao in [1.0, 2.0]:
+            with instrumentacao.fase('decisao'):
+                relogio.agora += duracao
+        instrumentacao.contar('cartas_trocadas', 3)
+        instrumentacao.concluir_episodio(2)
+        resumo = instrumentacao.resumo()
+        self.assertEqual({'decisao': {'segundos': 3.0, 'chamadas': 2}}, resumo['fases'])
+        self.assertEqual({'cartas_trocadas': 3}, resumo['contadores'])
+        self.assertEqual(2, resumo['episodios'])
+        self.assertAlmostEqual(2 / 3, resumo['episodios_por_segundo'])
+
+    def test_metricas_devem_ser_gravadas_a_cada_intervalo(self):
+        relogio = RelogioFalso()
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = os.path.join(diretorio, 'metricas.jsonl')
+            instrumentacao = Instrumentacao(caminho, intervalo_metricas=10.0, relogio=relogio)
+            for _ in range(25):
+                relogio.agora += 1.0
+                instrumentacao.concluir_episodio(100)
+            instrumentacao.fechar()
+            with open(caminho, encoding='utf-8') as arquivo:
+                linhas = [json.loads(linha) for linha in arquivo]
+        self.assertEqual([1000, 2000, 2500], [linha['episodios'] for linha in linhas])
+        self.assertEqual([100.0, 100.0, 100.0], [linha['episodios_por_segundo_recente'] for linha in linhas])
+
+    def test_captura_deve_gravar_o_perfil_ao_fim_da_janela(self):
+        with tempfile.TemporaryDirectory() as diretorio:
+            prefixo = os.path.join(diretorio, 'perfil')
+            instrumentacao = Instrumentacao()
+            instrumentacao.capturar(20, prefixo, memoria=True)
+            estrategia = EstrategiaTrocaRL()
+            baralho = Baralho()
+            for episodio in range(20):
+                self.assertEqual([], os.listdir(diretorio))
+                for cartas in treina_estrategia_troca_rl.TIPOS:  # um episódio de treinamento, como em main
+                    treina_estrategia_troca_rl.treinamento(estrategia, cartas, baralho, instrumentacao)
+                instrumentacao.concluir_episodio()
+                self.assertEqual(episodio + 1, instrumentacao.episodios)
+            self.assertEqual(['perfil.memoria.txt', 'perfil.prof'], sorted(os.listdir(diretorio)))
+        resumo = instrumentacao.resumo()
+        self.assertEqual(20, resumo['episodios'])
+        self.assertEqual({'distribuicao', 'decisao', 'troca', 'atualizacao'}, set(resumo['fases']))
+        self.assertEqual(20 * len(treina_estrategia_troca_rl.TIPOS), resumo['fases']['distribuicao']['chamadas'])
+
+    def test_jogo_deve_medir_suas_fases(self):
+        instrumentacao = Instrumentacao()
+        for _ in range(3):
+            Jogo([Jogador('Alice', EstrategiaTrocaRandomica()), Jogador('Bob', EstrategiaTrocaRandomica())], instrumentacao=instrumentacao).jogar()
+        resumo = instrumentacao.resumo()
+        self.assertEqual(3, resumo['episodios'])
+        self.assertEqual(6, resumo['fases']['apostas']['chamadas'])
+        self.assertEqual({'distribuicao', 'apostas', 'troca', 'showdown'}, set(resumo['fases']))
+
+    def test_instrumentacao_nula_deve_ter_a_mesma_interface(self):
+        for nome, metodo in inspect.getmembers(Instrumentacao, inspect.isfunction):
+            if not nome.startswith('_'):
+                with self.subTest(f'test_metodo_{nome}'):
+                    self.assertEqual(inspect.signature(metodo), inspect.signature(getattr(InstrumentacaoNula, nome)))
+        with INSTRUMENTACAO_NULA.fase('qualquer'):
+            INSTRUMENTACAO_NULA.concluir_episodio()
+        self.assertEqual({}, INSTRUMENTACAO_NULA.resumo())
+
+
+if __name__ == '__main__':
+    unittest.main()
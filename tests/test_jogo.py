@@ -0,0 +1,77 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+
+from poker.estrategias_troca.estrategia_troca_randomica import EstrategiaTrocaRandomica
+from poker.eventos_jogo import Aposta, CartasDistribuidas, CartasMostradas, InicioFase, ObservadorConsole, ObservadorJogo, Resultado, Troca
+from poker.jogador import Jogador
+from poker.jogo import Jogo
+
+
+class ObservadorGravador(ObservadorJogo):
+
+    def __init__(self):
+        self.eventos = []
+
+    def notificar(self, evento):
+        self.eventos.append(evento)
+
+
+class JogoTest(unittest.TestCase):
+
+    @staticmethod
+    def novo_jogo(observadores=None):
+        return Jogo([Jogador('Alice', EstrategiaTrocaRandomica()), Jogador('Bob', EstrategiaTrocaRandomica())], observadores)
+
+    def test_quero_receber_os_eventos_do_jogo_em_ordem(self):
+        gravador = ObservadorGravador()
+        jogo = JogoTest.novo_jogo([gravador])
+        ganhadores = jogo.jogar()
+        alice, bob = jogo.jogadores
+        tipos = [(type(evento), getattr(evento, 'jogador', None)) for evento in gravador.eventos]
+        self.assertEqual([
+            (InicioFase, None), (CartasDistribuidas, alice), (CartasDistribuidas, bob),
+            (InicioFase, None), (Aposta, alice), (Aposta, bob),
+            (InicioFase, None), (Troca, alice), (Troca, bob),
+            (InicioFase, None), (Aposta, alice), (Aposta, bob),
+            (InicioFase, None), (CartasMostradas, alice), (CartasMostradas, bob),
+            (Resultado, None)
+        ], tipos)
+        self.assertEqual([1, 1, 2, 2], [evento.rodada for evento in gravador.eventos if isinstance(evento, Aposta)])
+        self.assertEqual(ganhadores, gravador.eventos[-1].ganhadores)
+
+    def test_console_deve_imprimir_o_andamento_do_jogo(self):
+        saida = io.StringIO()
+        with redirect_stdout(saida):
+            jogo = JogoTest.novo_jogo([ObservadorConsole()])
+            ganhadores = jogo.jogar()
+        alice, bob = jogo.jogadores
+        linhas = saida.getvalue().splitlines()
+        self.assertEqual(['== Distribuindo cartas ==', '== 1a rodada de apostas ==', '* Alice apostou.', '* Bob apostou.', '== Troca de cartas =='], linhas[:5])
+        self.assertRegex(linhas[5], r'^\* Alice trocou [0-5] cartas\.$')
+        self.assertRegex(linhas[6], r'^\* Bob trocou [0-5] cartas\.$')
+        self.assertEqual(['== 2a rodada de apostas ==', '* Alice apostou.', '* Bob apostou.', '== Mostrando as cartas ==',
+                          f'* Alice tem {alice.cartas}.', f'* Bob tem {bob.cartas}.'], linhas[7:13])
+        if len(ganhadores) == 1:
+            self.assertEqual(['== Ganhador ==', f'* {ganhadores[0].nome} ganhou com {ganhadores[0].mao.tipo}.'], linhas[13:])
+        else:
+            self.assertEqual(['== Empate ==', f'* Houve empate entre Alice, Bob com {alice.mao.tipo}.'], linhas[13:])
+
+    def test_sem_observadores_nada_deve_ser_impresso(self):
+        saida = io.StringIO()
+        with redirect_stdout(saida):
+            for _ in range(100):
+                ganhadores = JogoTest.novo_jogo().jogar()
+                self.assertTrue(1 <= len(ganhadores) <= 2)
+        self.assertEqual('', saida.getvalue())
+
+    def test_empate_deve_considerar_os_desempates(self):
+        for _ in range(200):
+            jogadores = [Jogador(nome, EstrategiaTrocaRandomica()) for nome in ['Alice', 'Bob', 'Carol']]
+            ganhadores = Jogo(jogadores).jogar()
+            melhor = max(jogador.mao.forca for jogador in jogadores)
+            self.assertEqual([jogador for jogador in jogadores if jogador.mao.forca == melhor], ganhadores)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -249,6 +249,20 @@ class MaoTest(unittest.TestCase):
                 mao.trocar(quais, Carta.get_cartas(novas_cartas))
                 self.assertEqual(expected, str(mao))
                 self.assertEqual(Mao.TAMANHO, len(mao.cartas))  # sanity_check: conjunto (set) final de cartas deve ter tamanho Mao.TAMANHO
+            with self.subTest(f'test_{cartas_iniciais}_ao_trocar_a_mascara_{int(quais, 2)}_deve_mudar_para_{expected}'):
+                mao = Mao(Carta.get_cartas(cartas_iniciais))
+                mao.trocar(int(quais, 2), Carta.get_cartas(novas_cartas))
+                self.assertEqual(expected, str(mao))
+
+    def test_rank_e_forca_devem_ser_recalculados_apos_a_troca(self):
+        mao = Mao(Carta.get_cartas('6o5o4o3o2o'))
+        self.assertEqual('straight flush', mao.tipo)
+        forca_anterior = mao.forca
+        mao.trocar('00001', Carta.get_cartas('6p'))
+        self.assertEqual('um par', mao.tipo)
+        self.assertEqual(1, mao.rank)
+        self.assertLess(mao.forca, forca_anterior)
+        self.assertEqual('6p6o5o4o3o', str(mao))
 
     def test_checa_a_sanidade_na_troca_de_cartas(self):
         cartas_iniciais = '6o5o4o3o2o'
@@ -0,0 +1,44 @@
+import unittest
+
+import numpy as np
+
+from poker import mascaras
+from poker.carta import Carta
+from poker.estrategias_troca.estrategia_troca_randomica import EstrategiaTrocaRandomica
+from poker.jogador import Jogador
+from poker.mao import Mao
+
+
+class MascarasTest(unittest.TestCase):
+
+    def test_mascara_e_texto_devem_selecionar_as_mesmas_cartas(self):
+        cartas = list('abcde')
+        for mascara in range(mascaras.N_MASCARAS):
+            texto = Mao.trocas_to_indices(mascara)
+            with self.subTest(f'test_mascara_{texto}'):
+                self.assertEqual(mascara, mascaras.normalizar(texto))
+                self.assertEqual([c for c, b in zip(cartas, texto) if b == '1'], mascaras.selecionar(cartas, mascara))
+                self.assertEqual([c for c, b in zip(cartas, texto) if b == '0'], mascaras.manter(cartas, mascara))
+                self.assertEqual(texto.count('1'), mascaras.contar(mascara))
+                self.assertEqual(texto.count('1'), Mao.quantos_uns(mascara))
+
+    def test_deve_rejeitar_mascaras_invalidas(self):
+        for mascara in [-1, 32, '0101', '010110']:
+            with self.subTest(f'test_mascara_{mascara}'):
+                with self.assertRaises(ValueError):
+                    mascaras.normalizar(mascara)
+        self.assertEqual(5, mascaras.normalizar(np.int64(5)))
+
+    def test_jogador_deve_decidir_e_trocar_com_mascaras(self):
+        jogador = Jogador('Teste', EstrategiaTrocaRandomica())
+        jogador.receber(Carta.get_cartas('6o5o4o3o2o'))
+        descartadas = jogador.decidir_trocas()
+        self.assertIsInstance(jogador.trocas, int)
+        self.assertEqual(Mao.trocas_to_indices(jogador.trocas), jogador.indices)
+        self.assertEqual(mascaras.contar(jogador.trocas), len(descartadas))
+        jogador.receber(Carta.get_cartas('KpQpJp9p8p')[:len(descartadas)])
+        self.assertEqual(0, len(jogador.mao.conjunto & descartadas))
+
+
+if __name__ == '__main__':
+    unittest.main()
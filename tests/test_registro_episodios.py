@@ -0,0 +1,140 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+import compara_estrategias_troca
+import treina_estrategia_troca_rl
+from poker.conjunto_cartas import ConjuntoCartas
+from poker.estrategias_troca.codificadores_estado import CodificadorCategoria
+from poker.estrategias_troca.estrategia_troca_randomica import EstrategiaTrocaRandomica
+from poker.estrategias_troca.estrategia_troca_rl import EstrategiaTrocaRL
+from poker.mao import Mao
+from poker.registro_episodios import REGISTRO, RegistroEpisodios, ler_episodios, recompensas_por_rank, reproduzir
+from poker.simulacao_lote import SimulacaoLote
+
+
+class RegistroEpisodiosTest(unittest.TestCase):
+
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.caminho = os.path.join(self.diretorio.name, 'episodios.bin')
+
+    def tearDown(self):
+        self.diretorio.cleanup()
+
+    def test_episodios_em_lote_devem_ser_lidos_de_volta(self):
+        episodios = SimulacaoLote(1).jogar(EstrategiaTrocaRandomica(), 1000)
+        with RegistroEpisodios(self.caminho) as registro:
+            registro.gravar_lote(episodios)
+            self.assertEqual(1000, registro.quantidade)
+        registros, metadados = ler_episodios(self.caminho)
+        self.assertEqual('rank', metadados['codificador'])
+        self.assertEqual(RegistroEpisodios.TAMANHO_CABECALHO + 1000 * REGISTRO.itemsize, os.path.getsize(self.caminho))
+        self.assertTrue(np.array_equal(episodios.cartas, registros['cartas']))
+        self.assertTrue(np.array_equal(episodios.cartas_finais, registros['cartas_finais']))
+        self.assertTrue(np.array_equal(episodios.trocas, registros['trocas']))
+        self.assertTrue(np.array_equal(episodios.ranks_antes, registros['estado']))
+        self.assertTrue(np.array_equal(episodios.ranks_depois, registros['rank_depois']))
+        for registro in registros[:50]:
+            self.assertEqual(Mao(ConjuntoCartas.from_codigos(registro['cartas'].tolist())).forca, registro['forca_antes'])
+            self.assertEqual(Mao(ConjuntoCartas.from_codigos(registro['cartas_finais'].tolist())).forca, registro['forca_depois'])
+
+    def test_episodios_um_a_um_devem_concordar_com_mao(self):
+        with RegistroEpisodios(self.caminho) as registro:
+            compara_estrategias_troca.testa_estrategia(300, EstrategiaTrocaRandomica(aleatorio=2), aleatorio=3, registro=registro)
+        registros, _ = ler_episodios(self.caminho)
+        self.assertEqual(300, len(registros))
+        for registro in registros:
+            mao = Mao(ConjuntoCartas.from_codigos(registro['cartas'].tolist()))
+            self.assertEqual([c.codigo for c in mao.cartas], registro['cartas'].tolist())
+            self.assertEqual((mao.rank, mao.rank), (registro['estado'], registro['rank_antes']))
+            mantidas = mao.conjunto - mao.conjunto_from_indices(int(registro['trocas']))
+            final = ConjuntoCartas.from_codigos(registro['cartas_finais'].tolist())
+            self.assertEqual(mantidas, mantidas & final)
+
+    def test_arquivo_existente_deve_receber_os_episodios_no_fim(self):
+        simulacao = SimulacaoLote(4)
+        with RegistroEpisodios(self.caminho) as registro:
+            registro.gravar_lote(simulacao.jogar(EstrategiaTrocaRandomica(), 100))
+        with open(self.caminho, 'ab') as arquivo:
+            arquivo.write(b'\x01' * 7)  # registro pela metade, de uma gravação interrompida
+        with RegistroEpisodios(self.caminho) as registro:
+            self.assertEqual(100, registro.quantidade)
+            registro.gravar_lote(simulacao.jogar(EstrategiaTrocaRandomica(), 2 * RegistroEpisodios.TAMANHO_BUFFER + 5))
+        self.assertEqual(2 * RegistroEpisodios.TAMANHO_BUFFER + 105, len(ler_episodios(self.caminho)[0]))
+        with RegistroEpisodios(self.caminho, quantidade=60) as registro:  # como ao retomar de um checkpoint
+            self.assertEqual(60, registro.quantidade)
+        self.assertEqual(60, len(ler_episodios(self.caminho)[0]))
+        with self.assertRaises(ValueError):
+            RegistroEpisodios(self.caminho, CodificadorCategoria())
+        with open(self.caminho, 'wb') as arquivo:
+            arquivo.write(b'outra coisa' * 100)
+        with self.assertRaises(ValueError):
+            ler_episodios(self.caminho)
+
+    def test_reproducao_deve_ser_igual_a_registrar_os_episodios(self):
+        episodios = SimulacaoLote(5).jogar(EstrategiaTrocaRandomica(), 20_000)
+        with RegistroEpisodios(self.caminho) as registro:
+            registro.gravar_lote(episodios)
+        recompensas = recompensas_por_rank(3, -2, 0)
+        for codificador in [None, CodificadorCategoria()]:
+            with self.subTest(f'test_reproducao_{codificador}'):
+                direta = EstrategiaTrocaRL(maximo=5000, aleatorio=6, codificador=codificador)
+                direta.tabela[:] = 100
+                estados = direta.codificador.codificar_lote(episodios.cartas, episodios.ranks_antes)
+                direta.registrar_resultados(estados, episodios.trocas, np.select(
+                    [episodios.ranks_depois > episodios.ranks_antes, episodios.ranks_depois < episodios.ranks_antes], [3, -2], default=0
+                ))
+                reproduzida = EstrategiaTrocaRL(maximo=5000, aleatorio=6, codificador=codificador)
+                reproduzida.tabela[:] = 100
+                self.assertEqual(20_000, reproduzir(self.caminho, reproduzida, recompensas, tamanho_bloco=3000))
+                self.assertTrue(np.array_equal(direta.tabela, reproduzida.tabela))
+
+    def test_treinamento_deve_registrar_os_episodios_com_as_recompensas_padrao(self):
+        estrategia = EstrategiaTrocaRL(maximo=5000, aleatorio=7)
+        estrategia.tabela[:] = 100
+        inicial = np.array(estrategia.tabela)
+        with RegistroEpisodios(self.caminho) as registro:
+            for _ in range(20):
+                treina_estrategia_troca_rl.treinamento(estrategia, 'AcAo9e8p7o', registro=registro)
+            maos = np.tile([[c.codigo for c in Mao(ConjuntoCartas.from_texto('KoJo9o7o2o')).cartas]], (500, 1))
+            treina_estrategia_troca_rl.treinamento_lote(estrategia, maos, SimulacaoLote(8), registro=registro)
+            metadados = treina_estrategia_troca_rl.metadados_checkpoint(520, [], registro)
+        self.assertEqual(520, metadados['episodios_registrados'])
+        reproduzida = EstrategiaTrocaRL(maximo=5000, aleatorio=9)
+        reproduzida.tabela[:] = inicial
+        reproduzir(self.caminho, reproduzida, recompensas_por_rank(
+            treina_estrategia_troca_rl.RECOMPENSA_MELHOROU, treina_estrategia_troca_rl.RECOMPENSA_PIOROU, treina_estrategia_troca_rl.RECOMPENSA_EMPATE
+        ))
+        self.assertTrue(np.array_equal(estrategia.tabela, reproduzida.tabela))  # pesos longe dos limites: a ordem não importa
+
+    def test_reproducao_por_lote_deve_refazer_o_treinamento_com_pesos_nos_limites(self):
+        recompensas = recompensas_por_rank(
+            treina_estrategia_troca_rl.RECOMPENSA_MELHOROU, treina_estrategia_troca_rl.RECOMPENSA_PIOROU, treina_estrategia_troca_rl.RECOMPENSA_EMPATE
+        )
+        maos = np.tile([[c.codigo for c in Mao(ConjuntoCartas.from_texto('AcAo9e8p7o')).cartas]], (50, 1))
+        for lote in [1, 50]:
+            caminho = os.path.join(self.diretorio.name, f'{lote}.bin')
+            with self.subTest(f'test_lote_{lote}'), RegistroEpisodios(caminho) as registro:
+                estrategia = EstrategiaTrocaRL(minimo=1, maximo=4, aleatorio=10)
+                estrategia.tabela[:] = 2
+                simulacao = SimulacaoLote(11)
+                for _ in range(6):
+                    if lote == 1:
+                        for _ in range(50):
+                            treina_estrategia_troca_rl.treinamento(estrategia, 'AcAo9e8p7o', registro=registro)
+                    else:
+                        treina_estrategia_troca_rl.treinamento_lote(estrategia, maos, simulacao, registro=registro)
+                registro.descarregar()
+                por_lote, de_uma_vez = EstrategiaTrocaRL(minimo=1, maximo=4), EstrategiaTrocaRL(minimo=1, maximo=4)
+                por_lote.tabela[:] = de_uma_vez.tabela[:] = 2
+                self.assertEqual(300, reproduzir(caminho, por_lote, recompensas, lote))
+                reproduzir(caminho, de_uma_vez, recompensas)
+                self.assertTrue(np.array_equal(estrategia.tabela, por_lote.tabela))
+                self.assertFalse(np.array_equal(estrategia.tabela, de_uma_vez.tabela))  # o total de cada célula passa dos limites
+
+
+if __name__ == '__main__':
+    unittest.main()
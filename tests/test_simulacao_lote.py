@@ -0,0 +1,103 @@
+import unittest
+
+import numpy as np
+
+import compara_estrategias_troca
+from poker.carta import Carta
+from poker.conjunto_cartas import ConjuntoCartas
+from poker.estrategias_troca.estrategia_troca import EstrategiaTroca
+from poker.estrategias_troca.estrategia_troca_randomica import EstrategiaTrocaRandomica
+from poker.mao import Mao
+from poker.simulacao_lote import SimulacaoLote
+
+
+class EstrategiaSemTroca(EstrategiaTroca):
+    """Nunca troca: nunca melhora nem piora, bem distante da troca aleatória"""
+
+    def _decidir_trocas(self, mao):
+        return 0
+
+    def _decidir_trocas_lote(self, cartas, ranks, gerador):
+        return np.zeros(len(cartas), dtype=np.int64)
+
+
+class SimulacaoLoteTest(unittest.TestCase):
+
+    def test_cada_baralho_deve_distribuir_cartas_distintas(self):
+        distribuidas = SimulacaoLote(np.random.default_rng(1)).distribuir(1000)
+        self.assertEqual((1000, SimulacaoLote.CARTAS_POR_EPISODIO), distribuidas.shape)
+        for linha in distribuidas:
+            self.assertEqual(SimulacaoLote.CARTAS_POR_EPISODIO, len(set(linha.tolist())))
+        self.assertTrue(((distribuidas >= 0) & (distribuidas < 52)).all())
+
+    def test_troca_em_lote_deve_ser_igual_a_troca_de_mao(self):
+        cartas_iniciais = '6o5o4o3o2o'
+        compras = [c.codigo for c in Carta.get_cartas('KpQpJp9p8p')]
+        for trocas in range(2 ** Mao.TAMANHO):
+            indices = Mao.trocas_to_indices(trocas)
+            with self.subTest(f'test_trocar_{indices}_em_lote'):
+                mao = Mao(Carta.get_cartas(cartas_iniciais))
+                cartas = np.array([[c.codigo for c in mao.cartas]])
+                finais = SimulacaoLote.trocar(cartas, np.array([trocas]), np.array([compras]))
+                n = Mao.quantos_uns(indices)
+                mao.trocar(indices, Carta.get_cartas('KpQpJp9p8p')[:n])
+                self.assertEqual(mao.conjunto, ConjuntoCartas.from_codigos(finais[0].tolist()))
+
+    def test_episodios_devem_concordar_com_mao(self):
+        episodios = SimulacaoLote(np.random.default_rng(2)).jogar(EstrategiaTrocaRandomica(), 500)
+        for i in range(500):
+            mao = Mao(ConjuntoCartas.from_codigos(episodios.cartas[i].tolist()))
+            self.assertEqual([c.codigo for c in mao.cartas], episodios.cartas[i].tolist())
+            self.assertEqual(mao.rank, episodios.ranks_antes[i])
+            final = Mao(ConjuntoCartas.from_codigos(episodios.cartas_finais[i].tolist()))
+            self.assertEqual(final.rank, episodios.ranks_depois[i])
+            mantidas = mao.conjunto - mao.conjunto_from_indices(Mao.trocas_to_indices(int(episodios.trocas[i])))
+            self.assertEqual(len(mantidas), len(mantidas & final.conjunto))
+
+    def test_porcentagens_devem_ser_as_mesmas_do_laco_original(self):
+        laco = compara_estrategias_troca.testa_estrategia(20_000, EstrategiaTrocaRandomica(aleatorio=3), aleatorio=4)
+        lote = compara_estrategias_troca.testa_estrategia_lote(200_000, EstrategiaTrocaRandomica(aleatorio=5), 6)
+        for resultado in ['empate', 'melhorou', 'piorou']:
+            with self.subTest(f'test_porcentagem_{resultado}'):
+                self.assertAlmostEqual(laco[resultado], lote[resultado], delta=1.5)
+
+    def test_resultado_paralelo_nao_deve_depender_da_quantidade_de_processos(self):
+        quantidade_testes = 3 * compara_estrategias_troca.TAMANHO_BLOCO + 123
+        estrategia = EstrategiaTrocaRandomica()
+        serial = compara_estrategias_troca.testa_estrategia_paralela(quantidade_testes, estrategia, semente=4, processos=1)
+        paralelo = compara_estrategias_troca.testa_estrategia_paralela(quantidade_testes, estrategia, semente=4, processos=2)
+        self.assertEqual(serial, paralelo)
+        outra_semente = compara_estrategias_troca.testa_estrategia_paralela(quantidade_testes, estrategia, semente=5, processos=1)
+        self.assertNotEqual(serial, outra_semente)
+
+    def test_avaliacao_adaptativa_deve_parar_quando_separa_as_estrategias(self):
+        estrategias = {'aleatoria': EstrategiaTrocaRandomica(), 'sem_troca': EstrategiaSemTroca()}
+        maximo = 8 * compara_estrategias_troca.TAMANHO_BLOCO
+        resultado = compara_estrategias_troca.testa_estrategias_adaptativo(estrategias, maximo, parada=compara_estrategias_troca.CriteriosParada(precisao=0.0), semente=1, processos=1)
+        self.assertEqual('separacao', resultado.motivo)
+        self.assertLess(resultado.estatisticas.episodios, maximo)
+        diferenca = resultado.estatisticas.diferenca('aleatoria', 'sem_troca', 'melhorou', resultado.z)
+        self.assertGreater(diferenca.inferior, 0.0)
+
+    def test_avaliacao_adaptativa_de_estrategias_iguais_deve_ir_ate_a_precisao_ou_o_limite(self):
+        estrategias = {'a': EstrategiaTrocaRandomica(), 'b': EstrategiaTrocaRandomica()}
+        maximo = 3 * compara_estrategias_troca.TAMANHO_BLOCO + 123
+        limite = compara_estrategias_troca.testa_estrategias_adaptativo(estrategias, maximo, parada=compara_estrategias_troca.CriteriosParada(precisao=0.0), semente=2, processos=1)
+        self.assertEqual('limite', limite.motivo)
+        self.assertEqual(maximo, limite.estatisticas.episodios)
+        self.assertEqual(limite.estatisticas.contagens('a'), limite.estatisticas.contagens('b'))  # mesmos episódios
+        paralelo = compara_estrategias_troca.testa_estrategias_adaptativo(estrategias, maximo, parada=compara_estrategias_troca.CriteriosParada(precisao=0.0), semente=2, processos=2)
+        self.assertEqual(limite.estatisticas.contagens('a'), paralelo.estatisticas.contagens('a'))
+        precisao = compara_estrategias_troca.testa_estrategias_adaptativo(estrategias, maximo, parada=compara_estrategias_troca.CriteriosParada(precisao=1.0), semente=2, processos=1)
+        self.assertEqual('precisao', precisao.motivo)
+        self.assertLessEqual(precisao.estatisticas.meia_largura_maxima(precisao.z), 0.01)
+
+    def test_avaliacao_adaptativa_sem_episodios_deve_ser_recusada(self):
+        estrategias = {'a': EstrategiaTrocaRandomica(), 'b': EstrategiaSemTroca()}
+        for maximo in [0, -1]:
+            with self.subTest(f'test_maximo_{maximo}'), self.assertRaises(ValueError):
+                compara_estrategias_troca.testa_estrategias_adaptativo(estrategias, maximo, semente=1, processos=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+from itertools import combinations, product
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from poker import mascaras
+from poker.baralho import Baralho
+from poker.canonizador import Canonizador
+from poker.carta import Carta
+from poker.estrategias_troca.estrategia_troca_otima import EstrategiaTrocaOtima
+from poker.mao import Mao
+from poker.solucionador_trocas import SolucionadorTrocas
+
+
+class SolucionadorTrocasTest(unittest.TestCase):
+
+    def test_cada_troca_deve_ter_uma_distribuicao_de_probabilidades(self):
+        mao = Mao(Carta.get_cartas('AeJc10e6e5o'))
+        resultado = SolucionadorTrocas.padrao().resolver(mao)
+        self.assertEqual((2 ** Mao.TAMANHO, len(Mao.TIPOS)), resultado.distribuicoes.shape)
+        self.assertTrue(np.allclose(1.0, resultado.distribuicoes.sum(axis=1)))
+        self.assertTrue(np.allclose(1.0, resultado.melhorou + resultado.piorou + resultado.empate))
+
+    def test_nao_trocar_deve_manter_o_tipo_da_mao(self):
+        mao = Mao(Carta.get_cartas('7o7e7c8o9e'))
+        resultado = SolucionadorTrocas.padrao().resolver(mao)
+        esperado = np.zeros(len(Mao.TIPOS))
+        esperado[mao.rank] = 1.0
+        self.assertTrue(np.array_equal(esperado, resultado.distribuicoes[0]))
+        self.assertEqual(1.0, resultado.empate[0])
+
+    def test_quero_saber_a_chance_de_completar_um_flush(self):
+        mao = Mao(Carta.get_cartas('AoKoQoJo2p'))
+        trocas = Mao.indices_to_trocas('00001')  # troca só o 2 de paus
+        distribuicao = SolucionadorTrocas.padrao().resolver(mao).distribuicoes[trocas] * 47
+        esperado = [23, 12, 0, 0, 3, 8, 0, 0, 1]  # 10o faz royal flush; os outros 10 fazem straight
+        self.assertTrue(np.allclose(esperado, distribuicao))
+
+    def test_deve_concordar_com_a_enumeracao_mao_a_mao(self):
+        # em 9e9oAe8e7e, a representante da classe tem o par na ordem inversa: as máscaras precisam ser remapeadas
+        for texto, indices in product(['9c9eAo8p7o', '9e9oAe8e7e'], ['00001', '00100', '00011', '10100', '01001', '10000']):
+            with self.subTest(f'test_enumeracao_{texto}_{indices}'):
+                mao = Mao(Carta.get_cartas(texto))
+                resultado = SolucionadorTrocas.padrao().resolver(mao)
+                n = Mao.quantos_uns(indices)
+                baralho = Baralho()
+                baralho.distribuir(Mao.TAMANHO, mao.cartas)
+                contagens = np.zeros(len(Mao.TIPOS))
+                for compras in combinations(baralho.cartas, n):
+                    nova = Mao(mao.cartas)
+                    nova.trocar(indices, list(compras))
+                    contagens[nova.rank] += 1
+                distribuicao = resultado.distribuicoes[Mao.indices_to_trocas(indices)]
+                self.assertTrue(np.allclose(contagens / contagens.sum(), distribuicao))
+
+    def test_maos_com_naipes_trocados_devem_ter_as_mesmas_chances(self):
+        mao = Mao(Carta.get_cartas('KeKoQe9e2c'))
+        outra = Mao(Carta.get_cartas('KoKpQo9o2e'))  # espadas -> ouros, ouros -> paus, copas -> espadas
+        naipes = {'e': 'o', 'o': 'p', 'c': 'e', 'p': 'c'}
+        textos = [str(c) for c in outra.cartas]
+        # a mesma carta, com o naipe trocado, pode ocupar outra posição na ordem de Mao.cartas
+        posicoes = [textos.index(str(c)[:-1] + naipes[str(c)[-1]]) for c in mao.cartas]
+        self.assertNotEqual(list(range(Mao.TAMANHO)), posicoes)
+        esperado = SolucionadorTrocas.padrao().resolver(mao).distribuicoes
+        resultado = SolucionadorTrocas.padrao().resolver(outra).distribuicoes
+        for trocas in range(SolucionadorTrocas.N_TROCAS):
+            self.assertTrue(np.array_equal(esperado[trocas], resultado[mascaras.permutar(trocas, posicoes)]))
+
+    def test_cache_em_disco_deve_guardar_as_contagens_de_cada_classe(self):
+        mao = Mao(Carta.get_cartas('9e9oAe8e7e'))
+        classe = Canonizador.padrao().canonizar([c.codigo for c in mao.cartas]).classe
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = os.path.join(diretorio, 'trocas.npy')
+            esperado = SolucionadorTrocas(cache=SolucionadorTrocas.criar_cache(caminho)).resolver(mao)
+            cache = SolucionadorTrocas.criar_cache(caminho)  # reaberto, como em outra execução
+            self.assertEqual([classe], np.flatnonzero(cache.preenchidas(np.arange(Canonizador.N_CLASSES))).tolist())
+            resultado = SolucionadorTrocas(cache=cache).resolver(mao)
+            self.assertTrue(np.array_equal(esperado.distribuicoes, resultado.distribuicoes))
+            self.assertTrue(np.array_equal(esperado.distribuicoes, SolucionadorTrocas.padrao().resolver(mao).distribuicoes))
+            del cache
+
+    def test_estrategia_otima_nao_deve_trocar_um_straight_flush(self):
+        estrategia = EstrategiaTrocaOtima()
+        mao = Mao(Carta.get_cartas('9p8p7p6p5p'))
+        self.assertEqual('00000', estrategia.obter_indices_de_troca(mao))
+
+    def test_estrategia_otima_deve_escolher_a_troca_de_maior_valor(self):
+        estrategia = EstrategiaTrocaOtima()
+        for texto in ['AoKoQoJo2p', 'AcAo9e8p7o', '6c5e4c3p2o', '5o6e10eJcAe']:
+            with self.subTest(f'test_troca_otima_de_{texto}'):
+                mao = Mao(Carta.get_cartas(texto))
+                valores = estrategia.valores(SolucionadorTrocas.padrao().resolver(mao))
+                trocas = Mao.indices_to_trocas(estrategia.obter_indices_de_troca(mao))
+                self.assertEqual(valores.max(), valores[trocas])
+                cartas = np.array([[c.codigo for c in mao.cartas]])
+                self.assertEqual(trocas, estrategia.obter_trocas_lote(cartas, np.array([mao.rank]))[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
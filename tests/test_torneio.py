@@ -0,0 +1,80 @@
+import unittest
+
+import numpy as np
+
+from poker.conjunto_cartas import ConjuntoCartas
+from poker.estrategias_troca.estrategia_troca_randomica import EstrategiaTrocaRandomica
+from poker.estrategias_troca.estrategia_troca_rl import EstrategiaTrocaRL
+from poker.mao import Mao
+from poker.torneio import LIMITES, Torneio
+
+
+class TorneioTest(unittest.TestCase):
+
+    @staticmethod
+    def aleatorios(assentos, semente=1):
+        return Torneio([(f'aleatoria {i}', EstrategiaTrocaRandomica()) for i in range(assentos)], semente)
+
+    def test_quantidade_de_assentos_deve_caber_no_baralho(self):
+        for assentos in [0, 1, 11]:
+            with self.subTest(f'test_assentos_{assentos}'):
+                with self.assertRaises(ValueError):
+                    TorneioTest.aleatorios(assentos)
+
+    def test_jogos_devem_concordar_com_mao(self):
+        for assentos in [2, 5, 10]:
+            with self.subTest(f'test_jogos_{assentos}_assentos'):
+                lote = TorneioTest.aleatorios(assentos).jogar_lote(200)
+                for jogo in range(200):
+                    usadas = set()
+                    for assento in range(assentos):
+                        mao = Mao(ConjuntoCartas.from_codigos(lote.cartas[jogo, assento].tolist()))
+                        self.assertEqual([c.codigo for c in mao.cartas], lote.cartas[jogo, assento].tolist())
+                        final = Mao(ConjuntoCartas.from_codigos(lote.cartas_finais[jogo, assento].tolist()))
+                        self.assertEqual(final.forca, lote.forcas[jogo, assento])
+                        trocadas = mao.conjunto_from_indices(int(lote.trocas[jogo, assento]))
+                        self.assertEqual(mao.conjunto - trocadas, mao.conjunto & final.conjunto)
+                        self.assertEqual(int(lote.trocas[jogo, assento]), int(lote.trocas[jogo, assento]) & int(lote.pedidas[jogo, assento]))
+                        usadas |= set(lote.cartas[jogo, assento].tolist()) | set(lote.cartas_finais[jogo, assento].tolist())
+                    # nenhuma carta é distribuída duas vezes no mesmo jogo, nem entre assentos
+                    iniciais = assentos * Mao.TAMANHO
+                    compradas = sum(int(lote.trocas[jogo, assento]).bit_count() for assento in range(assentos))
+                    self.assertEqual(iniciais + compradas, len(usadas))
+                    self.assertLessEqual(len(usadas), 52)
+
+    def test_baralho_esgotado_deve_cortar_as_trocas(self):
+        self.assertEqual(0b00011, LIMITES[0b11011, 2])
+        self.assertEqual(0b11011, LIMITES[0b11011, 5])
+        lote = TorneioTest.aleatorios(10).jogar_lote(500)
+        compradas = np.array([[int(troca).bit_count() for troca in jogo] for jogo in lote.trocas])
+        self.assertTrue((compradas.sum(axis=1) <= 2).all())  # só sobram 2 cartas depois de 50 distribuídas
+        self.assertTrue((compradas > 0).any(axis=0).all())  # a ordem das compras muda a cada jogo
+        resultado = TorneioTest.aleatorios(2).jogar(1000)
+        self.assertEqual(0, resultado.trocas_cortadas)
+
+    def test_resultado_deve_somar_os_potes_e_os_assentos_de_mesmo_nome(self):
+        rl = EstrategiaTrocaRL('tabela-treinamento-1-5000.csv', aleatorio=2)
+        aleatoria = EstrategiaTrocaRandomica()
+        torneio = Torneio([('rl', rl), ('aleatoria', aleatoria), ('rl', rl), ('aleatoria', aleatoria)], 3)
+        resultado = torneio.jogar(40_000)
+        self.assertEqual(['rl', 'aleatoria'], list(resultado.desempenhos))
+        self.assertAlmostEqual(40_000, sum(desempenho.potes for desempenho in resultado.desempenhos.values()))
+        for nome, desempenho in resultado.desempenhos.items():
+            with self.subTest(f'test_desempenho_{nome}'):
+                self.assertEqual(80_000, desempenho.participacoes)
+                self.assertEqual(80_000, desempenho.tipos_finais.sum())
+                self.assertAlmostEqual(1.0, desempenho.distribuicao_tipos.sum())
+                self.assertLessEqual(desempenho.taxa_vitoria, desempenho.fracao_pote)
+                self.assertLessEqual(desempenho.fracao_pote, desempenho.taxa_vitoria + desempenho.taxa_empate)
+        self.assertGreater(resultado.desempenhos['rl'].fracao_pote, resultado.desempenhos['aleatoria'].fracao_pote)
+
+    def test_mesma_semente_deve_dar_o_mesmo_resultado(self):
+        primeiro, segundo = TorneioTest.aleatorios(3, 4).jogar(5000), TorneioTest.aleatorios(3, 4).jogar(5000)
+        self.assertEqual(primeiro.trocas_cortadas, segundo.trocas_cortadas)
+        for nome, desempenho in primeiro.desempenhos.items():
+            self.assertEqual(desempenho.potes, segundo.desempenhos[nome].potes)
+            self.assertEqual(desempenho.tipos_finais.tolist(), segundo.desempenhos[nome].tipos_finais.tolist())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+import treina_estrategia_troca_rl
+from poker.estrategias_troca.estrategia_troca_rl import EstrategiaTrocaRL
+
+
+class RelogioFalso:
+
+    def __init__(self):
+        self.agora = 0.0
+
+    def __call__(self):
+        return self.agora
+
+
+class TreinaEstrategiaTrocaRLTest(unittest.TestCase):
+
+    def test_progresso_deve_ser_impresso_no_maximo_uma_vez_por_intervalo(self):
+        relogio = RelogioFalso()
+        progresso = treina_estrategia_troca_rl.Progresso(1000, intervalo=1.0, relogio=relogio)
+        with redirect_stdout(io.StringIO()) as saida:
+            relogio.agora = 0.5
+            self.assertIsNone(progresso.atualizar(50))
+            relogio.agora = 2.0
+            self.assertEqual('Treinamento 200 de 1000 (20.0%) - 100 episódios/s - faltam 0:00:08...', progresso.atualizar(200))
+            relogio.agora = 2.9
+            self.assertIsNone(progresso.atualizar(290))
+        self.assertEqual(1, len(saida.getvalue().splitlines()))
+
+    def test_progresso_deve_considerar_o_episodio_de_retomada(self):
+        relogio = RelogioFalso()
+        progresso = treina_estrategia_troca_rl.Progresso(1000, inicio=500, relogio=relogio)
+        relogio.agora = 5.0
+        with redirect_stdout(io.StringIO()):
+            self.assertIn('50 episódios/s - faltam 0:00:05', progresso.atualizar(750))
+
+    def test_progresso_sem_episodios_nao_deve_dividir_por_zero(self):
+        relogio = RelogioFalso()
+        progresso = treina_estrategia_troca_rl.Progresso(0, relogio=relogio)
+        relogio.agora = 2.0
+        with redirect_stdout(io.StringIO()):
+            self.assertIn('Treinamento 0 de 0 (100.0%)', progresso.atualizar(0))
+
+    def test_argumentos_invalidos_devem_ser_recusados(self):
+        raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        for argumento, valor in [('--lote', '0'), ('--lote', '-5'), ('--intervalo-checkpoint', '0')]:
+            with self.subTest(f'test_{argumento}_{valor}'), tempfile.TemporaryDirectory() as diretorio:
+                resultado = subprocess.run([sys.executable, os.path.join(raiz, 'treina_estrategia_troca_rl.py'), '--episodios', '10', argumento, valor],
+                                           cwd=diretorio, capture_output=True, text=True, check=False)
+                self.assertEqual(2, resultado.returncode)
+                self.assertIn(f'{argumento} deve ser ao menos 1', resultado.stderr)
+                self.assertEqual([], os.listdir(diretorio))
+
+    def test_processo_de_treinamento_nao_deve_importar_matplotlib(self):
+        codigo = 'import sys, treina_estrategia_troca_rl; print("matplotlib" in sys.modules)'
+        raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        resultado = subprocess.run([sys.executable, '-c', codigo], cwd=raiz, capture_output=True, text=True, check=True)
+        self.assertEqual('False', resultado.stdout.strip())
+
+    def test_heatmaps_devem_ser_gerados_em_outro_processo(self):
+        diretorio_atual = os.getcwd()
+        with tempfile.TemporaryDirectory() as diretorio:
+            os.chdir(diretorio)
+            try:
+                heatmaps = treina_estrategia_troca_rl.GeradorHeatmaps(tamanho_fila=1)
+                tabela = EstrategiaTrocaRL().tabela
+                for episodio in range(0, 5000, 1000):
+                    heatmaps.enviar(tabela, episodio)
+                heatmaps.fechar()
+                gerados = sorted(os.listdir(diretorio))
+            finally:
+                os.chdir(diretorio_atual)
+        self.assertTrue(1 <= len(gerados) <= 5)
+        self.assertEqual(5, len(gerados) + heatmaps.descartados)
+        self.assertIn('heatmap-0.png', gerados)
+
+    def test_metricas_devem_contar_episodios_de_treinamento_e_nao_maos(self):
+        raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        for lote in [1, 10]:
+            with self.subTest(f'test_metricas_com_lote_{lote}'), tempfile.TemporaryDirectory() as diretorio:
+                argumentos = ['--episodios', '30', '--lote', str(lote), '--metricas', 'metricas.jsonl', '--semente', '1']
+                subprocess.run([sys.executable, os.path.join(raiz, 'treina_estrategia_troca_rl.py'), *argumentos], cwd=diretorio, capture_output=True, check=True)
+                with open(os.path.join(diretorio, 'metricas.jsonl'), encoding='utf-8') as arquivo:
+                    ultima = json.loads(arquivo.readlines()[-1])
+                self.assertEqual(30, ultima['episodios'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import csv
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from converte_tabelas_csv import converte_tabela
+from poker.carta import Carta
+from poker.estrategias_troca.estrategia_troca_rl import EstrategiaTrocaRL
+from poker.simulacao_lote import SimulacaoLote
+from poker.varredura import ConfiguracaoTreino, ParametrosVarredura, Recompensas, Varredura, caminho_tabela, grade
+from treina_estrategia_troca_rl import TIPOS
+
+MAOS = np.array([[c.codigo for c in Carta.get_cartas(cartas)] for cartas in TIPOS])
+PARAMETROS = ParametrosVarredura(lote=50, intervalo_checkpoint=100, distribuicoes=64, testes=20_000)
+
+
+class VarreduraTest(unittest.TestCase):
+
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+
+    def tearDown(self):
+        self.diretorio.cleanup()
+
+    def _tabela(self, diretorio, configuracao):
+        estrategia = EstrategiaTrocaRL(minimo=configuracao.minimo, maximo=configuracao.maximo)
+        estrategia.carregar(caminho_tabela(diretorio, configuracao, '.csv'))
+        return estrategia.tabela
+
+    def test_grade_deve_ter_todas_as_combinacoes(self):
+        configuracoes = grade(['minimo', 'aleatorio'], [(1, 279), (1, 5000)], [(2, -1, 1), (1, -1, 0)], [100, 200])
+        self.assertEqual(16, len(configuracoes))
+        self.assertEqual(16, len({configuracao.nome for configuracao in configuracoes}))
+        self.assertEqual(ConfiguracaoTreino('minimo', 1, 279, Recompensas(2, -1, 1), 100), configuracoes[0])
+        self.assertEqual('minimo-2_-1_1-100-1-279', configuracoes[0].nome)
+        with self.assertRaises(ValueError):
+            grade(['zeros'], [(1, 279)], [(2, -1, 1)], [100])
+
+    def test_recompensas_devem_seguir_o_resultado_do_rank(self):
+        recompensas = Recompensas(5, -3, 1).calcular(np.array([1, 2, 3]), np.array([2, 2, 1]))
+        self.assertEqual([5, 1, -3], recompensas.tolist())
+
+    def test_jogar_distribuidas_deve_usar_as_cartas_informadas(self):
+        distribuidas = SimulacaoLote(1).distribuir(100)
+        episodios = SimulacaoLote(2).jogar_distribuidas(EstrategiaTrocaRL(aleatorio=3), distribuidas)
+        self.assertEqual(sorted(distribuidas[:, :5].ravel().tolist()), sorted(episodios.cartas.ravel().tolist()))
+        self.assertTrue(np.isin(episodios.cartas_finais, distribuidas).all(axis=1).all())
+
+    def test_varredura_deve_classificar_e_resumir_todas_as_configuracoes(self):
+        configuracoes = grade(['minimo', 'aleatorio'], [(1, 279)], [(2, -1, 1)], [300])
+        resultados = Varredura(self.diretorio.name, MAOS, PARAMETROS, semente=1).executar(configuracoes, processos=1)
+        self.assertEqual(set(configuracoes), {resultado.configuracao for resultado in resultados})
+        melhorou = [resultado.contagens['melhorou'] for resultado in resultados]
+        self.assertEqual(sorted(melhorou, reverse=True), melhorou)
+        for resultado in resultados:
+            self.assertEqual(PARAMETROS.testes, sum(resultado.contagens.values()))
+        with open(os.path.join(self.diretorio.name, Varredura.ARQUIVO_RESUMO), encoding='utf-8') as arquivo:
+            linhas = list(csv.DictReader(arquivo, delimiter=';'))
+        self.assertEqual([resultado.configuracao.nome for resultado in resultados], [linha['nome'] for linha in linhas])
+        self.assertEqual(['1', '2'], [linha['posicao'] for linha in linhas])
+        distribuicoes = np.load(os.path.join(self.diretorio.name, Varredura.ARQUIVO_DISTRIBUICOES))
+        self.assertEqual((PARAMETROS.distribuicoes, len(MAOS), SimulacaoLote.CARTAS_POR_EPISODIO), distribuicoes.shape)
+        self.assertTrue((distribuicoes[:, :, :5] == MAOS).all())
+        minimo = self._tabela(self.diretorio.name, configuracoes[0])
+        self.assertTrue((minimo >= 1).all())  # começou com todos os pesos no mínimo, e não com linhas a sortear
+        self.assertGreater(minimo.max(), 1)
+
+    def test_resultado_nao_deve_depender_da_quantidade_de_processos(self):
+        configuracoes = grade(['aleatorio'], [(1, 279), (1, 5000)], [(2, -1, 1)], [200])
+        serial = Varredura(os.path.join(self.diretorio.name, 'serial'), MAOS, PARAMETROS, semente=2).executar(configuracoes, processos=1)
+        paralelo = Varredura(os.path.join(self.diretorio.name, 'paralelo'), MAOS, PARAMETROS, semente=2).executar(configuracoes, processos=2)
+        self.assertEqual(serial, paralelo)
+
+    def test_execucao_interrompida_deve_continuar_do_checkpoint(self):
+        configuracao = ConfiguracaoTreino('aleatorio', 1, 279, Recompensas(), 400)
+        completa = Varredura(os.path.join(self.diretorio.name, 'completa'), MAOS, PARAMETROS, semente=3).executar([configuracao], processos=1)
+        interrompida = os.path.join(self.diretorio.name, 'interrompida')
+        jogar_distribuidas = SimulacaoLote.jogar_distribuidas
+        chamadas = []
+
+        def interromper(simulacao, estrategia, distribuidas):
+            chamadas.append(len(distribuidas))
+            if len(chamadas) == 5:
+                raise KeyboardInterrupt
+            return jogar_distribuidas(simulacao, estrategia, distribuidas)
+
+        with mock.patch.object(SimulacaoLote, 'jogar_distribuidas', interromper), self.assertRaises(KeyboardInterrupt):
+            Varredura(interrompida, MAOS, PARAMETROS, semente=3).executar([configuracao], processos=1)
+        metadados = EstrategiaTrocaRL().carregar(caminho_tabela(interrompida, configuracao))
+        self.assertEqual(200, metadados['episodio'])
+        retomada = Varredura(interrompida, MAOS, PARAMETROS, semente=3).executar([configuracao], processos=1)
+        self.assertEqual(completa, retomada)
+        self.assertTrue(np.array_equal(self._tabela(os.path.join(self.diretorio.name, 'completa'), configuracao), self._tabela(interrompida, configuracao)))
+        with self.assertRaises(ValueError):
+            Varredura(interrompida, MAOS[:5], PARAMETROS, semente=3)  # as distribuições gravadas são de outras mãos
+
+    def test_tabela_da_varredura_deve_ser_convertida_com_os_proprios_limites(self):
+        configuracao = ConfiguracaoTreino('aleatorio', 2, 5000, Recompensas(), 300)
+        Varredura(self.diretorio.name, MAOS, PARAMETROS, semente=4).executar([configuracao], processos=1)
+        csv_treinada = caminho_tabela(self.diretorio.name, configuracao, '.csv')
+        convertida = EstrategiaTrocaRL()
+        convertida.carregar(converte_tabela(csv_treinada, os.path.join(self.diretorio.name, 'convertida.npz')))
+        self.assertEqual((2, 5000), (convertida.minimo, convertida.maximo))  # e não o máximo de 300, do número de episódios
+        self.assertTrue(np.array_equal(self._tabela(self.diretorio.name, configuracao), convertida.tabela))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import argparse
+
+from poker.estrategias_troca.estrategia_troca_randomica import EstrategiaTrocaRandomica
+from poker.estrategias_troca.estrategia_troca_rl import EstrategiaTrocaRL
+from poker.mao import Mao
+from poker.torneio import Torneio
+
+
+def imprime_resultado(resultado):
+    print(f'== {resultado.jogos} jogos ==')
+    print()
+    ranking = sorted(resultado.desempenhos.items(), key=lambda item: item[1].fracao_pote, reverse=True)
+    for posicao, (nome, desempenho) in enumerate(ranking, 1):
+        print(f'== {posicao}o: {nome} ==')
+        print(f'pote: {desempenho.fracao_pote * 100:.2f}%  vitórias: {desempenho.taxa_vitoria * 100:.2f}%  empates: {desempenho.taxa_empate * 100:.2f}%')
+        for tipo, fracao in zip(Mao.TIPOS, desempenho.distribuicao_tipos):
+            print(f'{tipo}: {fracao * 100:.2f}%')
+        print()
+    if resultado.trocas_cortadas:
+        print(f'{resultado.trocas_cortadas} cartas deixaram de ser trocadas porque o baralho acabou.')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Torneio de draw poker entre as estratégias de troca, todas na mesma mesa.')
+    parser.add_argument('--jogos', type=int, default=1_000_000, help='quantidade de jogos')
+    parser.add_argument('--assentos-por-estrategia', type=int, default=1, help='quantos assentos cada estratégia ocupa')
+    parser.add_argument('--semente', type=int, default=None, help='semente para reproduzir os resultados')
+    args = parser.parse_args()
+
+    # as estratégias sorteiam com o gerador do torneio, e a semente basta para reproduzir tudo
+    estrategias = {
+        'Troca Aleatória': EstrategiaTrocaRandomica(),
+        'RL Init 1 Max 279': EstrategiaTrocaRL('tabela-treinamento-1-279.csv'),
+        'RL Init 1 Max 5000': EstrategiaTrocaRL('tabela-treinamento-1-5000.csv'),
+        'RL Init Aleatório Max 279': EstrategiaTrocaRL('tabela-treinamento-aleatorio-279.csv'),
+        'RL Init Aleatório Max 5000': EstrategiaTrocaRL('tabela-treinamento-aleatorio-5000.csv'),
+    }
+    assentos = [(nome, estrategia) for nome, estrategia in estrategias.items() for _ in range(args.assentos_por_estrategia)]
+    imprime_resultado(Torneio(assentos, args.semente).jogar(args.jogos))
+
+
+if __name__ == '__main__':
+    main()
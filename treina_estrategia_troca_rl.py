@@ -1,71 +1,258 @@
-import matplotlib.pyplot as plt
+import argparse
+import multiprocessing
+import queue
+import time
+from datetime import timedelta
+
 import numpy as np
 
+from poker.aleatorio import FonteAleatoria
 from poker.baralho import Baralho
+from poker.carta import Carta
+from poker.estrategias_troca.codificadores_estado import CODIFICADORES, criar_codificador
 from poker.estrategias_troca.estrategia_troca_rl import EstrategiaTrocaRL
+from poker.instrumentacao import INSTRUMENTACAO_NULA, Instrumentacao
 from poker.jogador import Jogador
 from poker.mao import Mao
+from poker.registro_episodios import RegistroEpisodios
+from poker.simulacao_lote import SimulacaoLote
+
+RECOMPENSA_MELHOROU = 2
+RECOMPENSA_PIOROU = -1
+RECOMPENSA_EMPATE = 1
+LIMITE_LINHAS_HEATMAP = 512  # tabelas maiores não cabem em um heatmap legível
+TIPOS = [
+    'AeJc10e6e5o',  # 'maior carta'
+    'AcAo9e8p7o',  # 'um par'
+    'AcAo9p9e7o',  # 'dois pares'
+    '9p9c9e7o4p',  # 'trinca'
+    '6c5e4c3p2o',  # 'straight'
+    'KoJo9o7o2o',  # 'flush'
+    '9c9e9o5p5o',  # 'full house'
+    '9p9c9e9o7o',  # 'quadra'
+    '9p8p7p6p5p'  # 'straight flush'
+]
 
 
-def treinamento(estrategia_troca_rl, cartas):
+def treinamento(estrategia_troca_rl, cartas, baralho=None, instrumentacao=INSTRUMENTACAO_NULA, registro=None):
     # novo jogador
     jogador = Jogador('Treinamento', estrategia_troca_rl)
 
-    # novo baralho
-    baralho = Baralho()
-    baralho.embaralhar()
+    with instrumentacao.fase('distribuicao'):
+        # baralho completo e embaralhado, reaproveitando o do episódio anterior quando houver
+        if baralho is None:
+            baralho = Baralho()
+        baralho.reset()
+        baralho.embaralhar()
 
-    # distribuir cartas
-    cartas = baralho.distribuir(Mao.TAMANHO, cartas)
-    jogador.receber(cartas)
+        # distribuir cartas
+        cartas = baralho.distribuir_conjunto(Mao.TAMANHO, cartas)
+        jogador.receber(cartas)
 
-    # nossa mão atual
+    # nossa mão atual, e a linha da tabela que ela usa
     mao_anterior = jogador.mao.rank
+    estado = estrategia_troca_rl.codificador.codificar(jogador.mao)
+    inicial = registro.capturar(jogador.mao, estado) if registro is not None else None
 
     # trocar cartas
-    cartas_descartadas = jogador.decidir_trocas()
+    with instrumentacao.fase('decisao'):
+        cartas_descartadas = jogador.decidir_trocas()
     n = len(cartas_descartadas)
-    novas_cartas = baralho.distribuir(n)
-    jogador.receber(novas_cartas)
+    with instrumentacao.fase('troca'):
+        novas_cartas = baralho.distribuir_conjunto(n)
+        jogador.receber(novas_cartas)
 
     # nossa nova mão após trocas
     mao_posterior = jogador.mao.rank
+    if registro is not None:
+        with instrumentacao.fase('registro'):
+            registro.gravar_troca(inicial, jogador.trocas, jogador.mao)
+
+    with instrumentacao.fase('atualizacao'):
+        if mao_posterior > mao_anterior:
+            estrategia_troca_rl.registrar_resultado(estado, jogador.trocas, RECOMPENSA_MELHOROU)
+        elif mao_posterior < mao_anterior:
+            estrategia_troca_rl.registrar_resultado(estado, jogador.trocas, RECOMPENSA_PIOROU)
+        else:
+            estrategia_troca_rl.registrar_resultado(estado, jogador.trocas, RECOMPENSA_EMPATE)
+    instrumentacao.contar('cartas_trocadas', n)
+
+
+def treinamento_lote(estrategia_troca_rl, maos, simulacao, instrumentacao=INSTRUMENTACAO_NULA, registro=None):
+    """Joga um episódio para cada linha de maos (N, 5) com a tabela congelada e só então registra todas as recompensas"""
+    with instrumentacao.fase('simulacao'):
+        episodios = simulacao.jogar_maos(estrategia_troca_rl, maos)
+    with instrumentacao.fase('atualizacao'):
+        recompensas = calcula_recompensas(episodios.ranks_antes, episodios.ranks_depois)
+        estados = estrategia_troca_rl.codificador.codificar_lote(episodios.cartas, episodios.ranks_antes)
+        estrategia_troca_rl.registrar_resultados(estados, episodios.trocas, recompensas)
+    if registro is not None:
+        with instrumentacao.fase('registro'):
+            registro.gravar_lote(episodios, estados)
+
+
+def calcula_recompensas(ranks_antes, ranks_depois):
+    return np.select([ranks_depois > ranks_antes, ranks_depois < ranks_antes], [RECOMPENSA_MELHOROU, RECOMPENSA_PIOROU], default=RECOMPENSA_EMPATE)
+
+
+def estado_aleatorio(*fontes):
+    """Estado das FonteAleatoria informadas, em um formato que pode ser salvo como JSON"""
+    return [fonte.estado for fonte in fontes]
+
+
+def restaura_estado_aleatorio(estado, *fontes):
+    for fonte, estado_fonte in zip(fontes, estado):
+        fonte.estado = estado_fonte
+
+
+class Progresso:
+    """Mostra o andamento do treinamento no máximo uma vez a cada intervalo segundos, com episódios/s e o tempo restante"""
+
+    def __init__(self, total, inicio=0, intervalo=1.0, relogio=time.monotonic):
+        self._total = total
+        self._inicio = inicio
+        self._intervalo = intervalo
+        self._relogio = relogio
+        self._comeco = self._ultimo = relogio()
+
+    def atualizar(self, episodio):
+        """Retorna a linha impressa, ou None se a última foi impressa há menos de intervalo segundos"""
+        agora = self._relogio()
+        if agora - self._ultimo < self._intervalo:
+            return None
+        self._ultimo = agora
+        taxa = (episodio - self._inicio) / (agora - self._comeco)
+        restante = timedelta(seconds=round((self._total - episodio) / taxa)) if taxa > 0 else '?'
+        porcentagem = episodio / self._total * 100 if self._total else 100.0
+        linha = f'Treinamento {episodio} de {self._total} ({porcentagem:.1f}%) - {taxa:.0f} episódios/s - faltam {restante}...'
+        print(linha)
+        return linha
+
+
+class GeradorHeatmaps:
+    """Gera os heatmaps em um processo separado, para não travar o treinamento.
 
-    if mao_posterior > mao_anterior:
-        estrategia_troca_rl.registrar_resultado(mao_anterior, jogador.indices, 2)
-    elif mao_posterior < mao_anterior:
-        estrategia_troca_rl.registrar_resultado(mao_anterior, jogador.indices, -1)
+    As tabelas são copiadas para uma fila limitada; se o processo não der conta, as novas são descartadas em vez de
+    atrasar o treinamento. matplotlib só é importado nesse processo.
+    """
+
+    def __init__(self, tamanho_fila=4):
+        self._fila = multiprocessing.Queue(tamanho_fila)
+        self._processo = multiprocessing.Process(target=_gera_heatmaps, args=(self._fila,), daemon=True)
+        self._processo.start()
+        self._descartados = 0
+
+    @property
+    def descartados(self):
+        return self._descartados
+
+    def enviar(self, tabela, episodio, rotulos=None):
+        try:
+            self._fila.put_nowait((np.array(tabela), episodio, rotulos))  # a fila serializa depois, em outra thread
+        except queue.Full:
+            self._descartados += 1
+
+    def fechar(self):
+        """Espera os heatmaps que já estão na fila"""
+        self._fila.put(None)
+        self._processo.join()
+
+
+def _gera_heatmaps(fila):
+    for tabela, episodio, rotulos in iter(fila.get, None):
+        gerar_heatmap(tabela, episodio, rotulos)
+
+
+def carrega(estrategia, args, fontes):
+    """Carrega a tabela inicial, ou retoma o checkpoint com o estado das fontes; devolve o episódio de onde continuar e
+    o registro de episódios, se pedido"""
+    metadados = {}
+    if args.retomar:
+        metadados = estrategia.carregar(args.checkpoint)
+        if 'estado_aleatorio' in metadados:
+            restaura_estado_aleatorio(metadados['estado_aleatorio'], *fontes)
     else:
-        estrategia_troca_rl.registrar_resultado(mao_anterior, jogador.indices, 1)
+        estrategia.carregar(args.arquivo)
+    # ao retomar, os episódios gravados depois do checkpoint são descartados, porque serão jogados de novo
+    registro = RegistroEpisodios(args.registro, estrategia.codificador, metadados.get('episodios_registrados')) if args.registro else None
+    return metadados.get('episodio', 0), registro
+
+
+def metadados_checkpoint(episodio, fontes, registro=None):
+    """Metadados de um checkpoint; o registro de episódios é descarregado, para que o arquivo chegue até ele"""
+    metadados = {'episodio': episodio, 'estado_aleatorio': estado_aleatorio(*fontes)}
+    if registro is not None:
+        registro.descarregar()
+        metadados['episodios_registrados'] = registro.quantidade
+    return metadados
+
+
+def le_argumentos():
+    parser = argparse.ArgumentParser(description='Treina a estratégia de troca de cartas por reforço.')
+    parser.add_argument('--arquivo', default='tabela.csv', help='tabela de pesos a carregar e salvar')
+    parser.add_argument('--episodios', type=int, default=1_000_000, help='episódios de treinamento')
+    parser.add_argument('--lote', type=int, default=1, help='episódios jogados com a tabela congelada antes de cada atualização')
+    parser.add_argument('--checkpoint', default='tabela.npz', help='checkpoint binário gravado durante o treinamento')
+    parser.add_argument('--intervalo-checkpoint', type=int, default=10_000, help='episódios entre dois checkpoints')
+    parser.add_argument('--retomar', action='store_true', help='continua o treinamento a partir do checkpoint')
+    parser.add_argument('--metricas', default=None, help='arquivo JSON lines com episódios/s e o tempo de cada fase')
+    parser.add_argument('--perfil', type=int, default=0, help='captura um perfil de cProfile (perfil.prof) dos primeiros episódios')
+    parser.add_argument('--perfil-memoria', action='store_true', help='inclui no perfil as alocações, com tracemalloc')
+    parser.add_argument('--semente', type=int, default=None, help='semente raiz, para reproduzir o treinamento')
+    parser.add_argument('--codificador', default='rank', choices=sorted(CODIFICADORES), help='estado da mão que indexa a tabela de pesos')
+    parser.add_argument('--registro', default=None, help='arquivo binário onde acrescentar os episódios, para reproduzi-los depois')
+    args = parser.parse_args()
+    for opcao, valor in [('--lote', args.lote), ('--intervalo-checkpoint', args.intervalo_checkpoint)]:
+        if valor < 1:
+            parser.error(f'{opcao} deve ser ao menos 1, e não {valor}')
+    return args
 
 
 def main():
-    arquivo = 'tabela.csv'
-    estrategia_troca_rl = EstrategiaTrocaRL()
-    estrategia_troca_rl.carregar(arquivo)
-    episodios_de_treinamento = 1_000_000
-    tipos = [
-        'AeJc10e6e5o',  # 'maior carta'
-        'AcAo9e8p7o',  # 'um par'
-        'AcAo9p9e7o',  # 'dois pares'
-        '9p9c9e7o4p',  # 'trinca'
-        '6c5e4c3p2o',  # 'straight'
-        'KoJo9o7o2o',  # 'flush'
-        '9c9e9o5p5o',  # 'full house'
-        '9p9c9e9o7o',  # 'quadra'
-        '9p8p7p6p5p'  # 'straight flush'
-    ]
-    for episodio in range(episodios_de_treinamento):
-        print(f'Treinamento {episodio} de {episodios_de_treinamento} ({(episodio / episodios_de_treinamento * 100):.1f}%)...')
-        if episodio % 1_000 == 0:
-            gerar_heatmap(estrategia_troca_rl.tabela, episodio)
-        for cartas in tipos:
-            treinamento(estrategia_troca_rl, cartas)
-
-    estrategia_troca_rl.salvar(arquivo)
-
-
-def gerar_heatmap(tabela, episodio):
+    args = le_argumentos()
+    # estratégia, baralho e simulação em lote têm fluxos aleatórios independentes, derivados da mesma semente
+    fontes = FonteAleatoria(args.semente).dividir(3)
+    estrategia_troca_rl = EstrategiaTrocaRL(aleatorio=fontes[0], codificador=criar_codificador(args.codificador))
+    baralho = Baralho(fontes[1])
+    simulacao = SimulacaoLote(fontes[2])
+    maos_dos_tipos = np.array([[c.codigo for c in Carta.get_cartas(cartas)] for cartas in TIPOS])
+    inicio, registro = carrega(estrategia_troca_rl, args, fontes)
+    progresso = Progresso(args.episodios, inicio)
+    instrumentacao = Instrumentacao(args.metricas) if args.metricas or args.perfil else INSTRUMENTACAO_NULA
+    if args.perfil:
+        instrumentacao.capturar(args.perfil, 'perfil', args.perfil_memoria)
+    heatmaps = GeradorHeatmaps()
+    for episodio in range(inicio, args.episodios, args.lote):
+        n = min(args.lote, args.episodios - episodio)
+        progresso.atualizar(episodio)
+        if (episodio + n - 1) // 1_000 * 1_000 >= episodio and len(estrategia_troca_rl.tabela) <= LIMITE_LINHAS_HEATMAP:
+            with instrumentacao.fase('heatmap'):
+                heatmaps.enviar(estrategia_troca_rl.tabela, episodio, estrategia_troca_rl.codificador.rotulos)
+        if args.lote == 1:
+            for cartas in TIPOS:
+                treinamento(estrategia_troca_rl, cartas, baralho, instrumentacao, registro)
+        else:
+            treinamento_lote(estrategia_troca_rl, np.tile(maos_dos_tipos, (n, 1)), simulacao, instrumentacao, registro)
+        instrumentacao.concluir_episodio(n)  # episódios de treinamento, como em Progresso, e não mãos
+        if (episodio + n) // args.intervalo_checkpoint > episodio // args.intervalo_checkpoint:
+            with instrumentacao.fase('checkpoint'):
+                estrategia_troca_rl.salvar(args.checkpoint, **metadados_checkpoint(episodio + n, fontes, registro))
+
+    estrategia_troca_rl.salvar(args.arquivo)
+    estrategia_troca_rl.salvar(args.checkpoint, **metadados_checkpoint(args.episodios, fontes, registro))
+    if registro is not None:
+        registro.fechar()
+    heatmaps.fechar()
+    instrumentacao.fechar()
+    if heatmaps.descartados:
+        print(f'{heatmaps.descartados} heatmaps descartados para não atrasar o treinamento.')
+
+
+def gerar_heatmap(tabela, episodio, rotulos=None):
+    import matplotlib  # pylint: disable=import-outside-toplevel
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt  # pylint: disable=import-outside-toplevel
+
     plt.figure(figsize=(18, 6))
     heatmap = plt.imshow(tabela, cmap='YlGnBu', aspect='auto')
 
@@ -77,7 +264,8 @@ def gerar_heatmap(tabela, episodio):
     cbar.set_label('Peso', fontsize=12)
 
     plt.xticks(ticks=np.arange(tabela.shape[1]), labels=[format(i, '05b') for i in range(tabela.shape[1])], fontsize=8, rotation=45)
-    plt.yticks(ticks=np.arange(tabela.shape[0]), labels=Mao.TIPOS, fontsize=10)
+    if rotulos is not None:
+        plt.yticks(ticks=np.arange(tabela.shape[0]), labels=rotulos, fontsize=10)
 
     plt.tight_layout()
     plt.savefig(f'heatmap-{episodio}')
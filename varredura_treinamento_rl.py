@@ -0,0 +1,53 @@
+import argparse
+
+import numpy as np
+
+from poker.avaliacao_sequencial import TIPOS_RESULTADO
+from poker.carta import Carta
+from poker.varredura import INICIALIZACOES, ParametrosVarredura, Varredura, grade
+from treina_estrategia_troca_rl import TIPOS
+
+
+def inteiros(texto):
+    """'1:279' -> (1, 279), para os limites e as recompensas da linha de comando"""
+    try:
+        return tuple(int(valor) for valor in texto.split(':'))
+    except ValueError as erro:
+        raise argparse.ArgumentTypeError(f'esperados inteiros separados por ":", e não {texto!r}') from erro
+
+
+def imprime_resultados(resultados, varredura):
+    print(f'== {len(resultados)} treinamentos, avaliados em {resultados[0].testes} episódios cada ==')
+    print()
+    for posicao, resultado in enumerate(resultados, 1):
+        melhorou = resultado.intervalo('melhorou')
+        print(f'== {posicao}o: {resultado.configuracao.nome} ==')
+        print('  '.join(f'{tipo}: {resultado.porcentagem(tipo):.2f}%' for tipo in TIPOS_RESULTADO) + f'  (melhorou ± {melhorou.meia_largura * 100:.2f} p.p.)')
+        print()
+    print(f'Tabelas, checkpoints e {Varredura.ARQUIVO_RESUMO} em {varredura.diretorio}.')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Treina a estratégia RL com todas as combinações de hiperparâmetros, em paralelo, e classifica as tabelas.')
+    parser.add_argument('--diretorio', default='varredura', help='onde ficam as distribuições comuns, os checkpoints, as tabelas e o resumo')
+    parser.add_argument('--inicializacoes', nargs='+', default=['minimo', 'aleatorio'], choices=INICIALIZACOES, help='pesos iniciais da tabela')
+    parser.add_argument('--limites', nargs='+', type=inteiros, default=[(1, 279), (1, 5000)], help='pesos mínimo e máximo, como 1:279')
+    parser.add_argument('--recompensas', nargs='+', type=inteiros, default=[(2, -1, 1)], help='recompensas de melhorou, piorou e empate, como 2:-1:1')
+    parser.add_argument('--episodios', nargs='+', type=int, default=[1_000_000], help='episódios de treinamento')
+    parser.add_argument('--lote', type=int, default=100, help='episódios jogados com a tabela congelada antes de cada atualização')
+    parser.add_argument('--intervalo-checkpoint', type=int, default=10_000, help='episódios entre dois checkpoints de cada treinamento')
+    parser.add_argument('--distribuicoes', type=int, default=1 << 16, help='episódios distintos nas distribuições comuns a todos os treinamentos')
+    parser.add_argument('--testes', type=int, default=1_000_000, help='episódios da avaliação de cada tabela')
+    parser.add_argument('--processos', type=int, default=None, help='processos em paralelo (padrão: um por núcleo)')
+    parser.add_argument('--semente', type=int, default=None, help='semente raiz, para reproduzir a varredura')
+    args = parser.parse_args()
+
+    configuracoes = grade(args.inicializacoes, args.limites, args.recompensas, args.episodios)
+    parametros = ParametrosVarredura(args.lote, args.intervalo_checkpoint, args.distribuicoes, args.testes)
+    maos = np.array([[c.codigo for c in Carta.get_cartas(cartas)] for cartas in TIPOS])
+    varredura = Varredura(args.diretorio, maos, parametros, args.semente)
+    imprime_resultados(varredura.executar(configuracoes, args.processos), varredura)
+
+
+if __name__ == '__main__':
+    main()